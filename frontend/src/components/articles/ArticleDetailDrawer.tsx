@@ -196,10 +196,10 @@ export function ArticleDetailDrawer({
                 </div>
 
                 {/* 错误信息 */}
-                {article?.error_msg && (
+                {article?.error_message && (
                   <div className="p-4 bg-destructive/10 border border-destructive/20 rounded-lg">
                     <Label className="text-xs text-destructive">错误信息</Label>
-                    <p className="text-sm text-destructive mt-1">{article.error_msg}</p>
+                    <p className="text-sm text-destructive mt-1">{article.error_message}</p>
                   </div>
                 )}
               </div>
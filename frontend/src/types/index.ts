@@ -107,7 +107,6 @@ export interface Article {
   status: ArticleStatus
   fetch_status: FetchStatus
   error_message: string | null
-  error_msg: string | null
   crawled_at: string | null
   processed_at: string | null
   synced_at: string | null
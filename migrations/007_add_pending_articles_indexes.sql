@@ -0,0 +1,14 @@
+-- 待爬文章列表 / 按源爬取的复合索引
+-- 部分索引语法适用于 SQLite；MySQL 不支持 WHERE 子句，去掉 WHERE 后建立普通复合索引即可
+
+-- 待爬列表：WHERE status != 'low_quality' ORDER BY publish_time DESC, created_at DESC LIMIT N
+CREATE INDEX IF NOT EXISTS idx_pending_articles_publish_created
+    ON pending_articles(publish_time, created_at)
+    WHERE status != 'low_quality';
+
+-- 按源爬取 / 重试：WHERE source_id = ? AND status IN ('pending', 'failed') ORDER BY publish_time DESC
+CREATE INDEX IF NOT EXISTS idx_pending_articles_source_status_publish
+    ON pending_articles(source_id, status, publish_time)
+    WHERE status IN ('pending', 'failed');
+
+-- articles.url_hash 已在建表时声明 UNIQUE（uk_url_hash / ORM unique=True），无需重复创建
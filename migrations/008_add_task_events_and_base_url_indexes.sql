@@ -0,0 +1,10 @@
+-- 任务事件增量读取 / 采集源 base_url 查重索引
+
+-- SSE 增量读取：WHERE task_id = ? AND id > ? ORDER BY id LIMIT N
+-- SQLite 与 InnoDB 的二级索引都隐含主键，已有的 idx_task_events_task_id 即按 (task_id, id) 有序，
+-- 只需把查询排序改为 id，无需新建索引
+
+-- bulk_create_sources / fetch_by_base_url：WHERE base_url IN (...)
+-- SQLite（ORM 建表）已有 base_url 唯一索引；MySQL schema.sql 中没有，补一个前缀索引
+-- （VARCHAR(1024) utf8mb4 超出 InnoDB 索引长度上限，取前 255 个字符）
+ALTER TABLE crawl_sources ADD INDEX idx_base_url (base_url(255));
@@ -0,0 +1,7 @@
+-- 任务 / 消息的 JSON 数据列改为原生 JSON 类型
+
+-- SQLite：JSON 列以 TEXT 亲和性存储，已有数据格式不变，无需迁移
+-- MySQL：原 TEXT 列中的数据均为合法 JSON，可直接转换为 JSON 类型
+ALTER TABLE tasks MODIFY params JSON NULL, MODIFY result JSON NULL;
+ALTER TABLE task_events MODIFY event_data JSON NULL;
+ALTER TABLE messages MODIFY agent_state JSON NULL, MODIFY search_results JSON NULL;
@@ -0,0 +1,8 @@
+-- 缩小 url_hash 索引
+
+-- articles.url_hash 存放 MD5 十六进制摘要（32 字符），ORM 原先声明为 VARCHAR(64)；
+-- MySQL schema.sql 已是 CHAR(32)，SQLite 不限制 VARCHAR 长度，两者都无需改列
+
+-- pending_articles 在 001 中同时建了 UNIQUE(url_hash) 和普通索引 idx_pending_articles_url_hash，
+-- 唯一约束自带的索引已覆盖所有按 url_hash 的查询，删除重复索引减少一半的 url_hash 索引空间和写入开销
+DROP INDEX IF EXISTS idx_pending_articles_url_hash;
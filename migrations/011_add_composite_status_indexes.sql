@@ -0,0 +1,23 @@
+-- 与实际查询条件匹配的复合索引
+-- 适用于 SQLite（ORM 建表）；MySQL 的 articles 表在 schema.sql 中已有按源 / 状态的复合索引
+
+-- 按源列出文章：WHERE source_id = ? [AND status = ?] ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_articles_source_status_created
+    ON articles(source_id, status, created_at);
+
+-- 按状态列出文章：WHERE status = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_articles_status_created
+    ON articles(status, created_at);
+
+-- 任务列表 / 取待执行任务：WHERE status = ? ORDER BY created_at
+CREATE INDEX IF NOT EXISTS idx_tasks_status_created
+    ON tasks(status, created_at);
+
+-- 到期定时任务：WHERE status = 'active' AND next_run_at <= ? ORDER BY next_run_at
+CREATE INDEX IF NOT EXISTS idx_schedules_status_next_run
+    ON schedules(status, next_run_at);
+
+-- 以下单列索引已是上面复合索引的前缀
+DROP INDEX IF EXISTS ix_articles_source_id;
+DROP INDEX IF EXISTS ix_tasks_status;
+DROP INDEX IF EXISTS idx_tasks_status;
@@ -0,0 +1,6 @@
+-- 合并 articles 表的两个错误信息列
+-- error_msg 与 error_message 存放同一类信息，保留 error_message，删除 error_msg
+-- （SQLite 需 3.35+ 才支持 DROP COLUMN）
+
+UPDATE articles SET error_message = error_msg WHERE error_msg IS NOT NULL;
+ALTER TABLE articles DROP COLUMN error_msg;
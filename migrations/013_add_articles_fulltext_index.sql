@@ -0,0 +1,4 @@
+-- 文章标题 / 正文全文索引，供 ArticleRepository.search_articles 使用
+-- 仅适用于 MySQL（ngram 解析器用于中文分词）；SQLite 仍走 LIKE 模糊匹配
+ALTER TABLE articles
+    ADD FULLTEXT INDEX ft_articles_title_content (title, content) WITH PARSER ngram;
@@ -0,0 +1,9 @@
+-- 待爬列表的分页顺序统一为 publish_time DESC, id DESC（与游标分页 get_page_after 一致），
+-- 复合索引的第二列随之由 created_at 改为 id
+-- 部分索引语法适用于 SQLite；MySQL 去掉 WHERE 子句后建立普通复合索引即可
+
+DROP INDEX IF EXISTS idx_pending_articles_publish_created;
+
+CREATE INDEX IF NOT EXISTS idx_pending_articles_publish_id
+    ON pending_articles(publish_time, id)
+    WHERE status != 'low_quality';
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+按规范化 URL 重算 pending_articles.url_hash
+
+url_hash 改为对规范化 URL（去掉片段和跟踪参数）取 MD5 后，已有行仍是原始 URL 的哈希，
+带 utm_* 或 #片段 的旧链接再次出现时会得到新哈希、绕过唯一约束被重复入队。
+本迁移按新规则重算所有行的哈希；规范化后重复的行只保留 ID 最小的一条
+
+本迁移不可回滚：原始 URL 的哈希无法从规范化结果恢复，删除的重复行也无法还原
+
+用法：
+    python migrations/015_rehash_pending_articles_url_hash.py
+"""
+
+import asyncio
+import hashlib
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from src.core.url_norm import normalize_url  # noqa: E402
+
+
+def _url_hash(url: str) -> str:
+    """与 PendingArticleRepository._generate_url_hash 相同的哈希规则"""
+    return hashlib.md5(normalize_url(url).encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def upgrade(connection):
+    """重算 url_hash，并删除规范化后重复的待爬文章"""
+    rows = connection.execute(
+        text("SELECT id, url, url_hash FROM pending_articles ORDER BY id")
+    ).all()
+
+    seen: set[str] = set()
+    duplicate_ids: list[int] = []
+    updates: list[dict] = []
+    for row in rows:
+        new_hash = _url_hash(row.url)
+        if new_hash in seen:
+            duplicate_ids.append(row.id)
+            continue
+        seen.add(new_hash)
+        if new_hash != row.url_hash:
+            updates.append({"id": row.id, "url_hash": new_hash})
+
+    # 先删除重复行，后续更新不会与其旧哈希冲突
+    for start in range(0, len(duplicate_ids), 500):
+        chunk = duplicate_ids[start:start + 500]
+        placeholders = ", ".join(f":id_{i}" for i in range(len(chunk)))
+        connection.execute(
+            text(f"DELETE FROM pending_articles WHERE id IN ({placeholders})"),
+            {f"id_{i}": article_id for i, article_id in enumerate(chunk)},
+        )
+
+    if updates:
+        connection.execute(
+            text("UPDATE pending_articles SET url_hash = :url_hash WHERE id = :id"),
+            updates,
+        )
+
+    print(f"✓ 重算 url_hash: 更新 {len(updates)} 行，删除重复 {len(duplicate_ids)} 行")
+
+
+async def main() -> None:
+    """使用应用配置的数据库连接执行迁移（SQLite / MySQL 均可）"""
+    from src.core.database import close_engine, init_engine
+
+    engine = init_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(upgrade)
+    finally:
+        await close_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -43,6 +43,7 @@ CREATE TABLE IF NOT EXISTS `crawl_sources` (
     `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
 
     UNIQUE KEY `uk_site_name` (`site_name`),
+    INDEX `idx_base_url` (`base_url`(255)) COMMENT '按 base_url 查重',
     INDEX `idx_enabled` (`enabled`),
     INDEX `idx_discovery_method` (`discovery_method`),
     INDEX `idx_robots_status` (`robots_status`),
@@ -71,8 +72,7 @@ CREATE TABLE IF NOT EXISTS `articles` (
     `fetch_status` ENUM('pending', 'success', 'retry', 'failed') NOT NULL DEFAULT 'pending' COMMENT '抓取任务状态',
 
     -- 错误信息
-    `error_message` TEXT COMMENT '错误信息（兼容旧字段）',
-    `error_msg` TEXT COMMENT '错误信息（新字段，优先使用）',
+    `error_message` TEXT COMMENT '错误信息',
 
     `crawled_at` TIMESTAMP NULL DEFAULT NULL COMMENT '爬取时间',
     `processed_at` TIMESTAMP NULL DEFAULT NULL COMMENT '处理时间',
@@ -100,6 +100,7 @@ CREATE TABLE IF NOT EXISTS `articles` (
     INDEX `idx_fetch_status_retry` (`fetch_status`, `retry_count`) COMMENT '查找需要重试的文章',
     INDEX `idx_content_hash` (`content_hash`) COMMENT '内容去重',
     INDEX `idx_status_publish_time` (`status`, `publish_time` DESC) COMMENT '按状态和时间排序',
+    FULLTEXT INDEX `ft_articles_title_content` (`title`, `content`) WITH PARSER ngram COMMENT '知识库关键词检索',
 
     CONSTRAINT `fk_articles_source` FOREIGN KEY (`source_id`) REFERENCES `crawl_sources` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='文章表';
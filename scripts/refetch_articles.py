@@ -246,8 +246,10 @@ async def show_statistics() -> None:
     async with get_async_session() as db:
         article_repo = ArticleRepository(db)
 
-        # 获取大量文章来统计
-        total_articles = await article_repo.get_latest_articles(limit=10000)
+        # 获取大量文章来统计（需要 fetch_status 与 extra_data，取全部列）
+        total_articles = await article_repo.get_latest_articles(
+            limit=10000, include_content=True
+        )
         total = len(total_articles)
 
         # 按状态统计
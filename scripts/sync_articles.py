@@ -108,7 +108,7 @@ async def sync_articles():
                         # 更新为失败状态
                         await article_repo.update(article_id, {
                             "fetch_status": FetchStatus.FAILED.value,
-                            "error_msg": scraped.error,
+                            "error_message": scraped.error,
                         })
                     else:
                         # 严格的内容验证
@@ -141,7 +141,7 @@ async def sync_articles():
                             "publish_time": scraped.publish_time,
                             "author": scraped.author,
                             "fetch_status": FetchStatus.SUCCESS.value if is_valid else FetchStatus.FAILED.value,
-                            "error_msg": None if is_valid else error_msg,
+                            "error_message": None if is_valid else error_msg,
                         }
 
                         await article_repo.update(article_id, update_data)
@@ -10,7 +10,7 @@ from typing import AsyncGenerator
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from src.api.schemas import (
     APIException,
@@ -37,8 +37,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 
     # 启动时的初始化逻辑
     # 初始化数据库连接池和表
-    from src.core.database import init_database
+    from src.core.database import init_database, warm_pool
     await init_database()
+    await warm_pool()
     logger.info("数据库初始化完成")
 
     # 启动调度器
@@ -46,6 +47,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     await start_scheduler()
     logger.info("定时任务调度器已启动")
 
+    # 启动后台任务队列
+    from src.services.task_manager import task_queue
+    await task_queue.start(settings.crawler.task_workers)
+
+    # 请求间共享的爬虫 / Robots 处理器（复用 HTTP 连接和缓存）
+    from src.services.robots_handler import get_robots_handler
+    from src.services.universal_scraper import UniversalScraper
+    app.state.scraper = UniversalScraper()
+    app.state.robots_handler = get_robots_handler()
+
     yield
 
     logger.info("Shutting down 新闻态势分析系统 API...")
@@ -60,6 +71,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     await stop_scheduler()
     logger.info("定时任务调度器已停止")
 
+    # 停止后台任务队列
+    await task_queue.stop()
+
+    # 关闭共享爬虫的 HTTP 客户端
+    await app.state.scraper.aclose()
+
 
 # ============================================================================
 # FastAPI 应用
@@ -72,6 +89,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
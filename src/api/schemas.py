@@ -80,6 +80,19 @@ class PaginatedResponse(BaseModel, Generic[T]):
         )
 
 
+class PageCursor(BaseModel):
+    """游标分页的下一页位置（按 publish_time DESC, id DESC 排序）"""
+    after_publish_time: datetime | None = Field(default=None, description="上一页最后一条的发布时间")
+    after_id: int = Field(description="上一页最后一条的 ID")
+
+
+class CursorResponse(BaseModel, Generic[T]):
+    """游标分页响应（统一响应格式附加下一页游标）"""
+    success: bool = Field(description="请求是否成功")
+    data: T | None = Field(default=None, description="响应数据")
+    next_cursor: PageCursor | None = Field(default=None, description="下一页游标，没有更多数据时为 null")
+
+
 # ============================================================================
 # 筛选模型
 # ============================================================================
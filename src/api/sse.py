@@ -0,0 +1,68 @@
+"""
+SSE（Server-Sent Events）工具
+事件格式化与有界缓冲的流式响应
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import anyio
+import orjson
+from fastapi.responses import StreamingResponse
+
+# 生产者与客户端之间的缓冲事件数
+SSE_BUFFER_SIZE = 64
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, payload: Any) -> bytes:
+    """格式化一条 SSE 事件（orjson 序列化为 UTF-8 字节，原生支持 datetime / 枚举）"""
+    data = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+async def buffered_stream(
+    events: AsyncIterator[bytes],
+    buffer_size: int = SSE_BUFFER_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    在后台任务中运行事件生产者，经有界内存流转发给客户端
+
+    客户端读取变慢时生产者不会被阻塞，缓冲区满后生产者才等待；
+    客户端断开时取消生产者（释放其持有的数据库会话），
+    生产者的异常在流结束时重新抛出
+    """
+    send_stream, receive_stream = anyio.create_memory_object_stream(buffer_size)
+
+    async def produce() -> None:
+        async with send_stream:
+            async for chunk in events:
+                await send_stream.send(chunk)
+
+    task = asyncio.create_task(produce())
+    try:
+        async with receive_stream:
+            async for chunk in receive_stream:
+                yield chunk
+    finally:
+        if not task.done():
+            task.cancel()
+        # asyncio.wait 不会把生产者的取消转成异常；消费者自身被取消时照常向上传播
+        await asyncio.wait({task})
+        if not task.cancelled():
+            task.result()
+
+
+def sse_response(events: AsyncIterator[bytes]) -> StreamingResponse:
+    """包装 SSE 事件流响应（经有界缓冲转发）"""
+    return StreamingResponse(
+        buffered_stream(events),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
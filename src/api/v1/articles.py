@@ -141,11 +141,9 @@ async def list_articles(
 
     articles = await repo.fetch_all(data_sql, params)
 
-    # 转换为字典
-    items = [dict(a) for a in articles]
-
+    # RowMapping 本身就是 Mapping，直接交给响应模型
     paginated = PaginatedResponse.create(
-        items=items,
+        items=articles,
         total=total,
         page=pagination.page,
         page_size=pagination.page_size,
@@ -307,7 +305,7 @@ async def refetch_article(
         if isinstance(parser_config, str):
             # 如果是 JSON 字符串，需要反序列化
             from src.core.models import ParserConfig
-            parser_config = ParserConfig.model_validate_json(parser_config)
+            parser_config = ParserConfig.from_json(parser_config)
         elif isinstance(parser_config, dict):
             from src.core.models import ParserConfig
             parser_config = ParserConfig(**parser_config)
@@ -351,7 +349,7 @@ async def refetch_article(
                 await repo.update(article_id, {
                     "fetch_status": FetchStatus.FAILED.value,
                     "status": ArticleStatus.FAILED.value,
-                    "error_msg": scraped.error,
+                    "error_message": scraped.error,
                 })
                 raise BadRequestException(f"Failed to scrape article: {scraped.error}")
 
@@ -380,7 +378,7 @@ async def refetch_article(
                 await repo.update(article_id, {
                     "fetch_status": FetchStatus.FAILED.value,
                     "status": ArticleStatus.FAILED.value,
-                    "error_msg": error_msg,
+                    "error_message": error_msg,
                 })
                 raise BadRequestException(f"Content validation failed: {error_msg}")
 
@@ -400,7 +398,7 @@ async def refetch_article(
                 "publish_time": publish_time,
                 "status": ArticleStatus.RAW.value,
                 "fetch_status": FetchStatus.SUCCESS.value,
-                "error_msg": None,
+                "error_message": None,
             }
 
             updated = await repo.update(article_id, update_data)
@@ -422,7 +420,7 @@ async def refetch_article(
         await repo.update(article_id, {
             "fetch_status": FetchStatus.FAILED.value,
             "status": ArticleStatus.FAILED.value,
-            "error_msg": str(e),
+            "error_message": str(e),
         })
 
         raise BadRequestException(f"Failed to refetch article: {e}")
@@ -488,7 +486,7 @@ async def sync_all_articles(
             parser_config = source.get("parser_config")
             if isinstance(parser_config, str):
                 from src.core.models import ParserConfig
-                parser_config = ParserConfig.model_validate_json(parser_config)
+                parser_config = ParserConfig.from_json(parser_config)
             elif isinstance(parser_config, dict):
                 from src.core.models import ParserConfig
                 parser_config = ParserConfig(**parser_config)
@@ -529,7 +527,7 @@ async def sync_all_articles(
                     # 更新为失败状态
                     await repo.update(article_id, {
                         "fetch_status": FetchStatus.FAILED.value,
-                        "error_msg": scraped.error,
+                        "error_message": scraped.error,
                     })
                 else:
                     # 更新文章内容
@@ -538,7 +536,7 @@ async def sync_all_articles(
                         "content": scraped.content,
                         "author": scraped.author,
                         "fetch_status": FetchStatus.SUCCESS.value if scraped.content else FetchStatus.FAILED.value,
-                        "error_msg": None,
+                        "error_message": None,
                     }
 
                     await repo.update(article_id, update_data)
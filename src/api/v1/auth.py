@@ -6,11 +6,9 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.schemas import APIResponse
-from src.core.auth import create_access_token, get_current_user, get_admin_user, ACCESS_TOKEN_EXPIRE_MINUTES
-from src.core.database import get_async_session_generator
+from src.core.auth import create_access_token, get_current_user, get_admin_user, get_user_repo, ACCESS_TOKEN_EXPIRE_MINUTES
 from src.core.models import UserLogin, UserCreate, UserResponse, LoginResponse
 from src.repository.user_repository import UserRepository
 
@@ -20,10 +18,9 @@ router = APIRouter(tags=["auth"])
 @router.post("/login", response_model=APIResponse[LoginResponse])
 async def login(
     user_data: UserLogin,
-    db: AsyncSession = Depends(get_async_session_generator),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """用户登录"""
-    user_repo = UserRepository(db)
     user = await user_repo.authenticate(user_data.username, user_data.password)
 
     if not user:
@@ -50,7 +47,6 @@ async def login(
 @router.get("/me", response_model=APIResponse[UserResponse])
 async def get_me(
     current_user: UserResponse = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_session_generator),
 ):
     """获取当前用户信息"""
     return APIResponse(success=True, data=current_user)
@@ -4,15 +4,16 @@
 """
 
 import asyncio
-import json
 import logging
 from typing import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.schemas import APIResponse
+from src.api.sse import format_sse
 from src.core.database import get_async_session
 from src.core.models import AgentState, ChatRequest, Conversation, ConversationCreate, ConversationUpdate
 from src.repository.conversation_repository import ConversationRepository, MessageRepository
@@ -152,13 +153,13 @@ async def chat_stream(
                 }
             }
             try:
-                state_queue.put_nowait(json.dumps(state_dict, ensure_ascii=False))
+                state_queue.put_nowait(orjson.dumps(state_dict))
             except:
                 pass
 
         try:
             # 发送开始事件
-            yield f"event: start\ndata: {json.dumps({'conversation_id': request.conversation_id})}\n\n"
+            yield format_sse("start", {'conversation_id': request.conversation_id})
 
             # 使用异步任务运行chat
             chat_queue = asyncio.Queue()
@@ -186,7 +187,7 @@ async def chat_stream(
                 # 检查是否有状态更新
                 try:
                     state_data = state_queue.get_nowait()
-                    yield f"data: {state_data}\n\n"
+                    yield b"data: " + state_data + b"\n\n"
                 except asyncio.QueueEmpty:
                     pass
 
@@ -194,10 +195,10 @@ async def chat_stream(
                 try:
                     msg_type, data = chat_queue.get_nowait()
                     if msg_type == "chunk":
-                        yield f"event: chunk\ndata: {json.dumps({'text': data}, ensure_ascii=False)}\n\n"
+                        yield format_sse("chunk", {"text": data})
                     elif msg_type == "done":
                         # 发送完成事件
-                        yield f"event: end\ndata: {json.dumps({'full_response': data})}\n\n"
+                        yield format_sse("end", {'full_response': data})
                         break
                 except asyncio.QueueEmpty:
                     pass
@@ -214,7 +215,7 @@ async def chat_stream(
 
         except Exception as e:
             logger.error(f"Chat error: {e}", exc_info=True)
-            yield f"event: error\ndata: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+            yield format_sse("error", {'error': str(e)})
 
     return StreamingResponse(
         event_stream(),
@@ -6,7 +6,6 @@
 """
 
 import asyncio
-import json
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta
@@ -17,6 +16,7 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.schemas import APIResponse
+from src.api.sse import format_sse
 from src.core.models import (
     Report,
     ReportAgentStage,
@@ -123,7 +123,7 @@ async def generate_report(
             _active_report_streams[report_id].append(current_queue)
 
             # 发送开始事件
-            yield f"event: start\ndata: {json.dumps({'report_id': report_id})}\n\n"
+            yield format_sse("start", {'report_id': report_id})
 
             # 状态更新队列（用于生成流程内部通信）
             state_queue = asyncio.Queue()
@@ -148,9 +148,9 @@ async def generate_report(
             async def run_generation():
                 nonlocal accumulated_stats, accumulated_sections, total_sections, current_stream_content
                 # 创建独立的数据库会话（不使用上下文管理器，避免取消传播）
-                from src.core.database import get_async_session_generator
+                from src.core.database import create_session
 
-                new_db = get_async_session_generator()
+                new_db = create_session()
                 try:
                     # 创建新的 agent 实例
                     agent = ReportGenerationAgent(new_db)
@@ -312,13 +312,14 @@ async def generate_report(
                             await repo.update(report_id, update_data)
 
                             # 发送状态事件（同时广播到所有订阅者）
-                            yield f"event: state\ndata: {json.dumps(state.model_dump(), ensure_ascii=False)}\n\n"
-                            await _broadcast_event(report_id, "state", state.model_dump())
+                            state_payload = state.model_dump()
+                            yield format_sse("state", state_payload)
+                            await _broadcast_event(report_id, "state", state_payload)
 
                         elif msg[0] == "section_stream":
                             # 发送AI流式输出（同时广播到所有订阅者）
                             stream_data = msg[1]
-                            yield f"event: section_stream\ndata: {json.dumps(stream_data, ensure_ascii=False)}\n\n"
+                            yield format_sse("section_stream", stream_data)
                             await _broadcast_event(report_id, "section_stream", stream_data)
 
                         elif msg[0] == "done":
@@ -336,7 +337,7 @@ async def generate_report(
                             })
 
                             # 发送完成事件（同时广播到所有订阅者）
-                            yield f"event: complete\ndata: {json.dumps(result, ensure_ascii=False)}\n\n"
+                            yield format_sse("complete", result)
                             await _broadcast_event(report_id, "complete", result)
                             break
 
@@ -350,7 +351,7 @@ async def generate_report(
                             })
 
                             # 发送错误事件（同时广播到所有订阅者）
-                            yield f"event: error\ndata: {json.dumps({'error': error_msg}, ensure_ascii=False)}\n\n"
+                            yield format_sse("error", {'error': error_msg})
                             await _broadcast_event(report_id, "error", {"error": error_msg})
                             break
 
@@ -368,10 +369,10 @@ async def generate_report(
                 logger.info(f"报告 {report_id} 的 SSE 连接已关闭，生成任务在后台继续运行")
             except Exception as e:
                 logger.error(f"报告生成流程失败: {e}", exc_info=True)
-                yield f"event: error\ndata: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+                yield format_sse("error", {'error': str(e)})
         except Exception as e:
             logger.error(f"报告生成失败: {e}", exc_info=True)
-            yield f"event: error\ndata: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+            yield format_sse("error", {'error': str(e)})
 
     return StreamingResponse(
         event_stream(),
@@ -528,18 +529,18 @@ async def stream_report_updates(
             repo = ReportRepository(db)
             report = await repo.fetch_by_id(report_id)
             if not report:
-                yield f"event: error\ndata: {json.dumps({'error': '报告不存在'}, ensure_ascii=False)}\n\n"
+                yield format_sse("error", {'error': '报告不存在'})
                 return
 
             # 如果报告已完成或失败，发送当前状态
             if report["status"] in ["completed", "failed"]:
-                yield f"event: complete\ndata: {json.dumps({'status': report['status']}, ensure_ascii=False)}\n\n"
+                yield format_sse("complete", {'status': report['status']})
                 return
 
             # 检查是否有正在进行的生成任务
             if report_id not in _active_report_streams:
                 # 没有正在生成的任务
-                yield f"event: complete\ndata: {json.dumps({'status': report['status']}, ensure_ascii=False)}\n\n"
+                yield format_sse("complete", {'status': report['status']})
                 return
 
             # 为此连接创建专用队列
@@ -554,37 +555,32 @@ async def stream_report_updates(
                         # 检查报告状态
                         current_report = await repo.fetch_by_id(report_id)
                         if not current_report:
-                            yield f"event: error\ndata: {json.dumps({'error': '报告不存在'}, ensure_ascii=False)}\n\n"
+                            yield format_sse("error", {'error': '报告不存在'})
                             break
 
                         # 如果报告已完成或失败，发送最终状态
                         if current_report["status"] in ["completed", "failed"]:
-                            yield f"event: complete\ndata: {json.dumps({'status': current_report['status']}, ensure_ascii=False)}\n\n"
+                            yield format_sse("complete", {'status': current_report['status']})
                             break
 
                         # 从队列获取事件（带超时）
                         try:
                             msg_type, msg_data = await asyncio.wait_for(my_queue.get(), timeout=1.0)
 
-                            if msg_type == "state":
-                                yield f"event: state\ndata: {json.dumps(msg_data, ensure_ascii=False)}\n\n"
-                            elif msg_type == "section_stream":
-                                yield f"event: section_stream\ndata: {json.dumps(msg_data, ensure_ascii=False)}\n\n"
-                            elif msg_type == "complete":
-                                yield f"event: complete\ndata: {json.dumps(msg_data, ensure_ascii=False)}\n\n"
-                                break
-                            elif msg_type == "error":
-                                yield f"event: error\ndata: {json.dumps(msg_data, ensure_ascii=False)}\n\n"
+                            if msg_type in ("state", "section_stream"):
+                                yield format_sse(msg_type, msg_data)
+                            elif msg_type in ("complete", "error"):
+                                yield format_sse(msg_type, msg_data)
                                 break
 
                         except asyncio.TimeoutError:
                             # 发送心跳保持连接
-                            yield f": keep-alive\n\n"
+                            yield b": keep-alive\n\n"
                             continue
 
                     except Exception as e:
                         logger.error(f"流式更新错误: {e}", exc_info=True)
-                        yield f"event: error\ndata: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+                        yield format_sse("error", {'error': str(e)})
                         break
             finally:
                 # 清理：从订阅列表中移除此队列
@@ -184,7 +184,7 @@ async def save_search_result(
             parser_config = source.get("parser_config")
             # 处理 parser_config 可能是字符串的情况
             if isinstance(parser_config, str):
-                parser_config = ParserConfig.model_validate_json(parser_config)
+                parser_config = ParserConfig.from_json(parser_config)
         else:
             # 创建临时源
             site_name = parsed.netloc or base_url
@@ -210,7 +210,7 @@ async def save_search_result(
             parser_config = source.get("parser_config")
             # 处理 parser_config 可能是字符串的情况
             if isinstance(parser_config, str):
-                parser_config = ParserConfig.model_validate_json(parser_config)
+                parser_config = ParserConfig.from_json(parser_config)
         else:
             parser_config = None
 
@@ -397,7 +397,7 @@ async def save_search_results_batch(
                 source_id = source["id"]
                 parser_config = source.get("parser_config")
                 if isinstance(parser_config, str):
-                    parser_config = ParserConfig.model_validate_json(parser_config)
+                    parser_config = ParserConfig.from_json(parser_config)
             else:
                 site_name = parsed.netloc
                 new_source = await source_repo.create(SourceCreate(
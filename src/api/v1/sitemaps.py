@@ -6,31 +6,48 @@ Sitemap API
 """
 
 import asyncio
-import json
+import hashlib
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Any
 
+import orjson
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.schemas import APIResponse, BadRequestException, NotFoundException
+from src.api.schemas import APIResponse, BadRequestException, CursorResponse, NotFoundException
+from src.api.sse import format_sse, sse_response
+from src.core.config import settings
+from src.core.database import get_async_session
 from src.core.models import (
+    ArticleCreate,
+    ParserConfig,
     PendingArticleCreate,
     PendingArticleStatus,
     SitemapCreate,
     SitemapFetchStatus,
     SitemapUpdate,
 )
+from src.core.url_norm import normalize_url
+from src.repository.article_repository import ArticleRepository
 from src.repository.pending_article_repository import PendingArticleRepository
 from src.repository.sitemap_repository import SitemapRepository
+from src.repository.source_repository import SourceRepository
 from src.services.sitemap_service import SitemapService
+from src.services.universal_scraper import UniversalScraper
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 同时持有数据库会话的爬取请求上限（与抓取的 HTTP 并发相互独立）
+# 在获取会话之前等待，超出的爬取在这里排队，而不是在连接池里超时
+_DB_SEM = asyncio.Semaphore(settings.database.crawl_concurrency)
+
 
 # ============================================================================
 # 依赖注入
@@ -38,11 +55,24 @@ router = APIRouter()
 
 async def get_db() -> AsyncSession:  # type: ignore
     """获取数据库会话"""
-    from src.core.database import get_async_session
     async with get_async_session() as session:
         yield session
 
 
+@asynccontextmanager
+async def _crawl_session() -> AsyncIterator[AsyncSession]:
+    """获取爬取流程使用的数据库会话，先占用 _DB_SEM 再从连接池取连接"""
+    async with _DB_SEM:
+        async with get_async_session() as session:
+            yield session
+
+
+async def get_crawl_db() -> AsyncSession:  # type: ignore
+    """获取爬取接口的数据库会话（受 _DB_SEM 限制）"""
+    async with _crawl_session() as session:
+        yield session
+
+
 # ============================================================================
 # Sitemap 管理
 # ============================================================================
@@ -63,7 +93,7 @@ async def list_sitemaps(
             "SELECT * FROM sitemaps ORDER BY created_at DESC LIMIT 1000"
         )
 
-    return APIResponse(success=True, data=[dict(s) for s in sitemaps])
+    return APIResponse(success=True, data=sitemaps)
 
 
 @router.post("", response_model=APIResponse[dict[str, Any]])
@@ -94,16 +124,24 @@ async def create_sitemap(
 # 待爬文章管理（放在 /{sitemap_id} 之前避免路由冲突）
 # ============================================================================
 
-@router.get("/pending", response_model=APIResponse[list[dict[str, Any]]])
+@router.get("/pending", response_model=CursorResponse[list[dict[str, Any]]])
 async def list_pending_articles(
     source_id: int | None = Query(default=None, description="源 ID 筛选"),
     sitemap_id: int | None = Query(default=None, description="Sitemap ID 筛选"),
     status: str | None = Query(default=None, description="状态筛选"),
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    after_publish_time: datetime | None = Query(default=None, description="游标：上一页最后一条的发布时间"),
+    after_id: int | None = Query(default=None, description="游标：上一页最后一条的 ID（传入后忽略 offset）"),
     db: AsyncSession = Depends(get_db),
 ):
-    """获取待爬文章列表"""
+    """
+    获取待爬文章列表
+
+    支持游标分页：传入响应中 next_cursor 的 after_publish_time / after_id 获取下一页，
+    没有更多数据（或按 sitemap_id 筛选）时 next_cursor 为 null。
+    列表直接序列化为 JSON 返回，CursorResponse 只用于描述 OpenAPI 文档，不做模型校验
+    """
     repo = PendingArticleRepository(db)
 
     # 转换状态字符串为枚举
@@ -116,15 +154,39 @@ async def list_pending_articles(
 
     if sitemap_id is not None:
         articles = await repo.get_by_sitemap(sitemap_id, status=status_enum)
+    elif after_id is not None:
+        articles = await repo.get_page_after(
+            source_id=source_id,
+            status=status_enum,
+            after_publish_time=after_publish_time,
+            after_id=after_id,
+            limit=limit,
+        )
     elif source_id is not None:
         articles = await repo.get_by_source(source_id, status=status_enum, limit=limit, offset=offset)
     else:
-        # 获取所有待爬文章，按发布时间倒序（最新的优先），没有发布时间的排在最后（自动过滤低质量）
+        # 获取所有待爬文章，按发布时间倒序（最新的优先），没有发布时间的排在最后（自动过滤低质量）；
+        # 同一时间按 ID 倒序，与 get_page_after 一致，next_cursor 才能接上下一页
         articles = await repo.fetch_all(
-            f"SELECT * FROM pending_articles WHERE status != 'low_quality' ORDER BY publish_time DESC NULLS LAST, created_at DESC LIMIT {limit} OFFSET {offset}"
+            "SELECT * FROM pending_articles WHERE status != 'low_quality' "
+            "ORDER BY publish_time DESC NULLS LAST, id DESC "
+            "LIMIT :limit OFFSET :offset",
+            {"limit": limit, "offset": offset},
         )
 
-    return APIResponse(success=True, data=[dict(a) for a in articles])
+    next_cursor = None
+    if sitemap_id is None and len(articles) == limit:
+        last = articles[-1]
+        next_cursor = {"after_publish_time": last["publish_time"], "after_id": last["id"]}
+
+    # 行映射由 orjson 的 default 逐行转换，datetime 由 orjson 原生序列化
+    return Response(
+        content=orjson.dumps(
+            {"success": True, "data": articles, "next_cursor": next_cursor},
+            default=dict,
+        ),
+        media_type="application/json",
+    )
 
 
 @router.get("/pending/stats", response_model=APIResponse[dict[str, Any]])
@@ -135,14 +197,7 @@ async def get_pending_stats(
     """获取待爬文章统计"""
     repo = PendingArticleRepository(db)
 
-    stats = {
-        "total": await repo.count_by_status(source_id=source_id),
-        "pending": await repo.count_by_status(source_id=source_id, status=PendingArticleStatus.PENDING),
-        "crawling": await repo.count_by_status(source_id=source_id, status=PendingArticleStatus.CRAWLING),
-        "completed": await repo.count_by_status(source_id=source_id, status=PendingArticleStatus.COMPLETED),
-        "failed": await repo.count_by_status(source_id=source_id, status=PendingArticleStatus.FAILED),
-        "abandoned": await repo.count_by_status(source_id=source_id, status=PendingArticleStatus.ABANDONED),
-    }
+    stats = await repo.counts_by_status(source_id=source_id)
 
     return APIResponse(success=True, data=stats)
 
@@ -164,11 +219,34 @@ async def delete_pending_article(
     return APIResponse(success=True, data={"deleted_id": article_id})
 
 
+async def _finish_crawl_batch(
+    pending_repo: PendingArticleRepository,
+    batch_ids: list[int],
+    completed_ids: list[int],
+    failed_ids: list[int],
+) -> None:
+    """
+    提交一批待爬文章的最终状态（在 finally 中调用）
+
+    已处理的文章写入 COMPLETED / FAILED；循环中途异常、客户端断开或流被取消时
+    尚未处理的文章恢复为 PENDING，避免永久停留在 CRAWLING
+    """
+    # 中断时会话可能停在未结束的事务中，先回滚（已完成的写入均已各自提交）
+    await pending_repo.session.rollback()
+
+    processed = set(completed_ids) | set(failed_ids)
+    await pending_repo.bulk_update_status(completed_ids, PendingArticleStatus.COMPLETED)
+    await pending_repo.bulk_update_status(failed_ids, PendingArticleStatus.FAILED)
+    await pending_repo.bulk_update_status(
+        [i for i in batch_ids if i not in processed], PendingArticleStatus.PENDING
+    )
+
+
 @router.post("/pending/crawl/{source_id}", response_model=APIResponse[dict[str, Any]])
 async def crawl_pending_articles(
     source_id: int,
     limit: int = Query(default=10, ge=1, le=100, description="爬取数量限制"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_crawl_db),
 ):
     """
     爬取待爬文章
@@ -181,14 +259,6 @@ async def crawl_pending_articles(
     3. 保存到 articles 表
     4. 更新 pending 状态
     """
-    import asyncio
-    import hashlib
-
-    from src.repository.article_repository import ArticleRepository
-    from src.repository.source_repository import SourceRepository
-    from src.services.universal_scraper import UniversalScraper
-    from src.core.models import ArticleCreate, ArticleStatus
-
     pending_repo = PendingArticleRepository(db)
     article_repo = ArticleRepository(db)
     source_repo = SourceRepository(db)
@@ -201,8 +271,7 @@ async def crawl_pending_articles(
     # 解析 parser_config
     parser_config = source.get("parser_config")
     if isinstance(parser_config, str):
-        from src.core.models import ParserConfig
-        parser_config = ParserConfig.model_validate_json(parser_config)
+        parser_config = ParserConfig.from_json(parser_config)
 
     # 获取待爬文章
     articles = await pending_repo.get_by_source(
@@ -221,73 +290,96 @@ async def crawl_pending_articles(
     failed_count = 0
     skipped_count = 0
 
-    for pending_article in articles:
-        try:
-            article_id = pending_article["id"]
-            url = pending_article["url"]
-
-            # 检查 URL 是否已存在于 articles 表
-            url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
-            existing = await article_repo.get_by_url_hash(url_hash)
-
-            if existing:
-                # 已存在，标记为已完成
-                await pending_repo.update_status(article_id, PendingArticleStatus.COMPLETED)
-                skipped_count += 1
-                logger.info(f"Article already exists: {url}")
-                continue
-
-            # 更新状态为爬取中
-            await pending_repo.update_status(article_id, PendingArticleStatus.CRAWLING)
-
-            # 使用 UniversalScraper 抓取内容
-            async with UniversalScraper() as scraper:
-                article = await scraper.scrape(
-                    url=url,
-                    parser_config=parser_config,
-                    source_id=source_id,
-                )
-
-            if article.error:
-                # 爬取失败
-                await pending_repo.update_status(article_id, PendingArticleStatus.FAILED)
-                failed_count += 1
-                logger.error(f"Failed to crawl {url}: {article.error}")
-                continue
-
-            # 验证内容
-            if not article.content or len(article.content) < 50:
-                await pending_repo.update_status(article_id, PendingArticleStatus.FAILED)
-                failed_count += 1
-                logger.error(f"Content too short for {url}")
-                continue
-
-            # 创建文章
-            create_data = ArticleCreate(
-                url=url,
-                title=article.title or pending_article.get("title") or "Untitled",
-                content=article.content,
-                publish_time=article.publish_time or pending_article.get("publish_time"),
-                author=article.author,
-                source_id=source_id,
-            )
-
-            new_article_id = await article_repo.create(create_data)
+    # 状态变更按批次提交，避免逐篇 UPDATE
+    completed_ids: list[int] = []
+    failed_ids: list[int] = []
+    await pending_repo.bulk_update_status(
+        [a["id"] for a in articles], PendingArticleStatus.CRAWLING
+    )
 
-            # 更新待爬文章状态为已完成
-            await pending_repo.update_status(article_id, PendingArticleStatus.COMPLETED)
+    # 批次内按规范化 URL 去重，同一文章只爬一次
+    seen_urls: set[str] = set()
 
-            crawled_count += 1
-            logger.info(f"Successfully crawled and saved article {new_article_id}: {url}")
+    try:
+        # 整个批次复用同一个爬虫实例（共享连接池）
+        async with UniversalScraper() as scraper:
+            for pending_article in articles:
+                try:
+                    article_id = pending_article["id"]
+                    url = pending_article["url"]
+
+                    normalized_url = normalize_url(url)
+                    if normalized_url in seen_urls:
+                        completed_ids.append(article_id)
+                        skipped_count += 1
+                        continue
+                    seen_urls.add(normalized_url)
+
+                    # 检查 URL 是否已存在于 articles 表
+                    url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+                    existing = await article_repo.get_by_url_hash(url_hash)
+
+                    if existing:
+                        # 已存在，标记为已完成
+                        completed_ids.append(article_id)
+                        skipped_count += 1
+                        logger.debug(f"Article already exists: {url}")
+                        continue
+
+                    # 使用 UniversalScraper 抓取内容
+                    article = await scraper.scrape(
+                        url=url,
+                        parser_config=parser_config,
+                        source_id=source_id,
+                    )
+
+                    if article.error:
+                        # 爬取失败
+                        failed_ids.append(article_id)
+                        failed_count += 1
+                        logger.debug(f"Failed to crawl {url}: {article.error}")
+                        continue
 
-        except Exception as e:
-            # 爬取失败
-            await pending_repo.update_status(pending_article["id"], PendingArticleStatus.FAILED)
-            failed_count += 1
-            logger.error(f"Error crawling article {pending_article['url']}: {e}", exc_info=True)
+                    # 验证内容
+                    if not article.content or len(article.content) < 50:
+                        failed_ids.append(article_id)
+                        failed_count += 1
+                        logger.debug(f"Content too short for {url}")
+                        continue
+
+                    # 创建文章
+                    create_data = ArticleCreate(
+                        url=url,
+                        title=article.title or pending_article.get("title") or "Untitled",
+                        content=article.content,
+                        publish_time=article.publish_time or pending_article.get("publish_time"),
+                        author=article.author,
+                        source_id=source_id,
+                    )
+
+                    new_article_id = await article_repo.create(create_data)
+
+                    # 更新待爬文章状态为已完成
+                    completed_ids.append(article_id)
+
+                    crawled_count += 1
+                    logger.debug(f"Successfully crawled and saved article {new_article_id}: {url}")
+
+                except Exception as e:
+                    # 爬取失败
+                    failed_ids.append(pending_article["id"])
+                    failed_count += 1
+                    logger.error(f"Error crawling article {pending_article['url']}: {e}", exc_info=True)
+    finally:
+        await _finish_crawl_batch(
+            pending_repo, [a["id"] for a in articles], completed_ids, failed_ids
+        )
 
-        # 添加延迟避免被封禁
-        await asyncio.sleep(1)
+    # 逐篇日志降为 debug，批次结束时只输出一条汇总
+    logger.info(
+        f"Crawled pending articles for source {source_id}: "
+        f"{crawled_count} crawled, {failed_count} failed, {skipped_count} skipped"
+    )
 
     return APIResponse(
         success=True,
@@ -304,20 +396,13 @@ async def crawl_pending_articles(
 @router.post("/pending/crawl-single/{article_id}", response_model=APIResponse[dict[str, Any]])
 async def crawl_single_pending_article(
     article_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_crawl_db),
 ):
     """
     爬取单个待爬文章
 
     类似搜索入库流程，但针对单个待爬文章
     """
-    import hashlib
-
-    from src.repository.article_repository import ArticleRepository
-    from src.repository.source_repository import SourceRepository
-    from src.services.universal_scraper import UniversalScraper
-    from src.core.models import ArticleCreate, ArticleStatus, ParserConfig
-
     pending_repo = PendingArticleRepository(db)
     article_repo = ArticleRepository(db)
     source_repo = SourceRepository(db)
@@ -354,7 +439,7 @@ async def crawl_single_pending_article(
     # 解析 parser_config
     parser_config = source.get("parser_config")
     if isinstance(parser_config, str):
-        parser_config = ParserConfig.model_validate_json(parser_config)
+        parser_config = ParserConfig.from_json(parser_config)
 
     # 更新状态为爬取中
     await pending_repo.update_status(article_id, PendingArticleStatus.CRAWLING)
@@ -410,309 +495,226 @@ async def crawl_single_pending_article(
         raise
 
 
-@router.get("/pending/crawl-all")
-async def crawl_all_pending_articles(
-    limit_per_source: int = Query(default=10, ge=1, le=100, description="每个源爬取数量限制"),
-    db: AsyncSession = Depends(get_db),
-):
+async def _crawl_stream(
+    db: AsyncSession,
+    status: PendingArticleStatus,
+    limit_per_source: int,
+    source_id: int | None = None,
+) -> AsyncIterator[bytes]:
     """
-    全局批量爬取所有源的待爬文章 (SSE 流式返回)
+    批量爬取待爬文章并生成 SSE 事件（全局爬取与失败重试共用）
+
+    各源指定状态的文章合并为一个队列，按发布时间倒序交错爬取（最新的优先）
 
-    自动识别所有有待爬文章的源，然后依次爬取
-    实时返回爬取进度和结果
+    Args:
+        db: 数据库会话
+        status: 要爬取的文章状态（pending 或 failed）
+        limit_per_source: 每个源的数量限制
+        source_id: 只处理指定源（可选）
     """
-    from src.repository.source_repository import SourceRepository
-    from src.repository.article_repository import ArticleRepository
-    from src.services.universal_scraper import UniversalScraper
-    from src.core.models import ArticleCreate, ParserConfig
-    import hashlib
+    pending_repo = PendingArticleRepository(db)
+    article_repo = ArticleRepository(db)
 
-    async def event_stream():
-        source_repo = SourceRepository(db)
-        pending_repo = PendingArticleRepository(db)
-        article_repo = ArticleRepository(db)
-
-        # 获取所有源
-        sources = await source_repo.fetch_all(
-            "SELECT DISTINCT s.* FROM crawl_sources s "
-            "INNER JOIN pending_articles p ON s.id = p.source_id "
-            "WHERE p.status = 'pending' "
-            "ORDER BY s.site_name"
-        )
+    # 一次查询取出所有源的文章（每个源最多 limit_per_source 篇）
+    articles = await pending_repo.get_pending_by_priority(
+        limit_per_source, status=status, source_id=source_id
+    )
 
-        if not sources:
-            yield f"event: start\ndata: {json.dumps({'sources_count': 0, 'message': 'No sources with pending articles found'})}\n\n"
-            yield f"event: complete\ndata: {json.dumps({'crawled': 0, 'failed': 0, 'skipped': 0})}\n\n"
-            return
+    def summary(stats: dict[str, Any]) -> dict[str, int]:
+        result = {"crawled": stats["crawled"], "failed": stats["failed"], "skipped": stats["skipped"]}
+        if status == PendingArticleStatus.FAILED:
+            # 兼容重试接口原有的 retried 字段（成功 + 已存在）
+            result["retried"] = stats["crawled"] + stats["skipped"]
+        return result
 
-        total_crawled = 0
-        total_failed = 0
-        total_skipped = 0
+    if not articles:
+        yield format_sse("start", {'sources_count': 0, 'message': f'No sources with {status.value} articles found'})
+        yield format_sse("complete", {**summary({"crawled": 0, "failed": 0, "skipped": 0}), 'total': 0})
+        return
+
+    # 按源汇总统计，源的首篇文章出现时发送 source_start；
+    # 解析器配置同时按源预解析一次，循环内只做字典查找
+    source_stats: dict[int, dict[str, Any]] = {}
+    parser_configs: dict[int, ParserConfig | None] = {}
+    for pending_article in articles:
+        article_source_id = pending_article["source_id"]
+        if article_source_id not in source_stats:
+            source_stats[article_source_id] = {
+                "source_name": pending_article["site_name"],
+                "articles_count": 0,
+                "crawled": 0,
+                "failed": 0,
+                "skipped": 0,
+            }
+            parser_config = pending_article["parser_config"]
+            try:
+                parser_configs[article_source_id] = (
+                    ParserConfig.from_json(parser_config)
+                    if isinstance(parser_config, str)
+                    else ParserConfig.model_validate(parser_config)
+                )
+            except Exception as e:
+                logger.error(f"Invalid parser_config for source {article_source_id}: {e}")
+                parser_configs[article_source_id] = None
+        source_stats[article_source_id]["articles_count"] += 1
 
-        # 发送开始事件
-        yield f"event: start\ndata: {json.dumps({'sources_count': len(sources), 'message': f'Starting crawl for {len(sources)} sources'})}\n\n"
+    started_sources: set[int] = set()
+    seen_urls: set[str] = set()
 
-        for idx, source in enumerate(sources):
-            source_id = source["id"]
-            source_name = source["site_name"]
+    # 发送开始事件
+    yield format_sse("start", {'sources_count': len(source_stats), 'message': f'Starting crawl for {len(source_stats)} sources'})
 
-            try:
-                parser_config = source.get("parser_config")
-                if isinstance(parser_config, str):
-                    parser_config = ParserConfig.model_validate_json(parser_config)
-
-                articles = await pending_repo.get_by_source(
-                    source_id,
-                    status=PendingArticleStatus.PENDING,
-                    limit=limit_per_source,
-                )
+    # 状态变更批量提交，避免逐篇 UPDATE
+    completed_ids: list[int] = []
+    failed_ids: list[int] = []
+    await pending_repo.bulk_update_status(
+        [a["id"] for a in articles], PendingArticleStatus.CRAWLING
+    )
 
-                if not articles:
+    try:
+        async with UniversalScraper() as scraper:
+            for pending_article in articles:
+                article_id = pending_article["id"]
+                url = pending_article["url"]
+                article_source_id = pending_article["source_id"]
+                stats = source_stats[article_source_id]
+
+                if article_source_id not in started_sources:
+                    started_sources.add(article_source_id)
+                    yield format_sse("source_start", {'source_id': article_source_id, 'source_name': stats["source_name"], 'articles_count': stats["articles_count"], 'source_index': len(started_sources)})
+
+                normalized_url = normalize_url(url)
+                if normalized_url in seen_urls:
+                    completed_ids.append(article_id)
+                    stats["skipped"] += 1
+                    yield format_sse("article_skipped", {'url': url, 'reason': 'duplicate'})
                     continue
+                seen_urls.add(normalized_url)
 
-                # 发送源开始事件
-                yield f"event: source_start\ndata: {json.dumps({'source_id': source_id, 'source_name': source_name, 'articles_count': len(articles), 'source_index': idx + 1})}\n\n"
-
-                crawled_count = 0
-                failed_count = 0
-                skipped_count = 0
-
-                for article_idx, pending_article in enumerate(articles):
-                    try:
-                        article_id = pending_article["id"]
-                        url = pending_article["url"]
-
-                        # 检查 URL 是否已存在
-                        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
-                        existing = await article_repo.get_by_url_hash(url_hash)
-
-                        if existing:
-                            await pending_repo.update_status(article_id, PendingArticleStatus.COMPLETED)
-                            skipped_count += 1
-                            yield f"event: article_skipped\ndata: {json.dumps({'url': url, 'reason': 'already_exists'})}\n\n"
-                            continue
-
-                        await pending_repo.update_status(article_id, PendingArticleStatus.CRAWLING)
-
-                        async with UniversalScraper() as scraper:
-                            article = await scraper.scrape(
-                                url=url,
-                                parser_config=parser_config,
-                                source_id=source_id,
-                            )
-
-                        if article.error:
-                            await pending_repo.update_status(article_id, PendingArticleStatus.FAILED)
-                            failed_count += 1
-                            yield f"event: article_failed\ndata: {json.dumps({'url': url, 'error': article.error})}\n\n"
-                            continue
-
-                        if not article.content or len(article.content) < 50:
-                            await pending_repo.update_status(article_id, PendingArticleStatus.FAILED)
-                            failed_count += 1
-                            yield f"event: article_failed\ndata: {json.dumps({'url': url, 'error': 'Content too short'})}\n\n"
-                            continue
-
-                        create_data = ArticleCreate(
-                            url=url,
-                            title=article.title or pending_article.get("title") or "Untitled",
-                            content=article.content,
-                            publish_time=article.publish_time or pending_article.get("publish_time"),
-                            author=article.author,
-                            source_id=source_id,
-                        )
-
-                        new_article_id = await article_repo.create(create_data)
-                        await pending_repo.update_status(article_id, PendingArticleStatus.COMPLETED)
-
-                        crawled_count += 1
-                        # 发送单个文章成功事件
-                        yield f"event: article_success\ndata: {json.dumps({'article_id': new_article_id, 'url': url, 'title': article.title})}\n\n"
-
-                    except Exception as e:
-                        await pending_repo.update_status(pending_article["id"], PendingArticleStatus.FAILED)
-                        failed_count += 1
-                        yield f"event: article_failed\ndata: {json.dumps({'url': pending_article['url'], 'error': str(e)})}\n\n"
+                parser_config = parser_configs[article_source_id]
+                if parser_config is None:
+                    failed_ids.append(article_id)
+                    stats["failed"] += 1
+                    yield format_sse("article_failed", {'url': url, 'error': 'Invalid parser config'})
+                    continue
 
-                    await asyncio.sleep(1)
+                try:
+                    # 检查 URL 是否已存在
+                    url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+                    existing = await article_repo.get_by_url_hash(url_hash)
+
+                    if existing:
+                        completed_ids.append(article_id)
+                        stats["skipped"] += 1
+                        yield format_sse("article_skipped", {'url': url, 'reason': 'already_exists'})
+                        continue
+
+                    article = await scraper.scrape(
+                        url=url,
+                        parser_config=parser_config,
+                        source_id=article_source_id,
+                    )
+
+                    if article.error:
+                        failed_ids.append(article_id)
+                        stats["failed"] += 1
+                        yield format_sse("article_failed", {'url': url, 'error': article.error})
+                        continue
+
+                    if not article.content or len(article.content) < 50:
+                        failed_ids.append(article_id)
+                        stats["failed"] += 1
+                        yield format_sse("article_failed", {'url': url, 'error': 'Content too short'})
+                        continue
+
+                    create_data = ArticleCreate(
+                        url=url,
+                        title=article.title or pending_article.get("title") or "Untitled",
+                        content=article.content,
+                        publish_time=article.publish_time or pending_article.get("publish_time"),
+                        author=article.author,
+                        source_id=article_source_id,
+                    )
+
+                    new_article_id = await article_repo.create(create_data)
+                    completed_ids.append(article_id)
+
+                    stats["crawled"] += 1
+                    # 发送单个文章成功事件
+                    yield format_sse("article_success", {'article_id': new_article_id, 'url': url, 'title': article.title})
+
+                except Exception as e:
+                    failed_ids.append(article_id)
+                    stats["failed"] += 1
+                    yield format_sse("article_failed", {'url': url, 'error': str(e)})
+    finally:
+        # 客户端断开或流被取消时同样提交已处理的结果，未处理的恢复为 PENDING
+        await _finish_crawl_batch(
+            pending_repo, [a["id"] for a in articles], completed_ids, failed_ids
+        )
 
-                total_crawled += crawled_count
-                total_failed += failed_count
-                total_skipped += skipped_count
+    # 发送各源完成事件（逐篇结果只走 SSE，日志按源汇总一条）
+    for stats_source_id, stats in source_stats.items():
+        logger.info(
+            f"Crawled {status.value} articles for source {stats['source_name']}: "
+            f"{stats['crawled']} crawled, {stats['failed']} failed, {stats['skipped']} skipped"
+        )
+        yield format_sse("source_complete", {'source_id': stats_source_id, 'source_name': stats["source_name"], **summary(stats)})
 
-                # 发送源完成事件
-                yield f"event: source_complete\ndata: {json.dumps({'source_id': source_id, 'source_name': source_name, 'crawled': crawled_count, 'failed': failed_count, 'skipped': skipped_count})}\n\n"
+    totals = {
+        key: sum(stats[key] for stats in source_stats.values())
+        for key in ("crawled", "failed", "skipped")
+    }
 
-            except Exception as e:
-                logger.error(f"Error processing source {source_name}: {e}", exc_info=True)
-                continue
-
-        # 发送完成事件
-        yield f"event: complete\ndata: {json.dumps({'crawled': total_crawled, 'failed': total_failed, 'skipped': total_skipped, 'total': total_crawled + total_failed + total_skipped})}\n\n"
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    # 发送完成事件
+    yield format_sse("complete", {**summary(totals), 'total': sum(totals.values())})
+
+
+@router.get("/pending/crawl-all")
+async def crawl_all_pending_articles(
+    limit_per_source: int = Query(default=10, ge=1, le=100, description="每个源爬取数量限制"),
+):
+    """
+    全局批量爬取所有源的待爬文章 (SSE 流式返回)
+
+    所有源的待爬文章合并为一个队列，按发布时间倒序交错爬取（最新的优先），
+    而不是逐个源依次爬完；实时返回爬取进度和结果
+    """
+
+    async def event_stream():
+        async with _crawl_session() as db:
+            async for chunk in _crawl_stream(db, PendingArticleStatus.PENDING, limit_per_source):
+                yield chunk
+
+    return sse_response(event_stream())
 
 
 @router.get("/pending/retry-failed")
 async def retry_failed_articles(
     source_id: int | None = Query(default=None, description="源 ID（不指定则重试所有源的失败文章）"),
     limit: int = Query(default=10, ge=1, le=100, description="每个源重试数量限制"),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     批量重试失败的待爬文章 (SSE 流式返回)
 
-    将失败的文章状态重置为 pending，然后重新爬取
+    与全局爬取共用同一流程，只是选取失败状态的文章重新爬取
     实时返回重试进度和结果
     """
-    from src.repository.source_repository import SourceRepository
-    from src.repository.article_repository import ArticleRepository
-    from src.services.universal_scraper import UniversalScraper
-    from src.core.models import ArticleCreate, ParserConfig
-    import hashlib
 
     async def event_stream():
-        source_repo = SourceRepository(db)
-        pending_repo = PendingArticleRepository(db)
-        article_repo = ArticleRepository(db)
-
-        # 获取源列表
-        if source_id is not None:
-            source = await source_repo.fetch_by_id(source_id)
-            if not source:
-                yield f"event: error\ndata: {json.dumps({'message': f'Source {source_id} not found'})}\n\n"
-                return
-            sources = [source]
-        else:
-            sources = await source_repo.fetch_all(
-                "SELECT DISTINCT s.* FROM crawl_sources s "
-                "INNER JOIN pending_articles p ON s.id = p.source_id "
-                "WHERE p.status = 'failed' "
-                "ORDER BY s.site_name"
-            )
-
-        if not sources:
-            yield f"event: start\ndata: {json.dumps({'sources_count': 0, 'message': 'No failed articles found to retry'})}\n\n"
-            yield f"event: complete\ndata: {json.dumps({'retried': 0, 'failed': 0})}\n\n"
-            return
+        async with _crawl_session() as db:
+            if source_id is not None:
+                source = await SourceRepository(db).fetch_by_id(source_id)
+                if not source:
+                    yield format_sse("error", {'message': f'Source {source_id} not found'})
+                    return
 
-        total_retried = 0
-        total_failed = 0
+            async for chunk in _crawl_stream(
+                db, PendingArticleStatus.FAILED, limit, source_id=source_id
+            ):
+                yield chunk
 
-        yield f"event: start\ndata: {json.dumps({'sources_count': len(sources), 'message': f'Starting retry for {len(sources)} sources'})}\n\n"
-
-        for idx, source in enumerate(sources):
-            source_id = source["id"]
-            source_name = source["site_name"]
-
-            try:
-                parser_config = source.get("parser_config")
-                if isinstance(parser_config, str):
-                    parser_config = ParserConfig.model_validate_json(parser_config)
-
-                articles = await pending_repo.get_by_source(
-                    source_id,
-                    status=PendingArticleStatus.FAILED,
-                    limit=limit,
-                )
-
-                if not articles:
-                    continue
-
-                yield f"event: source_start\ndata: {json.dumps({'source_id': source_id, 'source_name': source_name, 'articles_count': len(articles), 'source_index': idx + 1})}\n\n"
-
-                retried_count = 0
-                failed_count = 0
-
-                for pending_article in articles:
-                    try:
-                        article_id = pending_article["id"]
-                        url = pending_article["url"]
-
-                        # 重置状态为待爬
-                        await pending_repo.update_status(article_id, PendingArticleStatus.PENDING)
-
-                        # 检查 URL 是否已存在
-                        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
-                        existing = await article_repo.get_by_url_hash(url_hash)
-
-                        if existing:
-                            await pending_repo.update_status(article_id, PendingArticleStatus.COMPLETED)
-                            retried_count += 1
-                            yield f"event: article_skipped\ndata: {json.dumps({'url': url, 'reason': 'already_exists'})}\n\n"
-                            continue
-
-                        await pending_repo.update_status(article_id, PendingArticleStatus.CRAWLING)
-
-                        async with UniversalScraper() as scraper:
-                            article = await scraper.scrape(
-                                url=url,
-                                parser_config=parser_config,
-                                source_id=source_id,
-                            )
-
-                        if article.error:
-                            await pending_repo.update_status(article_id, PendingArticleStatus.FAILED)
-                            failed_count += 1
-                            yield f"event: article_failed\ndata: {json.dumps({'url': url, 'error': article.error})}\n\n"
-                            continue
-
-                        if not article.content or len(article.content) < 50:
-                            await pending_repo.update_status(article_id, PendingArticleStatus.FAILED)
-                            failed_count += 1
-                            yield f"event: article_failed\ndata: {json.dumps({'url': url, 'error': 'Content too short'})}\n\n"
-                            continue
-
-                        create_data = ArticleCreate(
-                            url=url,
-                            title=article.title or pending_article.get("title") or "Untitled",
-                            content=article.content,
-                            publish_time=article.publish_time or pending_article.get("publish_time"),
-                            author=article.author,
-                            source_id=source_id,
-                        )
-
-                        new_article_id = await article_repo.create(create_data)
-                        await pending_repo.update_status(article_id, PendingArticleStatus.COMPLETED)
-
-                        retried_count += 1
-                        yield f"event: article_success\ndata: {json.dumps({'article_id': new_article_id, 'url': url, 'title': article.title})}\n\n"
-
-                    except Exception as e:
-                        await pending_repo.update_status(pending_article["id"], PendingArticleStatus.FAILED)
-                        failed_count += 1
-                        yield f"event: article_failed\ndata: {json.dumps({'url': pending_article['url'], 'error': str(e)})}\n\n"
-
-                    await asyncio.sleep(1)
-
-                total_retried += retried_count
-                total_failed += failed_count
-
-                yield f"event: source_complete\ndata: {json.dumps({'source_id': source_id, 'source_name': source_name, 'retried': retried_count, 'failed': failed_count})}\n\n"
-
-            except Exception as e:
-                logger.error(f"Error processing source {source_name}: {e}", exc_info=True)
-                continue
-
-        yield f"event: complete\ndata: {json.dumps({'retried': total_retried, 'failed': total_failed, 'total': total_retried + total_failed})}\n\n"
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(event_stream())
 
 
 # ============================================================================
@@ -774,7 +776,7 @@ async def fetch_robots_sitemaps(
             data={
                 "source_id": source_id,
                 "sitemaps_found": len(sitemaps),
-                "sitemaps": [dict(s) for s in sitemaps],
+                "sitemaps": [s.model_dump() for s in sitemaps],
             },
         )
     finally:
@@ -3,11 +3,16 @@
 /api/v1/sources
 """
 
+import asyncio
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
+from urllib.parse import urlparse
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.schemas import (
@@ -24,8 +29,14 @@ from src.api.schemas import (
     SourceFilter,
     SourceStats,
 )
-from src.core.models import CrawlSource, ParserConfig, SourceCreate, SourceUpdate
+from src.core.database import get_async_session
+from src.core.models import CrawlSource, ParserConfig, SourceCreate, SourceUpdate, TaskType
+from src.repository.sitemap_repository import SitemapRepository
 from src.repository.source_repository import SourceRepository
+from src.services.robots_handler import RobotsHandler
+from src.services.sitemap_service import SitemapService
+from src.services.task_manager import TaskManager, task_queue
+from src.services.universal_scraper import UniversalScraper
 
 
 logger = logging.getLogger(__name__)
@@ -33,17 +44,50 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+@lru_cache(maxsize=4096)
+def _parse_host(url: str) -> str:
+    """从 URL 提取站点名称（去掉 www. 前缀）"""
+    return urlparse(url).netloc.removeprefix("www.")
+
+
+def _normalize_base_url(url: str) -> str:
+    """规范化导入的 base_url（去空白，缺省协议补 https://）"""
+    url = url.strip()
+    if url and not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    return url
+
+
 # ============================================================================
 # 依赖注入
 # ============================================================================
 
 async def get_db() -> AsyncSession:  # type: ignore
     """获取数据库会话（占位，实际应从配置注入）"""
-    from src.core.database import get_async_session
     async with get_async_session() as session:
         yield session
 
 
+async def get_source_repo(db: AsyncSession = Depends(get_db)) -> SourceRepository:
+    """获取采集源 Repository（与同一请求的其它依赖共享会话）"""
+    return SourceRepository(db)
+
+
+async def get_sitemap_repo(db: AsyncSession = Depends(get_db)) -> SitemapRepository:
+    """获取 Sitemap Repository（与同一请求的其它依赖共享会话）"""
+    return SitemapRepository(db)
+
+
+def get_scraper(request: Request) -> UniversalScraper:
+    """获取应用共享的爬虫实例"""
+    return request.app.state.scraper
+
+
+def get_robots(request: Request) -> RobotsHandler:
+    """获取应用共享的 Robots 处理器"""
+    return request.app.state.robots_handler
+
+
 # ============================================================================
 # CRUD 操作
 # ============================================================================
@@ -52,7 +96,8 @@ async def get_db() -> AsyncSession:  # type: ignore
 async def list_sources(
     pagination: PaginationParams = Depends(),
     filter: SourceFilter = Depends(),
-    db: AsyncSession = Depends(get_db),
+    exact_count: bool = Query(default=False, description="返回精确总数"),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """
     获取采集源列表
@@ -62,8 +107,9 @@ async def list_sources(
     - 按启用状态筛选
     - 按发现策略筛选
     - 按 Robots 状态筛选
+
+    无筛选的首页使用估算总数，避免全表 COUNT；需要精确值时传 exact_count=true
     """
-    repo = SourceRepository(db)
 
     # 构建筛选条件
     filters: dict[str, Any] = {}
@@ -74,26 +120,36 @@ async def list_sources(
     if filter.robots_status is not None:
         filters["robots_status"] = filter.robots_status
 
-    # 获取总数
-    total = await repo.count(filters=filters)
-
-    # 获取分页数据
-    sources = await repo.fetch_many(
-        filters=filters,
-        limit=pagination.page_size,
-        offset=pagination.offset,
-        order_by=(
-            f"created_at {pagination.sort_order}"
-            if pagination.sort_by == "created_at"
-            else f"site_name {pagination.sort_order}"
+    async def count_sources() -> int:
+        # 总数使用独立会话，与分页查询并行（同一会话不能并发执行）
+        async with get_async_session() as count_db:
+            count_repo = SourceRepository(count_db)
+            if filters or exact_count or pagination.page > 1:
+                return await count_repo.count(filters=filters)
+            return await count_repo.estimate_count(count_repo.TABLE_NAME)
+
+    # 排序字段只接受白名单，未指定时按站点名称排序
+    sort_by = pagination.sort_by or "site_name"
+    order_by = SourceRepository.ORDER_BY_CLAUSES.get((sort_by, pagination.sort_order))
+    if order_by is None:
+        raise BadRequestException(
+            message=f"Unsupported sort field: {sort_by}",
+            details={"sort_by": sort_by},
+        )
+
+    # 并行获取总数和分页数据（列表只返回摘要列，详情通过 /{source_id} 获取）
+    total, sources = await asyncio.gather(
+        count_sources(),
+        repo.fetch_many_summary(
+            filters=filters,
+            limit=pagination.page_size,
+            offset=pagination.offset,
+            order_by=order_by,
         ),
     )
 
-    # 转换为字典
-    items = [dict(s) for s in sources]
-
     paginated = PaginatedResponse.create(
-        items=items,
+        items=sources,
         total=total,
         page=pagination.page,
         page_size=pagination.page_size,
@@ -105,22 +161,20 @@ async def list_sources(
 @router.get("/{source_id}", response_model=APIResponse[dict[str, Any]])
 async def get_source(
     source_id: int,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """获取单个采集源详情"""
-    repo = SourceRepository(db)
-
     source = await repo.fetch_by_id(source_id)
     if source is None:
         raise NotFoundException(f"Source {source_id} not found")
 
-    return APIResponse(success=True, data=dict(source))
+    return APIResponse(success=True, data=source)
 
 
 @router.post("", response_model=APIResponse[dict[str, Any]], status_code=status.HTTP_201_CREATED)
 async def create_source(
     data: SourceCreate,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """
     创建采集源
@@ -129,24 +183,23 @@ async def create_source(
     - 单个创建
     - 批量导入（通过 bulk_create 端点）
     """
-    repo = SourceRepository(db)
 
     # 检查是否已存在
     existing = await repo.fetch_by_base_url(data.base_url)
     if existing:
         raise ConflictException(
             message=f"Source with base_url {data.base_url} already exists",
-            details={"existing_id": existing.id},
+            details={"existing_id": existing["id"]},
         )
 
     # 创建源
     source = await repo.create(data)
 
-    logger.info(f"Created source: {source.id} - {source.site_name}")
+    logger.info(f"Created source: {source['id']} - {source['site_name']}")
 
     return APIResponse(
         success=True,
-        data=dict(source),
+        data=source,
     )
 
 
@@ -154,7 +207,7 @@ async def create_source(
 async def bulk_create_sources(
     base_urls: list[str],
     default_parser_config: ParserConfig | None = None,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """
     批量导入采集源
@@ -164,47 +217,68 @@ async def bulk_create_sources(
     - 自动去重
     - 自动识别站点名称
     """
-    repo = SourceRepository(db)
-
-    success_count = 0
     failed_count = 0
     errors = []
 
-    for url in base_urls:
+    # 规范化并去重（保持输入顺序，末尾斜杠不同视为同一 URL，空行直接丢弃）
+    unique_urls: dict[str, str] = {}
+    for url in map(_normalize_base_url, base_urls):
+        if url:
+            unique_urls.setdefault(url.rstrip("/"), url)
+    urls = list(unique_urls.values())
+
+    # 一次查询检查已存在的源
+    existing_ids = await repo.fetch_ids_by_base_urls(urls)
+
+    parser_config = default_parser_config or ParserConfig(
+        title_selector="h1",
+        content_selector="article, main",
+    )
+
+    # 站点名称唯一（uk_site_name）：同一主机的多个 URL 只能导入第一个
+    existing_names = await repo.fetch_ids_by_site_names(
+        [_parse_host(url) for url in urls if url.rstrip("/") not in existing_ids]
+    )
+    batch_names: set[str] = set()
+
+    new_sources: list[SourceCreate] = []
+    for url in urls:
+        key = url.rstrip("/")
+        if key in existing_ids:
+            errors.append({
+                "url": url,
+                "error": "Already exists",
+                "existing_id": existing_ids[key],
+            })
+            failed_count += 1
+            continue
+
         try:
-            # 规范化 URL
-            url = url.strip()
-            if not url.startswith(("http://", "https://")):
-                url = "https://" + url
-
-            # 检查是否已存在
-            existing = await repo.fetch_by_base_url(url)
-            if existing:
+            # 提取站点名称
+            site_name = _parse_host(url)
+
+            if site_name in existing_names:
                 errors.append({
                     "url": url,
-                    "error": "Already exists",
-                    "existing_id": existing.id,
+                    "error": f"Site name already exists: {site_name}",
+                    "existing_id": existing_names[site_name],
                 })
                 failed_count += 1
                 continue
+            if site_name in batch_names:
+                errors.append({
+                    "url": url,
+                    "error": f"Duplicate site name in batch: {site_name}",
+                })
+                failed_count += 1
+                continue
+            batch_names.add(site_name)
 
-            # 提取站点名称
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            site_name = parsed.netloc.replace("www.", "")
-
-            # 创建源
-            data = SourceCreate(
+            new_sources.append(SourceCreate(
                 site_name=site_name,
                 base_url=url,
-                parser_config=default_parser_config or ParserConfig(
-                    title_selector="h1",
-                    content_selector="article, main",
-                ),
-            )
-
-            await repo.create(data)
-            success_count += 1
+                parser_config=parser_config,
+            ))
 
         except Exception as e:
             logger.error(f"Failed to create source from URL {url}: {e}")
@@ -214,6 +288,21 @@ async def bulk_create_sources(
             })
             failed_count += 1
 
+    # 新源一次批量插入；与并发导入冲突时回退为逐条插入，逐条报告失败
+    try:
+        success_count = await repo.bulk_create(new_sources)
+    except IntegrityError:
+        await repo.session.rollback()
+        success_count = 0
+        for source in new_sources:
+            try:
+                await repo.create(source)
+                success_count += 1
+            except IntegrityError as e:
+                await repo.session.rollback()
+                errors.append({"url": source.base_url, "error": str(e.orig)})
+                failed_count += 1
+
     logger.info(f"Bulk create sources: {success_count} succeeded, {failed_count} failed")
 
     return APIResponse(
@@ -230,7 +319,8 @@ async def bulk_create_sources(
 async def update_source(
     source_id: int,
     data: SourceUpdate,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
+    sitemap_repo: SitemapRepository = Depends(get_sitemap_repo),
 ):
     """
     更新采集源配置
@@ -238,44 +328,36 @@ async def update_source(
     注意：启用源前必须先配置 Sitemap
     没有有效 Sitemap 的源无法启用
     """
-    repo = SourceRepository(db)
-
-    source = await repo.fetch_by_id(source_id)
-    if source is None:
-        raise NotFoundException(f"Source {source_id} not found")
 
     # 验证：如果要启用源，必须有有效的 Sitemap
     if data.enabled is True:
-        from src.repository.sitemap_repository import SitemapRepository
-        sitemap_repo = SitemapRepository(db)
-
         sitemaps = await sitemap_repo.get_by_source(source_id)
         if not sitemaps:
+            if not await repo.exists_by_id(source_id):
+                raise NotFoundException(f"Source {source_id} not found")
             raise BadRequestException(
                 message="Cannot enable source: No sitemap configured. "
                        "Please add a sitemap first.",
                 details={"source_id": source_id, "sitemaps_count": 0},
             )
 
+    # UPDATE ... RETURNING 一次完成更新和存在性检查
     updated = await repo.update(source_id, data)
+    if updated is None:
+        raise NotFoundException(f"Source {source_id} not found")
 
-    return APIResponse(success=True, data=dict(updated))
+    return APIResponse(success=True, data=updated)
 
 
 @router.delete("/{source_id}", response_model=APIResponse[dict[str, Any]])
 async def delete_source(
     source_id: int,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """删除采集源（级联删除相关文章）"""
-    repo = SourceRepository(db)
-
-    source = await repo.fetch_by_id(source_id)
-    if source is None:
+    if not await repo.delete(source_id):
         raise NotFoundException(f"Source {source_id} not found")
 
-    await repo.delete(source_id)
-
     logger.info(f"Deleted source: {source_id}")
 
     return APIResponse(success=True, data={"deleted_id": source_id})
@@ -289,7 +371,7 @@ async def delete_source(
 async def debug_parser(
     url: str,
     config: ParserConfig,
-    db: AsyncSession = Depends(get_db),
+    scraper: UniversalScraper = Depends(get_scraper),
 ):
     """
     实时调试解析器配置
@@ -300,30 +382,21 @@ async def debug_parser(
     - 提取的时间
     - 提取的作者
     """
-    import time
-
-    from src.services.universal_scraper import UniversalScraper
-    from src.services.time_extractor import TimeExtractor
-
     start_time = time.time()
 
     try:
-        # 使用 UniversalScraper 抓取
-        scraper = UniversalScraper()
+        # 使用共享的 UniversalScraper 抓取
         article = await scraper.scrape(
             url=url,
             parser_config=config,
             source_id=0,  # 调试模式，不关联具体源
         )
 
-        # 使用 TimeExtractor 提取时间
-        time_extractor = TimeExtractor()
+        # 使用爬虫自带的 TimeExtractor 从正文和 URL 补充时间
         if article.publish_time is None and article.content:
-            article.publish_time = time_extractor.extract_time(
-                html="",  # 已经提取过了
+            article.publish_time = scraper.time_extractor.extract_publish_time(
+                html_content=article.content,
                 url=url,
-                content=article.content,
-                title=article.title,
             )
 
         extraction_time = int((time.time() - start_time) * 1000)
@@ -363,32 +436,27 @@ async def debug_parser(
 @router.get("/{source_id}/sitemap", response_model=APIResponse[list[dict[str, Any]]])
 async def get_source_sitemaps(
     source_id: int,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
+    sitemap_repo: SitemapRepository = Depends(get_sitemap_repo),
 ):
     """
     获取源的 Sitemap 列表
 
     返回该源关联的所有 Sitemap
     """
-    from src.repository.sitemap_repository import SitemapRepository
 
-    repo = SourceRepository(db)
-    sitemap_repo = SitemapRepository(db)
-
-    # 检查源是否存在
-    source = await repo.fetch_by_id(source_id)
-    if source is None:
-        raise NotFoundException(f"Source {source_id} not found")
-
-    # 获取源的所有 sitemap
+    # 获取源的所有 sitemap，结果为空时才检查源是否存在
     sitemaps = await sitemap_repo.get_by_source(source_id)
+    if not sitemaps and not await repo.exists_by_id(source_id):
+        raise NotFoundException(f"Source {source_id} not found")
 
-    return APIResponse(success=True, data=[dict(s) for s in sitemaps])
+    return APIResponse(success=True, data=sitemaps)
 
 
 @router.post("/{source_id}/sitemap/discover", response_model=APIResponse[dict[str, Any]])
 async def discover_sitemaps(
     source_id: int,
+    repo: SourceRepository = Depends(get_source_repo),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -396,9 +464,6 @@ async def discover_sitemaps(
 
     自动解析 robots.txt，提取所有 Sitemap URL 并存储到数据库
     """
-    from src.services.sitemap_service import SitemapService
-
-    repo = SourceRepository(db)
 
     # 检查源是否存在
     source = await repo.fetch_by_id(source_id)
@@ -414,7 +479,7 @@ async def discover_sitemaps(
             data={
                 "source_id": source_id,
                 "sitemaps_found": len(sitemaps),
-                "sitemaps": [dict(s) for s in sitemaps],
+                "sitemaps": [s.model_dump() for s in sitemaps],
             },
         )
     finally:
@@ -424,6 +489,7 @@ async def discover_sitemaps(
 @router.post("/{source_id}/sitemap/sync", response_model=APIResponse[dict[str, Any]])
 async def sync_sitemap_articles(
     source_id: int,
+    repo: SourceRepository = Depends(get_source_repo),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -434,9 +500,6 @@ async def sync_sitemap_articles(
     2. 递归解析所有 Sitemap
     3. 提取文章链接到待爬表
     """
-    from src.services.sitemap_service import SitemapService
-
-    repo = SourceRepository(db)
 
     # 检查源是否存在
     source = await repo.fetch_by_id(source_id)
@@ -459,22 +522,25 @@ async def sync_sitemap_articles(
 @router.get("/{source_id}/robots", response_model=APIResponse[dict[str, Any]])
 async def get_robots_status(
     source_id: int,
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """获取 Robots.txt 状态"""
-    repo = SourceRepository(db)
-
-    source = await repo.fetch_by_id(source_id)
-    if source is None:
+    robots = await repo.fetch_robots_info(source_id)
+    if robots is None:
         raise NotFoundException(f"Source {source_id} not found")
 
+    # SQLite 下 text() 查询返回的 DATETIME 是字符串，MySQL 下是 datetime
+    fetched_at = robots["robots_fetched_at"]
+    if fetched_at and hasattr(fetched_at, "isoformat"):
+        fetched_at = fetched_at.isoformat()
+
     return APIResponse(
         success=True,
         data={
             "source_id": source_id,
-            "robots_status": source.robots_status.value,
-            "crawl_delay": source.crawl_delay,
-            "robots_fetched_at": source.robots_fetched_at.isoformat() if source.robots_fetched_at else None,
+            "robots_status": robots["robots_status"],
+            "crawl_delay": robots["crawl_delay"],
+            "robots_fetched_at": fetched_at or None,
         },
     )
 
@@ -482,19 +548,15 @@ async def get_robots_status(
 @router.post("/{source_id}/robots/fetch", response_model=APIResponse[dict[str, Any]])
 async def fetch_robots(
     source_id: int,
-    db: AsyncSession = Depends(get_db),
+    handler: RobotsHandler = Depends(get_robots),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """手动获取 Robots.txt"""
-    repo = SourceRepository(db)
-
     source = await repo.fetch_by_id(source_id)
     if source is None:
         raise NotFoundException(f"Source {source_id} not found")
 
-    from src.services.robots_handler import RobotsHandler
-
-    handler = RobotsHandler()
-    robots_info = await handler.fetch_and_parse(source.base_url + "/robots.txt")
+    robots_info = await handler.fetch_and_parse(source["base_url"] + "/robots.txt")
 
     # 更新源配置
     await repo.update(source_id, SourceUpdate(
@@ -522,12 +584,9 @@ async def fetch_robots(
 @router.get("/stats/all", response_model=APIResponse[list[SourceStats]])
 async def get_sources_stats(
     days: int = Query(default=30, ge=1, le=365, description="统计天数"),
-    db: AsyncSession = Depends(get_db),
+    repo: SourceRepository = Depends(get_source_repo),
 ):
     """获取所有源的统计数据"""
-    repo = SourceRepository(db)
-
-    from datetime import timedelta
     start_date = datetime.now() - timedelta(days=days)
 
     stats = await repo.get_stats(start_date=start_date)
@@ -539,32 +598,34 @@ async def get_sources_stats(
 async def trigger_crawl(
     source_id: int,
     force: bool = Query(default=False, description="强制抓取（忽略间隔限制）"),
+    repo: SourceRepository = Depends(get_source_repo),
     db: AsyncSession = Depends(get_db),
 ):
     """
     手动触发抓取任务
 
-    队列化处理，立即返回任务 ID
+    创建该源的待爬文章抓取任务并放入任务队列，立即返回任务 ID
     """
-    repo = SourceRepository(db)
-
     source = await repo.fetch_by_id(source_id)
     if source is None:
         raise NotFoundException(f"Source {source_id} not found")
 
-    if not source.enabled:
+    if not source["enabled"]:
         raise BadRequestException(f"Source {source_id} is disabled")
 
-    # TODO: 队列化处理
-    # from src.services.collector import NewsCollector
-    # collector = NewsCollector()
-    # task_id = await collector.crawl_source(source_id, force=force)
+    manager = TaskManager(db)
+    task = await manager.create_task(
+        task_type=TaskType.CRAWL_PENDING,
+        title=f"抓取源 {source_id} 的待爬文章",
+        params={"source_id": source_id, "force": force},
+    )
+    await task_queue.enqueue(task.id)
 
     return APIResponse(
         success=True,
         data={
             "source_id": source_id,
-            "task_id": f"crawl_{source_id}_{datetime.now().timestamp()}",
+            "task_id": task.id,
             "status": "queued",
         },
     )
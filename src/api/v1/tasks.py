@@ -4,13 +4,10 @@
 """
 
 import asyncio
-import json
 import logging
-from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, Query, status
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.schemas import (
@@ -20,15 +17,18 @@ from src.api.schemas import (
     PaginatedResponse,
     PaginationParams,
 )
+from src.api.sse import format_sse, sse_response
+from src.core.database import get_async_session
 from src.core.models import (
+    TERMINAL_TASK_STATUSES,
     Task,
     TaskCreate,
     TaskEventType,
     TaskStatus,
     TaskType,
 )
-from src.repository.task_repository import TaskRepository
-from src.services.task_manager import TaskManager, TaskExecutorRegistry
+from src.repository.task_repository import TaskRepository, task_event_notifier
+from src.services.task_manager import TaskManager, TaskExecutorRegistry, task_queue
 
 
 logger = logging.getLogger(__name__)
@@ -36,16 +36,89 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def serialize_datetime(obj: Any) -> Any:
-    """转换 datetime 对象为 ISO 格式字符串"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
+# SSE 流在没有通知时的兜底重查间隔（秒），防止漏掉其它进程写入的事件：
+# 有变化后从最小值开始，之后每次无变化翻倍，直到上限（通知只在进程内传递，
+# 其它进程写入的进度最多延迟一个上限间隔）
+TASK_STREAM_MIN_INTERVAL = 0.05
+TASK_STREAM_MAX_INTERVAL = 1.0
 
+# 超过该时间没有任何输出时发送 SSE 注释，保持连接不被代理断开（与重查间隔独立计时）
+TASK_STREAM_KEEPALIVE_INTERVAL = 15.0
+SSE_KEEPALIVE = b": keepalive\n\n"
 
-def json_dumps_datetime(obj: Any) -> str:
-    """支持 datetime 的 JSON 序列化"""
-    return json.dumps(obj, default=serialize_datetime)
+
+async def _follow_task(task_id: int, max_duration: float):
+    """
+    跟踪任务进度并生成 SSE 事件
+
+    任务写入状态或事件时由 task_event_notifier 唤醒，只增量获取新事件；
+    没有通知时按指数退避兜底重查，任务状态未变化时不重复推送。
+    每次查询单独借用会话，等待期间不占用连接
+
+    Args:
+        task_id: 任务 ID
+        max_duration: 最长跟踪时间（秒）
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_duration
+    last_event_id = 0
+    last_status: bytes | None = None
+    interval = TASK_STREAM_MIN_INTERVAL
+    last_output = loop.time()
+
+    wakeup = task_event_notifier.subscribe(task_id)
+    try:
+        while True:
+            # 先清除标志再查询，查询期间到达的通知不会丢失
+            wakeup.clear()
+
+            async with get_async_session() as db:
+                repo = TaskRepository(db)
+                task_dict = await repo.get_by_id(task_id)
+                if task_dict is None:
+                    break
+                # 只获取新事件
+                events = await repo.get_events(task_id, limit=100, after_id=last_event_id)
+
+            changed = False
+            status_chunk = format_sse("status", task_dict)
+            if status_chunk != last_status:
+                last_status = status_chunk
+                changed = True
+                yield status_chunk
+
+            for event in events:
+                yield format_sse("event", event)
+                last_event_id = event["id"]
+                changed = True
+
+            # 检查任务是否完成
+            status = TaskStatus(task_dict["status"])
+            if status in TERMINAL_TASK_STATUSES:
+                yield format_sse("complete", task_dict)
+                break
+
+            now = loop.time()
+            remaining = deadline - now
+            if remaining <= 0:
+                break
+
+            if changed:
+                interval = TASK_STREAM_MIN_INTERVAL
+                last_output = now
+            else:
+                interval = min(interval * 2, TASK_STREAM_MAX_INTERVAL)
+                if now - last_output >= TASK_STREAM_KEEPALIVE_INTERVAL:
+                    yield SSE_KEEPALIVE
+                    last_output = now
+
+            # 等待新事件通知
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=min(remaining, interval))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        task_event_notifier.unsubscribe(task_id, wakeup)
 
 
 # ============================================================================
@@ -54,11 +127,15 @@ def json_dumps_datetime(obj: Any) -> str:
 
 async def get_db() -> AsyncSession:  # type: ignore
     """获取数据库会话"""
-    from src.core.database import get_async_session
     async with get_async_session() as session:
         yield session
 
 
+async def get_task_repo(db: AsyncSession = Depends(get_db)) -> TaskRepository:
+    """获取任务 Repository"""
+    return TaskRepository(db)
+
+
 # ============================================================================
 # 任务列表和统计（具体路由）
 # ============================================================================
@@ -68,7 +145,8 @@ async def list_tasks(
     pagination: PaginationParams = Depends(),
     status_filter: TaskStatus | None = Query(default=None, description="状态筛选"),
     task_type: str | None = Query(default=None, description="任务类型筛选"),
-    db: AsyncSession = Depends(get_db),
+    exact_count: bool = Query(default=False, description="返回精确总数"),
+    repo: TaskRepository = Depends(get_task_repo),
 ):
     """
     获取任务列表
@@ -77,11 +155,15 @@ async def list_tasks(
     - 分页
     - 按状态筛选
     - 按类型筛选
+
+    无筛选的首页使用估算总数，避免全表 COUNT；需要精确值时传 exact_count=true
     """
-    repo = TaskRepository(db)
 
     # 获取总数
-    total = await repo.count_by_status(status_filter) if status_filter else 0
+    if status_filter or task_type or exact_count or pagination.page > 1:
+        total = await repo.count_tasks(status=status_filter, task_type=task_type)
+    else:
+        total = await repo.estimate_count(repo.TABLE_NAME)
 
     # 获取分页数据
     tasks = await repo.list_tasks(
@@ -91,11 +173,9 @@ async def list_tasks(
         offset=pagination.offset,
     )
 
-    # 转换为字典
-    items = [dict(t) for t in tasks]
-
+    # Repository 已返回字典，无需再复制
     paginated = PaginatedResponse.create(
-        items=items,
+        items=tasks,
         total=total,
         page=pagination.page,
         page_size=pagination.page_size,
@@ -107,38 +187,33 @@ async def list_tasks(
 @router.get("/running", response_model=APIResponse[list[dict[str, Any]]])
 async def get_running_tasks(
     task_type: str | None = Query(default=None, description="任务类型筛选"),
-    db: AsyncSession = Depends(get_db),
+    repo: TaskRepository = Depends(get_task_repo),
 ):
     """
     获取正在运行的任务
 
     返回所有状态为 running 的任务
     """
-    repo = TaskRepository(db)
     tasks = await repo.get_running_tasks(task_type)
 
-    return APIResponse(success=True, data=[dict(t) for t in tasks])
+    return APIResponse(success=True, data=tasks)
 
 
 @router.get("/stats/summary", response_model=APIResponse[dict[str, Any]])
 async def get_task_stats(
-    db: AsyncSession = Depends(get_db),
+    repo: TaskRepository = Depends(get_task_repo),
 ):
     """
     获取任务统计信息
 
     返回各状态任务的数量
     """
-    repo = TaskRepository(db)
+    registered_types = TaskExecutorRegistry.get_registered_types()
 
     stats = {
-        "pending": await repo.count_by_status(TaskStatus.PENDING),
-        "running": await repo.count_by_status(TaskStatus.RUNNING),
-        "completed": await repo.count_by_status(TaskStatus.COMPLETED),
-        "failed": await repo.count_by_status(TaskStatus.FAILED),
-        "cancelled": await repo.count_by_status(TaskStatus.CANCELLED),
-        "total_types": len(TaskExecutorRegistry.get_registered_types()),
-        "registered_types": TaskExecutorRegistry.get_registered_types(),
+        **await repo.count_all_statuses(),
+        "total_types": len(registered_types),
+        "registered_types": registered_types,
     }
 
     return APIResponse(success=True, data=stats)
@@ -151,147 +226,71 @@ async def get_task_stats(
 @router.get("/crawl-pending/stream")
 async def stream_crawl_pending(
     limit_per_source: int = Query(default=10, ge=1, le=100, description="每个源爬取数量"),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     流式执行批量爬取待爬文章 (SSE)
 
     创建任务并流式返回进度
     """
-    # 先用外层 session 创建任务
-    manager = TaskManager(db)
-    task = await manager.create_task(
-        task_type=TaskType.CRAWL_PENDING,
-        title=f"批量爬取待爬文章 (每源 {limit_per_source} 条)",
-        params={"limit_per_source": limit_per_source},
-        auto_start=False,
-    )
+    # 用短会话创建任务，流式响应期间不占用数据库连接
+    async with get_async_session() as db:
+        task = await TaskManager(db).create_task(
+            task_type=TaskType.CRAWL_PENDING,
+            title=f"批量爬取待爬文章 (每源 {limit_per_source} 条)",
+            params={"limit_per_source": limit_per_source},
+            auto_start=False,
+        )
     task_id = task.id
     print(f"[TASK API] 创建了任务 {task_id}")
 
     async def event_stream():
         """生成 SSE 事件流"""
-        # 创建新的 session 避免并发冲突
-        from src.core.database import get_async_session
-
-        async with get_async_session() as stream_db:
-            repo = TaskRepository(stream_db)
-
-            # 发送任务创建事件
-            yield f"event: created\ndata: {json_dumps_datetime({'task_id': task_id, 'task': dict(task)})}\n\n"
+        # 发送任务创建事件
+        yield format_sse("created", {'task_id': task_id, 'task': task.model_dump()})
 
-            # 在后台执行任务 - 用新的 session 创建新的 manager
-            print(f"[TASK API] 准备启动任务 {task_id}")
-            stream_manager = TaskManager(stream_db)
-            task_coroutine = stream_manager.execute_task(task_id)
-            background_task = asyncio.create_task(task_coroutine)
-            print(f"[TASK API] 任务 {task_id} 已提交到后台: {background_task}")
+        # 交给任务队列在后台执行
+        await task_queue.enqueue(task_id)
+        print(f"[TASK API] 任务 {task_id} 已提交到任务队列")
 
-            # 流式返回进度
-            check_count = 0
-            max_checks = 3600  # 最多检查 1 小时
-
-            while check_count < max_checks:
-                # 检查任务状态
-                task_dict = await repo.get_by_id(task_id)
-                if task_dict is None:
-                    break
+        # 流式返回进度（最多跟踪 1 小时）
+        async for chunk in _follow_task(task_id, max_duration=3600):
+            yield chunk
 
-                yield f"event: status\ndata: {json_dumps_datetime(task_dict)}\n\n"
-
-                # 获取新事件
-                events = await repo.get_events(task_id, limit=100)
-
-                for event in events:
-                    yield f"event: event\ndata: {json_dumps_datetime(event)}\n\n"
-
-                # 检查任务是否完成
-                status = TaskStatus(task_dict["status"])
-                if status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-                    yield f"event: complete\ndata: {json_dumps_datetime(task_dict)}\n\n"
-                    break
-
-                check_count += 1
-                await asyncio.sleep(1)
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(event_stream())
 
 
 @router.get("/retry-failed/stream")
 async def stream_retry_failed(
     limit: int = Query(default=50, ge=1, le=500, description="重试数量"),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     流式执行批量重试失败文章 (SSE)
 
     创建任务并流式返回进度
     """
-    # 先用外层 session 创建任务
-    manager = TaskManager(db)
-    task = await manager.create_task(
-        task_type=TaskType.RETRY_FAILED,
-        title=f"批量重试失败文章 (前 {limit} 条)",
-        params={"limit": limit},
-        auto_start=False,
-    )
+    # 用短会话创建任务，流式响应期间不占用数据库连接
+    async with get_async_session() as db:
+        task = await TaskManager(db).create_task(
+            task_type=TaskType.RETRY_FAILED,
+            title=f"批量重试失败文章 (前 {limit} 条)",
+            params={"limit": limit},
+            auto_start=False,
+        )
     task_id = task.id
 
     async def event_stream():
         """生成 SSE 事件流"""
-        # 创建新的 session 避免并发冲突
-        from src.core.database import get_async_session
-
-        async with get_async_session() as stream_db:
-            repo = TaskRepository(stream_db)
-
-            # 发送任务创建事件
-            yield f"event: created\ndata: {json_dumps_datetime({'task_id': task_id, 'task': dict(task)})}\n\n"
+        # 发送任务创建事件
+        yield format_sse("created", {'task_id': task_id, 'task': task.model_dump()})
 
-            # 在后台执行任务 - 用新的 session 创建新的 manager
-            stream_manager = TaskManager(stream_db)
-            asyncio.create_task(stream_manager.execute_task(task_id))
+        # 交给任务队列在后台执行
+        await task_queue.enqueue(task_id)
 
-            # 流式返回进度
-            check_count = 0
-            max_checks = 3600
-
-            while check_count < max_checks:
-                task_dict = await repo.get_by_id(task_id)
-                if task_dict is None:
-                    break
+        # 流式返回进度（最多跟踪 1 小时）
+        async for chunk in _follow_task(task_id, max_duration=3600):
+            yield chunk
 
-                yield f"event: status\ndata: {json_dumps_datetime(task_dict)}\n\n"
-
-                events = await repo.get_events(task_id, limit=100)
-                for event in events:
-                    yield f"event: event\ndata: {json_dumps_datetime(event)}\n\n"
-
-                status = TaskStatus(task_dict["status"])
-                if status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-                    yield f"event: complete\ndata: {json_dumps_datetime(task_dict)}\n\n"
-                    break
-
-                check_count += 1
-                await asyncio.sleep(1)
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(event_stream())
 
 
 # ============================================================================
@@ -310,7 +309,7 @@ async def get_task(
     if task is None:
         raise NotFoundException(f"Task {task_id} not found")
 
-    return APIResponse(success=True, data=dict(task))
+    return APIResponse(success=True, data=task.model_dump())
 
 
 @router.post("", response_model=APIResponse[dict[str, Any]], status_code=status.HTTP_201_CREATED)
@@ -329,8 +328,7 @@ async def create_task(
     manager = TaskManager(db)
 
     # 检查是否有对应的执行器
-    executor = TaskExecutorRegistry.create(data.task_type.value)
-    if executor is None:
+    if not TaskExecutorRegistry.is_registered(data.task_type.value):
         raise BadRequestException(
             message=f"No executor registered for task type: {data.task_type.value}",
             details={"task_type": data.task_type.value},
@@ -347,7 +345,7 @@ async def create_task(
 
     return APIResponse(
         success=True,
-        data=dict(task),
+        data=task.model_dump(),
     )
 
 
@@ -373,8 +371,8 @@ async def start_task(
             details={"task_id": task_id, "current_status": task.status.value},
         )
 
-    # 在后台执行任务
-    asyncio.create_task(manager.execute_task(task_id))
+    # 交给任务队列在后台执行
+    await task_queue.enqueue(task_id)
 
     return APIResponse(
         success=True,
@@ -416,30 +414,24 @@ async def cancel_task(
 async def get_task_events(
     task_id: int,
     limit: int = Query(default=100, ge=1, le=1000, description="返回数量限制"),
-    db: AsyncSession = Depends(get_db),
+    repo: TaskRepository = Depends(get_task_repo),
 ):
     """
     获取任务事件列表
 
     返回任务的执行日志和进度事件
     """
-    repo = TaskRepository(db)
-
-    # 检查任务是否存在
-    task = await repo.get_by_id(task_id)
-    if task is None:
-        raise NotFoundException(f"Task {task_id} not found")
 
+    # 没有事件时才检查任务是否存在
     events = await repo.get_events(task_id, limit)
+    if not events and not await repo.exists(repo.TABLE_NAME, "id = :id", {"id": task_id}):
+        raise NotFoundException(f"Task {task_id} not found")
 
     return APIResponse(success=True, data=events)
 
 
 @router.get("/{task_id}/stream")
-async def stream_task_progress(
-    task_id: int,
-    db: AsyncSession = Depends(get_db),
-):
+async def stream_task_progress(task_id: int):
     """
     流式获取任务进度 (SSE)
 
@@ -451,60 +443,15 @@ async def stream_task_progress(
     - complete: 任务完成
     - error: 任务错误
     """
-
     async def event_stream():
         """生成 SSE 事件流"""
-        # 创建新的 session 避免并发冲突
-        from src.core.database import get_async_session
-
-        async with get_async_session() as stream_db:
-            repo = TaskRepository(stream_db)
-
-            # 检查任务是否存在
-            task = await repo.get_by_id(task_id)
-            if task is None:
-                yield f"event: error\ndata: {json_dumps_datetime({'error': 'Task not found'})}\n\n"
-                return
-
-            # 发送初始状态
-            yield f"event: status\ndata: {json_dumps_datetime(dict(task))}\n\n"
+        # 流式返回进度（最多跟踪 5 分钟），首次查询即发送当前状态
+        found = False
+        async for chunk in _follow_task(task_id, max_duration=300):
+            found = True
+            yield chunk
 
-            last_event_id = 0
-            check_count = 0
-            max_checks = 300  # 最多检查 5 分钟 (300 * 1秒)
+        if not found:
+            yield format_sse("error", {'error': 'Task not found'})
 
-            while check_count < max_checks:
-                # 检查任务状态
-                task = await repo.get_by_id(task_id)
-                if task is None:
-                    break
-
-                # 发送状态更新
-                yield f"event: status\ndata: {json_dumps_datetime(dict(task))}\n\n"
-
-                # 获取新事件
-                events = await repo.get_events(task_id, limit=100)
-                new_events = [e for e in events if e["id"] > last_event_id]
-
-                for event in new_events:
-                    yield f"event: event\ndata: {json_dumps_datetime(event)}\n\n"
-                    last_event_id = event["id"]
-
-                # 检查任务是否完成
-                status = TaskStatus(task["status"])
-                if status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-                    yield f"event: complete\ndata: {json_dumps_datetime(dict(task))}\n\n"
-                    break
-
-                check_count += 1
-                await asyncio.sleep(1)
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # 禁用 Nginx 缓冲
-        },
-    )
+    return sse_response(event_stream())
@@ -4,15 +4,23 @@
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 
 from src.api.schemas import APIResponse
-from src.core.auth import get_admin_user
-from src.core.database import get_async_session_generator
+from src.core.auth import get_admin_user, get_user_repo, invalidate_user
 from src.core.models import UserCreate, UserResponse, UserUpdate
 from src.repository.user_repository import UserRepository
 
-router = APIRouter(prefix="/users", tags=["users"])
+# 所有端点都要求管理员权限，在路由级统一声明
+router = APIRouter(
+    prefix="/users",
+    tags=["users"],
+    dependencies=[Depends(get_admin_user)],
+)
+
+# data 为 dict 的接口需先按 UserResponse 校验（剔除密码哈希等字段）
+_USER_ADAPTER = TypeAdapter(UserResponse)
 
 
 @router.get("", response_model=APIResponse[list[UserResponse]])
@@ -21,28 +29,25 @@ async def list_users(
     is_active: bool | None = None,
     limit: int = 100,
     offset: int = 0,
-    current_admin: UserResponse = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_async_session_generator),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """获取用户列表（管理员）"""
-    user_repo = UserRepository(db)
     users = await user_repo.list(
         role=role,
         is_active=is_active,
         limit=limit,
         offset=offset,
     )
-    return APIResponse(success=True, data=[UserResponse(**u) for u in users])
+    # 直接返回行数据，由 response_model 一次性校验并序列化
+    return {"success": True, "data": users}
 
 
 @router.get("/{user_id}", response_model=APIResponse[UserResponse])
 async def get_user(
     user_id: int,
-    current_admin: UserResponse = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_async_session_generator),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """获取用户详情（管理员）"""
-    user_repo = UserRepository(db)
     user = await user_repo.get_by_id(user_id)
 
     if not user:
@@ -51,32 +56,28 @@ async def get_user(
             detail="用户不存在",
         )
 
-    return APIResponse(success=True, data=UserResponse(**user))
+    return {"success": True, "data": user}
 
 
 @router.post("", response_model=APIResponse[dict])
 async def create_user(
     user_data: UserCreate,
-    current_admin: UserResponse = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_async_session_generator),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """创建用户（管理员）"""
-    user_repo = UserRepository(db)
-
-    # 检查用户名是否已存在
-    existing = await user_repo.get_by_username(user_data.username)
-    if existing:
+    # 用户名唯一约束冲突即视为已存在，不再预先查询
+    try:
+        user = await user_repo.create_returning(user_data.model_dump())
+    except IntegrityError:
+        await user_repo.session.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="用户名已存在",
-        )
-
-    user_id = await user_repo.create(user_data.model_dump())
-    user = await user_repo.get_by_id(user_id)
+        ) from None
 
     return APIResponse(
         success=True,
-        data={"message": "用户创建成功", "user": UserResponse(**user)},
+        data={"message": "用户创建成功", "user": _USER_ADAPTER.validate_python(user)},
     )
 
 
@@ -84,27 +85,24 @@ async def create_user(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    current_admin: UserResponse = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_async_session_generator),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """更新用户（管理员）"""
-    user_repo = UserRepository(db)
-
-    # 检查用户是否存在
-    existing = await user_repo.get_by_id(user_id)
-    if not existing:
+    # 更新并直接返回更新后的行，行不存在即用户不存在
+    updated_user = await user_repo.update_returning(
+        user_id, user_data.model_dump(exclude_unset=True)
+    )
+    if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在",
         )
 
-    # 更新用户
-    await user_repo.update(user_id, user_data.model_dump(exclude_unset=True))
-    updated_user = await user_repo.get_by_id(user_id)
+    invalidate_user(updated_user["username"])
 
     return APIResponse(
         success=True,
-        data={"message": "用户更新成功", "user": UserResponse(**updated_user)},
+        data={"message": "用户更新成功", "user": _USER_ADAPTER.validate_python(updated_user)},
     )
 
 
@@ -112,7 +110,7 @@ async def update_user(
 async def delete_user(
     user_id: int,
     current_admin: UserResponse = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_async_session_generator),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """删除用户（管理员）"""
     if user_id == current_admin.id:
@@ -121,17 +119,15 @@ async def delete_user(
             detail="不能删除自己",
         )
 
-    user_repo = UserRepository(db)
-
-    # 检查用户是否存在
-    existing = await user_repo.get_by_id(user_id)
-    if not existing:
+    # 删除并返回用户名，未删除任何行即用户不存在
+    username = await user_repo.delete_returning(user_id)
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在",
         )
 
-    await user_repo.delete(user_id)
+    invalidate_user(username)
 
     return APIResponse(
         success=True,
@@ -3,54 +3,146 @@
 处理用户登录和 JWT token 验证
 """
 
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Optional
+
 import jwt
-from datetime import datetime, timedelta
-from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import get_settings
 from src.core.database import get_async_session_generator
 from src.core.models import UserResponse
 from src.repository.user_repository import UserRepository
 
 # JWT 配置
-SECRET_KEY = "newssys-secret-key-2024"  # 生产环境应该从环境变量读取
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 天
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# 模块级预构建的编解码器与参数，避免每次调用重复构造算法列表
+_jwt = jwt.PyJWT()
+_ALGORITHMS = [ALGORITHM]
+
+
+@lru_cache(maxsize=1)
+def _secret() -> bytes:
+    """
+    JWT 签名密钥（首次使用时读取并缓存编码结果）
+
+    先调用 get_settings() 确保 .env 已加载，否则导入顺序不同时会静默使用默认密钥；
+    生产环境务必通过 JWT_SECRET_KEY 环境变量设置
+    """
+    get_settings()
+    return os.getenv("JWT_SECRET_KEY", "newssys-secret-key-2024").encode()
 
 security = HTTPBearer()
 
 
+class _TTLCache:
+    """
+    带过期时间的 LRU 缓存（单进程内存缓存，仅在事件循环线程中使用）
+
+    超过容量时淘汰最久未使用的条目；每个条目可以单独指定过期时刻
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """获取未过期的条目，不存在或已过期时返回 None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, expires_at: float | None = None) -> None:
+        """写入条目，过期时刻取 expires_at 与默认 TTL 中较早者"""
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        self._data[key] = (deadline, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        """移除条目"""
+        self._data.pop(key, None)
+
+    def pop_matching(self, predicate: Callable[[Any], bool]) -> None:
+        """移除值满足条件的所有条目（遍历全部条目，仅用于低频的失效操作）"""
+        for key in [k for k, (_, value) in self._data.items() if predicate(value)]:
+            del self._data[key]
+
+
+# 认证结果缓存 {sha256(token): UserResponse}：命中时跳过 token 解码、用户查询和模型构造，
+# 条目最多保留 30 秒且不晚于 token 的 exp。
+# 缓存只在当前进程内：用户管理接口调用 invalidate_user 只清除处理该请求的进程的条目，
+# 多 worker 部署时其他 worker 上的角色 / 启用状态变更最多延迟 30 秒生效
+_auth_cache = _TTLCache(maxsize=10000, ttl=30)
+
+
+def _token_key(token: str) -> str:
+    """token 的缓存键"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def invalidate_user(username: str) -> None:
+    """使当前进程缓存的该用户认证结果失效（更新或删除用户后调用）"""
+    _auth_cache.pop_matching(lambda user: user.username == username)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建 JWT token"""
-    to_encode = data.copy()
+    # exp 直接使用整数时间戳（PyJWT 支持），无需构造 datetime
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS
+    # 一次构造待编码的字典，不修改调用方传入的 data
+    return _jwt.encode({**data, "exp": expire}, _secret(), algorithm=ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict:
     """解码 JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = _jwt.decode(token, _secret(), algorithms=_ALGORITHMS)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token 已过期",
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="无效的 Token",
         )
 
+    return payload
+
+
+async def get_user_repo(
+    db: AsyncSession = Depends(get_async_session_generator),
+) -> UserRepository:
+    """获取用户 Repository（依赖注入，与同一请求的会话共享）"""
+    return UserRepository(db)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -58,6 +150,11 @@ async def get_current_user(
 ) -> UserResponse:
     """获取当前登录用户"""
     token = credentials.credentials
+    auth_key = _token_key(token)
+    user = _auth_cache.get(auth_key)
+    if user is not None:
+        return user
+
     payload = decode_access_token(token)
 
     username: str = payload.get("sub")
@@ -68,21 +165,22 @@ async def get_current_user(
         )
 
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_username(username)
-
-    if user is None:
+    row = await user_repo.get_by_username(username)
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户不存在",
         )
+    user = UserResponse(**row)
 
-    if not user.get("is_active"):
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户已被禁用",
         )
 
-    return UserResponse(**user)
+    _auth_cache.set(auth_key, user, expires_at=payload.get("exp"))
+    return user
 
 
 async def get_admin_user(
@@ -4,22 +4,32 @@ Newssys 2.0 配置管理
 """
 
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
+import orjson
 from dotenv import load_dotenv
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# 加载 .env 文件
 ENV_FILE = Path(__file__).parent.parent.parent / ".env"
-if ENV_FILE.exists():
-    load_dotenv(ENV_FILE)
-    logger = logging.getLogger(__name__)
-    logger.info(f"Loaded .env from: {ENV_FILE}")
-else:
-    logger = logging.getLogger(__name__)
-    logger.warning(f".env file not found at: {ENV_FILE}")
+
+logger = logging.getLogger(__name__)
+
+
+def _load_env_file() -> None:
+    """
+    加载 .env 文件到环境变量（只填充尚未设置的变量）
+
+    这是唯一一次读取 .env：各配置类不再单独指定 env_file，
+    统一从环境变量读取各自前缀的值
+    """
+    if ENV_FILE.exists():
+        load_dotenv(ENV_FILE)
+        logger.info(f"Loaded .env from: {ENV_FILE}")
+    else:
+        logger.warning(f".env file not found at: {ENV_FILE}")
 
 
 class DatabaseSettings(BaseSettings):
@@ -27,8 +37,6 @@ class DatabaseSettings(BaseSettings):
 
     model_config = SettingsConfigDict(
         env_prefix="DATABASE_",
-        env_file=".env",
-        env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
     )
@@ -45,8 +53,23 @@ class DatabaseSettings(BaseSettings):
 
     # 通用配置
     name: str = "newssys"  # MySQL: 数据库名, SQLite: 文件名
-    pool_size: int = 10
+    # 连接池按进程计算：单个 worker 进程内的并发请求 + 后台任务 + SSE 轮询都从这里取连接，
+    # pool_size + max_overflow 应覆盖单进程的并发峰值，否则请求会在 pool_timeout 内排队
+    pool_size: int = 20
     max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 3600
+    # 取连接前是否先 SELECT 1 探活（每次取连接多一次往返）；pool_recycle 小于
+    # MySQL wait_timeout 时默认关闭，只在中间有会掐断空闲连接的代理 / 网络时开启
+    pool_pre_ping: bool = False
+    # 启动时预先建立的连接数（仅 MySQL），0 表示不预热
+    pool_warm_size: int = 10
+    # SQLAlchemy 编译缓存大小 / SQLite 连接级预编译语句缓存大小
+    query_cache_size: int = 1000
+    statement_cache_size: int = 256
+    # 同时持有数据库会话的爬取请求上限，需小于 pool_size + max_overflow，
+    # 超出的爬取请求在获取会话前等待，而不是在连接池里超时
+    crawl_concurrency: int = 25
 
     @property
     def url(self) -> str:
@@ -57,7 +80,7 @@ class DatabaseSettings(BaseSettings):
             return f"sqlite+aiosqlite:///{db_path}"
         else:
             # MySQL 使用网络连接
-            return f"mysql+aiomysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}?charset={self.charset}"
+            return f"mysql+asyncmy://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}?charset={self.charset}"
 
 
 class AISettings(BaseSettings):
@@ -65,8 +88,6 @@ class AISettings(BaseSettings):
 
     model_config = SettingsConfigDict(
         env_prefix="AI_",
-        env_file=".env",
-        env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
     )
@@ -87,6 +108,7 @@ class CrawlerSettings(BaseSettings):
     user_agent: str = "Newssys Intelligence Bot/2.0"
     respect_robots: bool = True
     default_delay: float = 1.0
+    task_workers: int = 4  # 后台任务队列 worker 数量
 
     class Config:
         env_prefix = "CRAWLER_"
@@ -144,8 +166,6 @@ class Settings(BaseSettings):
     """全局配置"""
 
     model_config = SettingsConfigDict(
-        env_file=str(Path(__file__).parent.parent.parent / ".env"),
-        env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
     )
@@ -170,26 +190,53 @@ class Settings(BaseSettings):
     def parse_cors_origins(cls, v):
         if isinstance(v, str):
             # 尝试解析 JSON 格式
-            import json
             try:
-                return json.loads(v)
-            except json.JSONDecodeError:
+                return orjson.loads(v)
+            except orjson.JSONDecodeError:
                 # 简单的逗号分隔
                 return [origin.strip() for origin in v.split(",")]
         return v
 
 
-# 全局配置实例
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取配置单例
+
+    首次调用时加载 .env 并解析配置，之后直接返回缓存实例；
+    测试中可调用 get_settings.cache_clear() 重新加载
+    """
+    _load_env_file()
+    return Settings()
+
+
+def __getattr__(name: str) -> Settings:
+    """
+    兼容旧代码的 settings 全局实例（新代码请使用 get_settings()）
 
+    模块级 __getattr__ 让 settings 在首次访问时才构造，导入本模块不会解析 .env
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def init_logging():
-    """初始化日志系统"""
+
+def init_logging() -> "logging.handlers.QueueListener":
+    """
+    初始化日志系统
+
+    根日志记录器只挂一个 QueueHandler，控制台和文件输出由后台
+    QueueListener 线程完成，记录日志不会阻塞事件循环
+
+    Returns:
+        已启动的 QueueListener（退出时调用 stop() 刷新剩余日志）
+    """
     import logging.handlers
     import os
+    import queue
     import warnings
 
-    log_settings = settings.log
+    log_settings = get_settings().log
 
     # 创建日志目录
     log_dir = os.path.dirname(log_settings.file_path)
@@ -210,10 +257,12 @@ def init_logging():
     # 格式化器
     formatter = logging.Formatter(log_settings.format)
 
+    handlers: list[logging.Handler] = []
+
     # 控制台处理器
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # 文件处理器（按天轮转）
     if log_settings.file_path:
@@ -226,10 +275,20 @@ def init_logging():
         )
         file_handler.setFormatter(formatter)
         file_handler.suffix = "%Y-%m-%d"
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # 队列处理器：调用方只负责入队，实际输出在监听线程中完成
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
 
     logger.info(f"Logging initialized: {log_settings.level}")
+    return listener
 
 
 # 导出配置
-__all__ = ["settings", "init_logging"]
+__all__ = ["get_settings", "init_logging"]
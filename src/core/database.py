@@ -1,19 +1,33 @@
 """
 数据库连接管理
 使用 SQLAlchemy 2.0 (Async)
-支持 SQLite (开发) 和 MySQL/aiomysql (生产)
+支持 SQLite (开发) 和 MySQL/asyncmy (生产)
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-
-from src.core.config import settings
+from typing import Any
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.config import get_settings
 from src.core.orm_models import Base
 
 logger = logging.getLogger(__name__)
 
+def _json_serializer(value: Any) -> str:
+    """JSON 列序列化（orjson，UTF-8 原样保存非 ASCII 字符）"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # 全局引擎和会话工厂
 _engine = None
 _async_session_factory = None
@@ -26,22 +40,42 @@ def init_engine():
     if _engine is not None:
         return _engine
 
+    settings = get_settings()
+
     # 根据数据库类型构建引擎参数
     if settings.database.type == "sqlite":
         logger.info(f"Connecting to SQLite: {settings.database.name}")
         engine_kwargs = {
             "echo": settings.debug,
+            "query_cache_size": settings.database.query_cache_size,
+            # 保留连接池（而不是 NullPool），连接上的预编译语句缓存才能复用；
+            # 池大小与 MySQL 一致，突发请求不会卡在默认的 5 + 10 个连接上
+            "pool_size": settings.database.pool_size,
+            "max_overflow": settings.database.max_overflow,
+            "pool_timeout": settings.database.pool_timeout,
+            "connect_args": {
+                # sqlite3 在每个连接上缓存预编译语句，热点查询不再重复解析
+                "cached_statements": settings.database.statement_cache_size,
+                # aiosqlite 在自己的线程中使用连接，连接归还后可能由其它线程取出
+                "check_same_thread": False,
+            },
         }
     else:
         logger.info(f"Connecting to MySQL: {settings.database.name} @ {settings.database.host}")
         engine_kwargs = {
             "echo": settings.debug,
+            "query_cache_size": settings.database.query_cache_size,
             "pool_size": settings.database.pool_size,
             "max_overflow": settings.database.max_overflow,
-            "pool_pre_ping": True,
-            "pool_recycle": 3600,
+            "pool_timeout": settings.database.pool_timeout,
+            "pool_pre_ping": settings.database.pool_pre_ping,
+            "pool_recycle": settings.database.pool_recycle,
         }
 
+    # JSON 列统一由 orjson 编解码
+    engine_kwargs["json_serializer"] = _json_serializer
+    engine_kwargs["json_deserializer"] = orjson.loads
+
     _engine = create_async_engine(settings.database.url, **engine_kwargs)
 
     _async_session_factory = async_sessionmaker(
@@ -69,6 +103,40 @@ async def close_engine():
     _async_session_factory = None
 
 
+async def warm_pool(size: int | None = None) -> int:
+    """
+    预热连接池
+
+    并发建立若干连接并执行 SELECT 1，连接归还后留在池中，
+    避免启动后的首批请求承担建连开销。SQLite 无连接池，直接跳过
+
+    Args:
+        size: 预热连接数，默认取配置 pool_warm_size（不超过 pool_size）
+
+    Returns:
+        实际预热的连接数
+    """
+    engine = init_engine()
+    settings = get_settings()
+
+    if settings.database.type == "sqlite":
+        return 0
+
+    if size is None:
+        size = min(settings.database.pool_warm_size, settings.database.pool_size)
+    if size <= 0:
+        return 0
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(size)))
+
+    logger.info(f"Database pool warmed with {size} connections")
+    return size
+
+
 @asynccontextmanager
 async def get_async_session():
     """获取异步数据库会话（上下文管理器）"""
@@ -85,14 +153,51 @@ async def get_async_session():
             await session.close()
 
 
-def get_async_session_generator():
-    """获取异步数据库会话（生成器，用于依赖注入）"""
+@asynccontextmanager
+async def get_async_connection():
+    """
+    获取异步数据库连接（上下文管理器）
+
+    只执行原始 SQL 的仓储可以直接使用连接，省去 ORM 会话的状态管理与事件分发；
+    用到 ORM 模型（add / refresh）的代码仍应使用 get_async_session
+    """
+    engine = init_engine()
+
+    conn: AsyncConnection
+    async with engine.connect() as conn:
+        try:
+            yield conn
+        except Exception:
+            await conn.rollback()
+            raise
+
+
+def create_session() -> AsyncSession:
+    """创建独立的数据库会话（调用方负责 rollback / close，用于需要自行管理生命周期的后台任务）"""
     if _async_session_factory is None:
         init_engine()
 
     return _async_session_factory()
 
 
+async def get_async_session_generator():
+    """
+    获取异步数据库会话（生成器，用于依赖注入，请求结束时关闭会话归还连接）
+
+    FastAPI 在同一请求内缓存依赖结果，get_current_user、get_user_repo 与端点
+    声明的本依赖共享同一个会话；会话在首次执行 SQL 时才从连接池取连接
+    """
+    if _async_session_factory is None:
+        init_engine()
+
+    async with _async_session_factory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
 async def init_database():
     """初始化数据库（创建表）"""
     from src.core.orm_models import (
@@ -118,7 +223,10 @@ __all__ = [
     "Base",
     "init_engine",
     "close_engine",
+    "create_session",
+    "get_async_connection",
     "get_async_session",
     "get_async_session_generator",
     "init_database",
+    "warm_pool",
 ]
@@ -5,6 +5,7 @@
 
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
@@ -46,6 +47,28 @@ class ParserConfig(BaseModel):
 
     model_config = {"extra": "allow"}
 
+    @classmethod
+    def from_json(cls, config_str: str) -> "ParserConfig":
+        """
+        从 JSON 字符串解析配置
+
+        同一个源的配置字符串会被反复读取，解析结果按字符串缓存，
+        返回浅拷贝以免调用方修改影响缓存
+
+        Args:
+            config_str: JSON 字符串
+
+        Returns:
+            ParserConfig 对象
+        """
+        return _parse_parser_config(config_str).model_copy()
+
+
+@lru_cache(maxsize=2048)
+def _parse_parser_config(config_str: str) -> ParserConfig:
+    """解析并缓存 ParserConfig（供 ParserConfig.from_json 使用）"""
+    return ParserConfig.model_validate_json(config_str)
+
 
 class RobotsStatus(str, Enum):
     """Robots.txt 状态枚举"""
@@ -162,8 +185,7 @@ class Article(BaseModel):
     status: ArticleStatus = Field(default=ArticleStatus.RAW, description="文章语义状态")
     fetch_status: FetchStatus = Field(default=FetchStatus.PENDING, description="抓取任务状态")
 
-    error_message: str | None = Field(default=None, description="错误信息（兼容旧字段）")
-    error_msg: str | None = Field(default=None, description="错误信息（新字段，优先使用）")
+    error_message: str | None = Field(default=None, description="错误信息")
 
     crawled_at: datetime | None = Field(default=None, description="爬取时间")
     processed_at: datetime | None = Field(default=None, description="处理时间")
@@ -351,49 +373,40 @@ class ReportMetadata(BaseModel):
 # 这些定义用于 Repository 层构建 SQL 查询
 
 
-class TableDefinition:
-    """表定义辅助类"""
-
-    @staticmethod
-    def get_crawl_sources_table() -> dict[str, Any]:
-        """获取 crawl_sources 表定义"""
-        return {
-            "name": "crawl_sources",
-            "columns": [
-                "id",
-                "site_name",
-                "base_url",
-                "parser_config",
-                "enabled",
-                "crawl_interval",
-                "created_at",
-                "updated_at",
-            ],
-        }
-
-    @staticmethod
-    def get_articles_table() -> dict[str, Any]:
-        """获取 articles 表定义"""
-        return {
-            "name": "articles",
-            "columns": [
-                "id",
-                "url_hash",
-                "url",
-                "title",
-                "content",
-                "publish_time",
-                "author",
-                "source_id",
-                "status",
-                "error_message",
-                "crawled_at",
-                "processed_at",
-                "synced_at",
-                "created_at",
-                "updated_at",
-            ],
-        }
+CRAWL_SOURCES_TABLE: dict[str, Any] = {
+    "name": "crawl_sources",
+    "columns": (
+        "id",
+        "site_name",
+        "base_url",
+        "parser_config",
+        "enabled",
+        "crawl_interval",
+        "created_at",
+        "updated_at",
+    ),
+}
+
+ARTICLES_TABLE: dict[str, Any] = {
+    "name": "articles",
+    "columns": (
+        "id",
+        "url_hash",
+        "url",
+        "title",
+        "content",
+        "publish_time",
+        "author",
+        "source_id",
+        "status",
+        "error_message",
+        "crawled_at",
+        "processed_at",
+        "synced_at",
+        "created_at",
+        "updated_at",
+    ),
+}
 
 
 # ============================================================================
@@ -409,6 +422,12 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# 终态：进入后不再发生状态变化（pending / running 之外的状态）
+TERMINAL_TASK_STATUSES = frozenset(
+    {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+)
+
+
 class TaskType(str, Enum):
     """任务类型枚举"""
     CRAWL_PENDING = "crawl_pending"  # 批量爬取待爬文章
@@ -447,7 +466,13 @@ class TaskUpdate(BaseModel):
 
 
 class Task(BaseModel):
-    """任务模型"""
+    """
+    任务模型
+
+    数据库行不能用 model_construct 跳过校验：SQLite 的原始查询把时间列返回为字符串，
+    task_type / status 也是普通字符串，需要校验转换为 datetime 和枚举
+    （TaskManager 通过预构建的 TypeAdapter 批量校验）
+    """
     id: int | None = None
     task_type: TaskType
     status: TaskStatus
@@ -7,7 +7,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, Text, JSON, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -16,6 +16,17 @@ class Base(DeclarativeBase):
     pass
 
 
+class TimestampMixin:
+    """创建 / 更新时间列（各表共用的声明，列排在表自身字段之后）"""
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
+    )
+
+
 class ArticleStatus(str, Enum):
     """文章状态枚举"""
     RAW = "raw"
@@ -41,7 +52,7 @@ class RobotsStatus(str, Enum):
     ERROR = "error"
 
 
-class CrawlSourceOrm(Base):
+class CrawlSourceOrm(TimestampMixin, Base):
     """爬虫源 ORM 模型"""
     __tablename__ = "crawl_sources"
 
@@ -78,20 +89,19 @@ class CrawlSourceOrm(Base):
     # 灵活元数据
     extra_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
-
 
-class ArticleOrm(Base):
+class ArticleOrm(TimestampMixin, Base):
     """文章 ORM 模型"""
     __tablename__ = "articles"
+    __table_args__ = (
+        # 按源列出文章：source_id (+ status) 定位后按创建时间倒序读取（同时覆盖单独按 source_id 的查询）
+        Index("idx_articles_source_status_created", "source_id", "status", "created_at"),
+        # 按状态列出文章：status 定位后按创建时间倒序读取
+        Index("idx_articles_status_created", "status", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    url_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
+    url_hash: Mapped[str] = mapped_column(String(32), nullable=False, unique=True, index=True)  # URL 的 MD5 十六进制摘要
     url: Mapped[str] = mapped_column(String(1024), nullable=False)
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -101,7 +111,7 @@ class ArticleOrm(Base):
 
     publish_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     author: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    source_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    source_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
     # 双重状态
     status: Mapped[ArticleStatus] = mapped_column(
@@ -112,7 +122,6 @@ class ArticleOrm(Base):
     )
 
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
-    error_msg: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     crawled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     processed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -125,15 +134,8 @@ class ArticleOrm(Base):
     # 灵活元数据
     extra_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
-
 
-class ReportMetadataOrm(Base):
+class ReportMetadataOrm(TimestampMixin, Base):
     """报告元数据 ORM 模型"""
     __tablename__ = "report_metadata"
 
@@ -151,13 +153,6 @@ class ReportMetadataOrm(Base):
 
     extra_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
-
 
 class ReportReferenceOrm(Base):
     """报告引用 ORM 模型"""
@@ -207,7 +202,7 @@ class PendingArticleStatus(str, Enum):
     LOW_QUALITY = "low_quality"  # 低质量（标记为低质量，不再爬取）
 
 
-class SitemapOrm(Base):
+class SitemapOrm(TimestampMixin, Base):
     """Sitemap ORM 模型"""
     __tablename__ = "sitemaps"
 
@@ -220,17 +215,27 @@ class SitemapOrm(Base):
     )
     article_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
 
-
-class PendingArticleOrm(Base):
+class PendingArticleOrm(TimestampMixin, Base):
     """待爬文章 ORM 模型"""
     __tablename__ = "pending_articles"
+    __table_args__ = (
+        # 待爬列表：按发布时间倒序取前 N 条（SQLite 为部分索引，跳过低质量文章）
+        Index(
+            "idx_pending_articles_publish_id",
+            "publish_time",
+            "id",
+            sqlite_where=text("status != 'low_quality'"),
+        ),
+        # 按源爬取 / 重试：source_id + status 定位后按发布时间顺序读取
+        Index(
+            "idx_pending_articles_source_status_publish",
+            "source_id",
+            "status",
+            "publish_time",
+            sqlite_where=text("status IN ('pending', 'failed')"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     source_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
@@ -243,13 +248,6 @@ class PendingArticleOrm(Base):
         SQLEnum(PendingArticleStatus), nullable=False, default=PendingArticleStatus.PENDING
     )
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
-
 
 class TaskStatus(str, Enum):
     """任务状态枚举"""
@@ -274,15 +272,19 @@ class TaskEventType(str, Enum):
 class TaskOrm(Base):
     """任务 ORM 模型"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 任务列表 / 取待执行任务：status 定位后按创建时间排序（同时覆盖单独按 status 的查询）
+        Index("idx_tasks_status_created", "status", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     status: Mapped[TaskStatus] = mapped_column(
-        SQLEnum(TaskStatus), nullable=False, default=TaskStatus.PENDING, index=True
+        SQLEnum(TaskStatus), nullable=False, default=TaskStatus.PENDING
     )
     title: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    params: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
-    result: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+    params: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True), nullable=True)
     progress_current: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     progress_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -305,7 +307,7 @@ class TaskEventOrm(Base):
     event_type: Mapped[TaskEventType] = mapped_column(
         SQLEnum(TaskEventType), nullable=False
     )
-    event_data: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+    event_data: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.now, index=True
     )
@@ -343,8 +345,8 @@ class MessageOrm(Base):
     )
     role: Mapped[str] = mapped_column(String(50), nullable=False)  # user, assistant, system
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    agent_state: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
-    search_results: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+    agent_state: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    search_results: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.now, index=True
     )
@@ -369,9 +371,13 @@ class ScheduleStatus(str, Enum):
     DISABLED = "disabled"
 
 
-class ScheduleOrm(Base):
+class ScheduleOrm(TimestampMixin, Base):
     """定时任务 ORM 模型"""
     __tablename__ = "schedules"
+    __table_args__ = (
+        # 到期任务：WHERE status = 'active' AND next_run_at <= ? ORDER BY next_run_at
+        Index("idx_schedules_status_next_run", "status", "next_run_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -401,15 +407,8 @@ class ScheduleOrm(Base):
     last_status: Mapped[str | None] = mapped_column(String(50), nullable=True)  # success, failed
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
-
 
-class SearchKeywordOrm(Base):
+class SearchKeywordOrm(TimestampMixin, Base):
     """搜索关键词 ORM 模型"""
     __tablename__ = "search_keywords"
 
@@ -429,13 +428,6 @@ class SearchKeywordOrm(Base):
     search_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     last_searched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
-
 
 class UserRole(str, Enum):
     """用户角色枚举"""
@@ -443,7 +435,7 @@ class UserRole(str, Enum):
     USER = "user"    # 普通用户
 
 
-class UserOrm(Base):
+class UserOrm(TimestampMixin, Base):
     """用户 ORM 模型"""
     __tablename__ = "users"
 
@@ -454,9 +446,3 @@ class UserOrm(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     office: Mapped[str | None] = mapped_column(String(50), nullable=True)  # 办公室编号
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
-    )
@@ -0,0 +1,41 @@
+"""
+URL 规范化模块
+用于去重前统一 URL 形式
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 需要丢弃的跟踪参数（utm_* 按前缀匹配）
+TRACKING_PARAMS = frozenset({"gclid", "fbclid", "ref"})
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+
+def _is_tracking_param(key: str) -> bool:
+    """判断查询参数是否为跟踪参数"""
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    规范化 URL
+
+    主机名转小写，去掉片段（#...）和跟踪参数，其余部分保持原样
+
+    Args:
+        url: 原始 URL
+
+    Returns:
+        规范化后的 URL
+    """
+    parts = urlsplit(url.strip())
+
+    query = parts.query
+    if query:
+        params = parse_qsl(query, keep_blank_values=True)
+        kept = [(key, value) for key, value in params if not _is_tracking_param(key)]
+        # 没有跟踪参数时保留原始查询串，避免重新编码改变 URL
+        if len(kept) != len(params):
+            query = urlencode(kept)
+
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
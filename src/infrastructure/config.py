@@ -22,12 +22,15 @@ class DatabaseConfig(BaseSettings):
     pool_size: int = Field(default=10, description="连接池大小")
     max_overflow: int = Field(default=20, description="连接池最大溢出连接数")
     pool_recycle: int = Field(default=3600, description="连接回收时间（秒）")
+    pool_pre_ping: bool = Field(
+        default=False, description="取连接前是否探活（网络会掐断空闲连接时开启）"
+    )
     echo: bool = Field(default=False, description="是否打印 SQL 语句")
 
     @property
     def url(self) -> str:
         """生成数据库连接 URL"""
-        return f"mysql+aiomysql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}?charset={self.charset}"
+        return f"mysql+asyncmy://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}?charset={self.charset}"
 
     model_config = SettingsConfigDict(env_prefix="DB_")
 
@@ -3,10 +3,12 @@
 提供异步数据库连接池和会话管理
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -56,7 +58,7 @@ class DatabaseManager:
 
         engine_kwargs: dict[str, Any] = {
             "echo": db_config.echo,
-            "pool_pre_ping": True,
+            "pool_pre_ping": db_config.pool_pre_ping,
             "pool_recycle": db_config.pool_recycle,
         }
 
@@ -77,6 +79,29 @@ class DatabaseManager:
             autoflush=False,
         )
 
+    async def warm(self, size: int) -> int:
+        """
+        预热连接池
+
+        并发建立 size 个连接并执行 SELECT 1，连接归还后留在池中，
+        首批并发请求不再各自承担建连开销
+
+        Args:
+            size: 预热连接数
+
+        Returns:
+            实际预热的连接数
+        """
+        if size <= 0:
+            return 0
+
+        async def ping() -> None:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        await asyncio.gather(*(ping() for _ in range(size)))
+        return size
+
     async def disconnect(self) -> None:
         """关闭数据库连接"""
         if self._engine is not None:
@@ -139,8 +164,14 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    """初始化数据库连接"""
-    db_manager.connect()
+    """初始化数据库连接，并按爬虫并发数预热连接池（测试环境使用 NullPool，不预热）"""
+    settings = get_settings()
+    db_manager.connect(settings)
+
+    if settings.app.environment != "testing":
+        await db_manager.warm(
+            min(settings.db.pool_size, settings.crawler.concurrent_limit)
+        )
 
 
 async def close_db() -> None:
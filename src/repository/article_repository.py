@@ -5,13 +5,23 @@
 
 import hashlib
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.core.models import Article, ArticleCreate, ArticleStatus, ArticleUpdate, FetchStatus
 from src.repository.base import BaseRepository
 
+# 列表查询的列（不含正文，content 可能是很大的 TEXT）
+_SUMMARY_COLUMNS = (
+    "id, url, title, publish_time, author, source_id, status, fetch_status, "
+    "error_message, crawled_at, created_at, updated_at"
+)
+
+# search_articles 返回的正文预览长度
+SEARCH_PREVIEW_LENGTH = 500
+
 
 class ArticleRepository(BaseRepository):
     """
@@ -21,14 +31,15 @@ class ArticleRepository(BaseRepository):
 
     TABLE_NAME = "articles"
 
-    def __init__(self, session: AsyncSession | None = None) -> None:
+    def __init__(self, session: AsyncSession | AsyncConnection | None = None) -> None:
         """初始化 ArticleRepository"""
         super().__init__(session)
 
     @staticmethod
+    @lru_cache(maxsize=65536)
     def _generate_url_hash(url: str) -> str:
         """
-        生成 URL 哈希值用于去重
+        生成 URL 哈希值用于去重（按 URL 缓存，去重检查与重试路径会反复计算同一 URL）
 
         Args:
             url: 文章 URL
@@ -36,7 +47,7 @@ class ArticleRepository(BaseRepository):
         Returns:
             URL 的 MD5 哈希值
         """
-        return hashlib.md5(url.encode("utf-8")).hexdigest()
+        return hashlib.md5(url.encode("utf-8"), usedforsecurity=False).hexdigest()
 
     async def create(self, article: ArticleCreate) -> int | None:
         """
@@ -50,6 +61,7 @@ class ArticleRepository(BaseRepository):
         """
         url_hash = self._generate_url_hash(article.url)
 
+        now = datetime.now()
         data = {
             "url_hash": url_hash,
             "url": article.url,
@@ -61,13 +73,32 @@ class ArticleRepository(BaseRepository):
             "status": ArticleStatus.RAW.value,
             "fetch_status": FetchStatus.SUCCESS.value,
             "retry_count": 0,
-            "crawled_at": datetime.now(),
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "crawled_at": now,
+            "created_at": now,
+            "updated_at": now,
         }
 
         return await self.insert(self.TABLE_NAME, data, returning="id")
 
+    def _scraped_data(self, scraped_article: Any, source_id: int) -> dict[str, Any]:
+        """由爬取的文章对象构建 articles 行数据"""
+        now = datetime.now()
+        return {
+            "url_hash": self._generate_url_hash(scraped_article.url),
+            "url": scraped_article.url,
+            "title": scraped_article.title or "无标题",
+            "content": scraped_article.content,
+            "publish_time": scraped_article.publish_time,
+            "author": scraped_article.author,
+            "source_id": source_id,
+            "status": ArticleStatus.RAW.value,
+            "fetch_status": FetchStatus.SUCCESS.value,
+            "retry_count": 0,
+            "crawled_at": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+
     async def create_from_scraped(self, scraped_article: Any, source_id: int) -> int | None:
         """
         从爬取的文章对象创建文章记录
@@ -79,25 +110,42 @@ class ArticleRepository(BaseRepository):
         Returns:
             新插入文章的 ID
         """
-        url_hash = self._generate_url_hash(scraped_article.url)
+        data = self._scraped_data(scraped_article, source_id)
+        return await self.insert(self.TABLE_NAME, data, returning="id")
 
-        data = {
-            "url_hash": url_hash,
-            "url": scraped_article.url,
-            "title": scraped_article.title or "无标题",
-            "content": scraped_article.content,
-            "publish_time": scraped_article.publish_time,
-            "author": scraped_article.author,
-            "source_id": source_id,
-            "status": ArticleStatus.RAW.value,
-            "fetch_status": FetchStatus.SUCCESS.value,
-            "retry_count": 0,
-            "crawled_at": datetime.now(),
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
-        }
+    async def upsert_from_scraped(self, scraped_article: Any, source_id: int) -> int | None:
+        """
+        从爬取的文章对象创建文章记录，URL 已存在时不做修改
 
-        return await self.insert(self.TABLE_NAME, data, returning="id")
+        一条语句完成“不存在则插入”，替代 exists_by_url + create_from_scraped 两次往返
+
+        Args:
+            scraped_article: 爬取的文章对象（有 title, content, publish_time, author, url 属性）
+            source_id: 源 ID
+
+        Returns:
+            新插入或已存在文章的 ID
+        """
+        data = self._scraped_data(scraped_article, source_id)
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join(f":{k}" for k in data.keys())
+        sql = f"INSERT INTO {self.TABLE_NAME} ({columns}) VALUES ({placeholders}) "
+
+        if self.dialect_name == "mysql":
+            # 冲突时把已存在行的 id 写入 LAST_INSERT_ID()，同一连接上取回
+            await self.execute(sql + "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)", data)
+            article_id = await self.fetch_val("SELECT LAST_INSERT_ID()")
+        else:
+            # 冲突时做一次无实际变化的更新，RETURNING 才能返回已存在行的 id
+            result = await self.execute(
+                sql + "ON CONFLICT (url_hash) DO UPDATE SET url_hash = excluded.url_hash "
+                "RETURNING id",
+                data,
+            )
+            article_id = result.scalar_one_or_none()
+
+        await self.session.commit()
+        return article_id
 
     async def get_by_id(self, article_id: int) -> dict[str, Any] | None:
         """
@@ -112,6 +160,27 @@ class ArticleRepository(BaseRepository):
         sql = f"SELECT * FROM {self.TABLE_NAME} WHERE id = :id"
         return await self.fetch_one(sql, {"id": article_id})
 
+    async def get_by_ids(self, article_ids: list[int]) -> dict[int, dict[str, Any]]:
+        """
+        按 ID 批量获取文章（一次 IN 查询，替代循环调用 get_by_id）
+
+        Args:
+            article_ids: 文章 ID 列表，可重复
+
+        Returns:
+            {文章 ID: 文章数据字典}，不存在的 ID 不出现在结果中
+        """
+        ids = list(dict.fromkeys(article_ids))
+        if not ids:
+            return {}
+
+        placeholders = ", ".join(f":id_{i}" for i in range(len(ids)))
+        params = {f"id_{i}": article_id for i, article_id in enumerate(ids)}
+        rows = await self.fetch_all(
+            f"SELECT * FROM {self.TABLE_NAME} WHERE id IN ({placeholders})", params
+        )
+        return {row["id"]: row for row in rows}
+
     # 别名方法，与 API 调用保持一致
     async def fetch_by_id(self, article_id: int) -> dict[str, Any] | None:
         """获取文章详情（别名方法）"""
@@ -174,7 +243,8 @@ class ArticleRepository(BaseRepository):
         Returns:
             影响的行数
         """
-        data: dict[str, Any] = {"updated_at": datetime.now()}
+        now = datetime.now()
+        data: dict[str, Any] = {"updated_at": now}
 
         if update.title is not None:
             data["title"] = update.title
@@ -188,9 +258,9 @@ class ArticleRepository(BaseRepository):
             data["status"] = update.status.value
             # 根据状态更新对应的时间戳
             if update.status == ArticleStatus.PROCESSED:
-                data["processed_at"] = datetime.now()
+                data["processed_at"] = now
             elif update.status == ArticleStatus.SYNCED:
-                data["synced_at"] = datetime.now()
+                data["synced_at"] = now
         if update.error_message is not None:
             data["error_message"] = update.error_message
 
@@ -212,15 +282,16 @@ class ArticleRepository(BaseRepository):
         Returns:
             影响的行数
         """
+        now = datetime.now()
         data: dict[str, Any] = {
             "status": status.value,
-            "updated_at": datetime.now(),
+            "updated_at": now,
         }
 
         if status == ArticleStatus.PROCESSED:
-            data["processed_at"] = datetime.now()
+            data["processed_at"] = now
         elif status == ArticleStatus.SYNCED:
-            data["synced_at"] = datetime.now()
+            data["synced_at"] = now
 
         if error_message is not None:
             data["error_message"] = error_message
@@ -277,8 +348,8 @@ class ArticleRepository(BaseRepository):
                 update_data["fetch_status"] = data["fetch_status"].value
             else:
                 update_data["fetch_status"] = data["fetch_status"]
-        if "error_msg" in data and data["error_msg"] is not None:
-            update_data["error_msg"] = data["error_msg"]
+        if "error_message" in data and data["error_message"] is not None:
+            update_data["error_message"] = data["error_message"]
 
         # 执行更新
         set_clauses = [f"{k} = :_{k}" for k in update_data.keys()]
@@ -316,6 +387,7 @@ class ArticleRepository(BaseRepository):
         status: ArticleStatus | None = None,
         limit: int = 100,
         offset: int = 0,
+        include_content: bool = False,
     ) -> list[dict[str, Any]]:
         """
         根据源 ID 列出文章
@@ -325,6 +397,7 @@ class ArticleRepository(BaseRepository):
             status: 文章状态（可选）
             limit: 返回数量限制
             offset: 偏移量
+            include_content: 是否返回全部列（含正文），默认只返回摘要列
 
         Returns:
             文章列表
@@ -336,8 +409,9 @@ class ArticleRepository(BaseRepository):
             where_clause += " AND status = :status"
             params["status"] = status.value
 
+        columns = "*" if include_content else _SUMMARY_COLUMNS
         sql = f"""
-            SELECT * FROM {self.TABLE_NAME}
+            SELECT {columns} FROM {self.TABLE_NAME}
             WHERE {where_clause}
             ORDER BY created_at DESC
             LIMIT :limit OFFSET :offset
@@ -350,6 +424,7 @@ class ArticleRepository(BaseRepository):
         status: ArticleStatus,
         limit: int = 100,
         offset: int = 0,
+        include_content: bool = False,
     ) -> list[dict[str, Any]]:
         """
         根据状态列出文章
@@ -358,12 +433,14 @@ class ArticleRepository(BaseRepository):
             status: 文章状态
             limit: 返回数量限制
             offset: 偏移量
+            include_content: 是否返回全部列（含正文），默认只返回摘要列
 
         Returns:
             文章列表
         """
+        columns = "*" if include_content else _SUMMARY_COLUMNS
         sql = f"""
-            SELECT * FROM {self.TABLE_NAME}
+            SELECT {columns} FROM {self.TABLE_NAME}
             WHERE status = :status
             ORDER BY created_at DESC
             LIMIT :limit OFFSET :offset
@@ -395,18 +472,22 @@ class ArticleRepository(BaseRepository):
         """
         return await self.count(self.TABLE_NAME, "status = :status", {"status": status.value})
 
-    async def get_latest_articles(self, limit: int = 10) -> list[dict[str, Any]]:
+    async def get_latest_articles(
+        self, limit: int = 10, include_content: bool = False
+    ) -> list[dict[str, Any]]:
         """
         获取最新的文章
 
         Args:
             limit: 返回数量限制
+            include_content: 是否返回全部列（含正文），默认只返回摘要列
 
         Returns:
             文章列表
         """
+        columns = "*" if include_content else _SUMMARY_COLUMNS
         sql = f"""
-            SELECT * FROM {self.TABLE_NAME}
+            SELECT {columns} FROM {self.TABLE_NAME}
             ORDER BY created_at DESC
             LIMIT :limit
         """
@@ -417,21 +498,25 @@ class ArticleRepository(BaseRepository):
         """
         批量创建文章
 
+        依赖 url_hash 唯一索引在数据库内去重：已存在的 URL 只刷新 updated_at，
+        调用方无需逐条 exists_by_url 预检查
+
         Args:
             articles: 文章创建数据列表
 
         Returns:
-            成功插入的文章数量
+            提交的文章数量（批内重复 URL 只计一次）
         """
         if not articles:
             return 0
 
         now = datetime.now()
-        data_list = []
+        # 按 url_hash 去重，批内重复的 URL 以最后一条为准
+        data_by_hash: dict[str, dict[str, Any]] = {}
 
         for article in articles:
             url_hash = self._generate_url_hash(article.url)
-            data_list.append({
+            data_by_hash[url_hash] = {
                 "url_hash": url_hash,
                 "url": article.url,
                 "title": article.title,
@@ -443,9 +528,16 @@ class ArticleRepository(BaseRepository):
                 "crawled_at": now,
                 "created_at": now,
                 "updated_at": now,
-            })
+            }
 
-        return await self.insert_many(self.TABLE_NAME, data_list)
+        if self.dialect_name == "mysql":
+            on_conflict = "ON DUPLICATE KEY UPDATE updated_at = VALUES(updated_at)"
+        else:
+            on_conflict = "ON CONFLICT (url_hash) DO UPDATE SET updated_at = excluded.updated_at"
+
+        return await self.insert_many(
+            self.TABLE_NAME, list(data_by_hash.values()), on_conflict=on_conflict
+        )
 
     async def search_articles(
         self,
@@ -454,7 +546,9 @@ class ArticleRepository(BaseRepository):
         days_ago: int = 30,
     ) -> list[dict[str, Any]]:
         """
-        搜索文章（用于AI Agent内部知识库搜索）- 使用模糊匹配
+        搜索文章（用于AI Agent内部知识库搜索）
+
+        MySQL 使用全文索引（ft_articles_title_content），SQLite 使用模糊匹配
 
         Args:
             keywords: 关键词列表
@@ -462,25 +556,55 @@ class ArticleRepository(BaseRepository):
             days_ago: 搜索最近N天的文章
 
         Returns:
-            匹配的文章列表，按时间倒序
+            匹配的文章列表，按时间倒序（MySQL 按相关度）
         """
         from datetime import timedelta
 
+        # 正文在数据库端截断，多取一个字符用于判断是否需要省略号
+        preview_length = SEARCH_PREVIEW_LENGTH + 1
+
         if not keywords:
             # 如果没有关键词，返回最近的文章
             cutoff_date = datetime.now() - timedelta(days=days_ago)
             sql = f"""
-                SELECT id, url, title, content, publish_time, author, source_id, created_at
-                FROM {self.TABLE_NAME}
-                WHERE publish_time >= :cutoff_date
-                ORDER BY publish_time DESC, created_at DESC
+                SELECT a.id, a.url, a.title, SUBSTR(a.content, 1, :preview_length) AS content,
+                       a.publish_time, a.author,
+                       cs.site_name AS source_name
+                FROM {self.TABLE_NAME} a
+                LEFT JOIN crawl_sources cs ON cs.id = a.source_id
+                WHERE a.publish_time >= :cutoff_date
+                ORDER BY a.publish_time DESC, a.created_at DESC
                 LIMIT :limit
             """
-            results = await self.fetch_all(sql, {"cutoff_date": cutoff_date, "limit": limit})
+            results = await self.fetch_all(
+                sql,
+                {"cutoff_date": cutoff_date, "limit": limit, "preview_length": preview_length},
+            )
+        elif self.dialect_name == "mysql":
+            # MySQL：走 title/content 上的 ngram 全文索引，按相关度排序
+            sql = f"""
+                SELECT a.id, a.url, a.title, SUBSTR(a.content, 1, :preview_length) AS content,
+                       a.publish_time, a.author,
+                       cs.site_name AS source_name
+                FROM {self.TABLE_NAME} a
+                LEFT JOIN crawl_sources cs ON cs.id = a.source_id
+                WHERE MATCH(a.title, a.content) AGAINST (:query IN BOOLEAN MODE)
+                ORDER BY MATCH(a.title, a.content) AGAINST (:query IN BOOLEAN MODE) DESC,
+                         a.publish_time DESC
+                LIMIT :limit
+            """
+            results = await self.fetch_all(
+                sql,
+                {
+                    "query": self._fulltext_query(keywords),
+                    "limit": limit,
+                    "preview_length": preview_length,
+                },
+            )
         else:
-            # 构建模糊匹配查询 - 每个关键词分别匹配
+            # SQLite：模糊匹配 - 每个关键词分别匹配
             conditions = []
-            params = {"limit": limit * 2}  # 获取更多结果用于去重
+            params: dict[str, Any] = {"limit": limit, "preview_length": preview_length}
 
             # 为每个关键词创建多个匹配条件（标题、内容）
             for i, keyword in enumerate(keywords):
@@ -491,18 +615,18 @@ class ArticleRepository(BaseRepository):
 
                 keyword_ors = []
                 # 完整关键词匹配标题
-                keyword_ors.append(f"title LIKE :{param_full}")
+                keyword_ors.append(f"a.title LIKE :{param_full}")
                 params[param_full] = f"%{keyword}%"
 
                 # 完整关键词匹配内容
                 param_content = f"kw_{i}_content"
-                keyword_ors.append(f"content LIKE :{param_content}")
+                keyword_ors.append(f"a.content LIKE :{param_content}")
                 params[param_content] = f"%{keyword}%"
 
                 # 分词后的每个词也匹配
                 for j, word in enumerate(words):
                     param_word = f"kw_{i}_w_{j}"
-                    keyword_ors.append(f"title LIKE :{param_word}")
+                    keyword_ors.append(f"a.title LIKE :{param_word}")
                     params[param_word] = f"%{word}%"
 
                 conditions.append(f"({' OR '.join(keyword_ors)})")
@@ -510,47 +634,21 @@ class ArticleRepository(BaseRepository):
             # 构建 SQL
             where_clause = " OR ".join(conditions)
             sql = f"""
-                SELECT DISTINCT id, url, title, content, publish_time, author, source_id, created_at
-                FROM {self.TABLE_NAME}
+                SELECT a.id, a.url, a.title, SUBSTR(a.content, 1, :preview_length) AS content,
+                       a.publish_time, a.author,
+                       cs.site_name AS source_name
+                FROM {self.TABLE_NAME} a
+                LEFT JOIN crawl_sources cs ON cs.id = a.source_id
                 WHERE {where_clause}
-                ORDER BY publish_time DESC, created_at DESC
+                ORDER BY a.publish_time DESC, a.created_at DESC
                 LIMIT :limit
             """
 
             results = await self.fetch_all(sql, params)
 
-        # 如果结果不足，扩大搜索范围（不限制时间）
-        if len(results) < limit and keywords:
-            conditions = []
-            params = {"limit": limit - len(results)}
-
-            for i, keyword in enumerate(keywords):
-                param_full = f"kw2_{i}_full"
-                conditions.append(f"title LIKE :{param_full}")
-                params[param_full] = f"%{keyword}%"
-
-            where_clause = " OR ".join(conditions)
-            sql = f"""
-                SELECT DISTINCT id, url, title, content, publish_time, author, source_id, created_at
-                FROM {self.TABLE_NAME}
-                WHERE {where_clause}
-                ORDER BY publish_time DESC, created_at DESC
-                LIMIT :limit
-            """
-
-            additional_results = await self.fetch_all(sql, params)
-            # 合并结果（去重）
-            seen_ids = {r["id"] for r in results}
-            for r in additional_results:
-                if r["id"] not in seen_ids:
-                    results.append(r)
-                    seen_ids.add(r["id"])
-
         # 格式化结果
         formatted_results = []
-        for row in results[:limit]:
-            source_name = await self._get_source_name(row["source_id"])
-
+        for row in results:
             # publish_time 可能是 datetime 对象或字符串
             publish_time = row["publish_time"]
             if publish_time and hasattr(publish_time, "isoformat"):
@@ -560,18 +658,27 @@ class ArticleRepository(BaseRepository):
                 "title": row["title"],
                 "url": row["url"],
                 "publish_time": publish_time,
-                "content": row["content"][:500] + "..." if row["content"] and len(row["content"]) > 500 else row["content"],
+                "content": row["content"][:SEARCH_PREVIEW_LENGTH] + "..." if row["content"] and len(row["content"]) > SEARCH_PREVIEW_LENGTH else row["content"],
                 "author": row["author"],
-                "source": source_name,
+                "source": row["source_name"] or "未知来源",
             })
 
         return formatted_results
 
-    async def _get_source_name(self, source_id: int) -> str:
-        """获取源名称"""
-        sql = "SELECT site_name FROM crawl_sources WHERE id = :source_id"
-        result = await self.fetch_one(sql, {"source_id": source_id})
-        return result["site_name"] if result else "未知来源"
+    @staticmethod
+    def _fulltext_query(keywords: list[str]) -> str:
+        """
+        构建全文检索的 BOOLEAN MODE 查询串
+
+        每个关键词及其分词后的词作为短语，任一命中即匹配（与模糊匹配一致）
+        """
+        phrases = []
+        for keyword in keywords:
+            for term in [keyword, *(w for w in keyword.split() if len(w) > 1)]:
+                term = term.replace('"', " ").strip()
+                if term:
+                    phrases.append(f'"{term}"')
+        return " ".join(dict.fromkeys(phrases))
 
     async def fetch_by_timerange(
         self,
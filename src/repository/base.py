@@ -4,10 +4,12 @@ Repository 基类模块
 """
 
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 from typing import Any, TypeVar
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.expression import TextClause
 
 # 兼容 SQLAlchemy 1.4 和 2.0
 try:
@@ -26,29 +28,47 @@ T = TypeVar("T")
 RowAny = Row[Any]
 
 
+@lru_cache(maxsize=1024)
+def _text(sql: str) -> TextClause:
+    """
+    缓存 text() 构造结果
+
+    仓储的 SQL 文本基本固定，相同文本复用同一个 TextClause，
+    不再每次用正则解析绑定参数；编译结果再由引擎的 query_cache_size 缓存
+    """
+    return text(sql)
+
+
 class BaseRepository:
     """
     Repository 泛型基类
     提供通用的数据库操作方法
     """
 
-    def __init__(self, session: AsyncSession | None = None) -> None:
+    def __init__(self, session: AsyncSession | AsyncConnection | None = None) -> None:
         """
         初始化 Repository
 
         Args:
-            session: 数据库会话，为空时自动创建
+            session: 数据库会话或连接（仅执行原始 SQL 时可直接传入连接），为空时自动创建
         """
         self._session = session
         self._owns_session = session is None
 
     @property
-    def session(self) -> AsyncSession:
-        """获取数据库会话"""
+    def session(self) -> AsyncSession | AsyncConnection:
+        """获取数据库会话（或连接）"""
         if self._session is None:
             raise RuntimeError("Session not available")
         return self._session
 
+    @property
+    def dialect_name(self) -> str:
+        """当前数据库方言名（mysql / sqlite）"""
+        if isinstance(self.session, AsyncConnection):
+            return self.session.dialect.name
+        return self.session.get_bind().dialect.name
+
     async def __aenter__(self) -> "BaseRepository":
         """异步上下文管理器入口"""
         if self._owns_session:
@@ -73,7 +93,7 @@ class BaseRepository:
         Returns:
             查询结果
         """
-        result = await self.session.execute(text(sql), params or {})
+        result = await self.session.execute(_text(sql), params or {})
         return result
 
     async def fetch_all(
@@ -187,7 +207,10 @@ class BaseRepository:
             return None
 
     async def insert_many(
-        self, table: str, data_list: list[dict[str, Any]]
+        self,
+        table: str,
+        data_list: list[dict[str, Any]],
+        on_conflict: str | None = None,
     ) -> int:
         """
         批量插入数据
@@ -195,6 +218,7 @@ class BaseRepository:
         Args:
             table: 表名
             data_list: 数据字典列表
+            on_conflict: 追加在 VALUES 之后的冲突处理子句（如 ON DUPLICATE KEY UPDATE ...）
 
         Returns:
             插入的行数
@@ -205,9 +229,11 @@ class BaseRepository:
         columns = ", ".join(data_list[0].keys())
         placeholders = ", ".join(f":{k}" for k in data_list[0].keys())
         sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        if on_conflict:
+            sql = f"{sql} {on_conflict}"
 
-        for data in data_list:
-            await self.execute(sql, data)
+        # 传入参数列表，由驱动以 executemany 一次提交
+        await self.session.execute(_text(sql), data_list)
 
         await self.session.commit()
         return len(data_list)
@@ -275,6 +301,30 @@ class BaseRepository:
         result = await self.fetch_val(sql, params, "count")
         return int(result) if result is not None else 0
 
+    async def estimate_count(self, table: str) -> int:
+        """
+        估算表的行数（不做全表 COUNT）
+
+        MySQL 读取 information_schema 中的统计值；
+        SQLite 没有行数统计，使用主键上的 MAX(id) 近似（有删除时偏大）
+
+        Args:
+            table: 表名
+
+        Returns:
+            估算的行数
+        """
+        if self.dialect_name == "mysql":
+            sql = (
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+            )
+            result = await self.fetch_val(sql, {"table": table})
+        else:
+            result = await self.fetch_val(f"SELECT MAX(id) FROM {table}")
+
+        return int(result) if result is not None else 0
+
     async def exists(
         self, table: str, where: str, params: dict[str, Any] | None = None
     ) -> bool:
@@ -3,12 +3,11 @@
 负责对话和消息的持久化操作
 """
 
-import json
 from datetime import datetime
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, select
 
 from src.repository.base import BaseRepository
 from src.core.models import ConversationCreate, ConversationUpdate, MessageCreate
@@ -54,14 +53,15 @@ class ConversationRepository(BaseRepository):
         limit: int = 50,
         offset: int = 0,
     ) -> list[dict[str, Any]]:
-        """获取对话列表"""
+        """获取对话列表（只读列表，按列查询，不经过 ORM 身份映射）"""
+        table = ConversationOrm.__table__
         result = await self.session.execute(
-            select(ConversationOrm)
-            .order_by(ConversationOrm.updated_at.desc())
+            select(*table.c)
+            .order_by(table.c.updated_at.desc())
             .limit(limit)
             .offset(offset)
         )
-        return [self._orm_to_dict(orm) for orm in result.scalars().all()]
+        return [self._orm_to_dict(row) for row in result.all()]
 
     async def update(self, conversation_id: int, data: ConversationUpdate) -> dict[str, Any]:
         """更新对话"""
@@ -98,8 +98,8 @@ class ConversationRepository(BaseRepository):
             return True
         return False
 
-    def _orm_to_dict(self, orm: ConversationOrm) -> dict[str, Any]:
-        """ORM对象转字典"""
+    def _orm_to_dict(self, orm: ConversationOrm | Row) -> dict[str, Any]:
+        """ORM对象（或按列查询的行）转字典"""
         return {
             "id": orm.id,
             "title": orm.title,
@@ -125,8 +125,8 @@ class MessageRepository(BaseRepository):
             conversation_id=data.conversation_id,
             role=data.role,
             content=data.content,
-            agent_state=json.dumps(data.agent_state) if data.agent_state else None,
-            search_results=json.dumps(data.search_results) if data.search_results else None,
+            agent_state=data.agent_state or None,
+            search_results=data.search_results or None,
             created_at=datetime.now(),
         )
         self.session.add(orm_obj)
@@ -139,23 +139,24 @@ class MessageRepository(BaseRepository):
         conversation_id: int,
         limit: int = 100,
     ) -> list[dict[str, Any]]:
-        """获取对话的所有消息"""
+        """获取对话的所有消息（只读列表，按列查询，不经过 ORM 身份映射）"""
+        table = MessageOrm.__table__
         result = await self.session.execute(
-            select(MessageOrm)
-            .where(MessageOrm.conversation_id == conversation_id)
-            .order_by(MessageOrm.created_at.asc())
+            select(*table.c)
+            .where(table.c.conversation_id == conversation_id)
+            .order_by(table.c.created_at.asc())
             .limit(limit)
         )
-        return [self._orm_to_dict(orm) for orm in result.scalars().all()]
+        return [self._orm_to_dict(row) for row in result.all()]
 
-    def _orm_to_dict(self, orm: MessageOrm) -> dict[str, Any]:
-        """ORM对象转字典"""
+    def _orm_to_dict(self, orm: MessageOrm | Row) -> dict[str, Any]:
+        """ORM对象（或按列查询的行）转字典"""
         return {
             "id": orm.id,
             "conversation_id": orm.conversation_id,
             "role": orm.role,
             "content": orm.content,
-            "agent_state": json.loads(orm.agent_state) if orm.agent_state else None,
-            "search_results": json.loads(orm.search_results) if orm.search_results else None,
+            "agent_state": orm.agent_state,
+            "search_results": orm.search_results,
             "created_at": orm.created_at,
         }
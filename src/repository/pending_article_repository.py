@@ -5,15 +5,17 @@ PendingArticle Repository 模块
 
 import hashlib
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.core.models import (
     PendingArticle,
     PendingArticleCreate,
     PendingArticleStatus,
 )
+from src.core.url_norm import normalize_url
 from src.repository.base import BaseRepository
 
 
@@ -24,23 +26,31 @@ class PendingArticleRepository(BaseRepository):
     """
 
     TABLE_NAME = "pending_articles"
+    # IN (...) 列表每块的参数个数，避免超出 SQLite 的绑定参数上限
+    IN_CLAUSE_CHUNK_SIZE = 500
 
-    def __init__(self, session: AsyncSession | None = None) -> None:
+    def __init__(self, session: AsyncSession | AsyncConnection | None = None) -> None:
         """初始化 PendingArticleRepository"""
         super().__init__(session)
 
     @staticmethod
+    @lru_cache(maxsize=65536)
     def _generate_url_hash(url: str) -> str:
         """
         生成 URL 哈希值用于去重
 
+        先规范化 URL（去掉片段和跟踪参数），同一文章的不同链接形式得到相同哈希；
+        结果按原始 URL 缓存，站点地图重复同步时不再重复规范化和计算
+
         Args:
             url: 文章 URL
 
         Returns:
-            URL 的 MD5 哈希值
+            规范化 URL 的 MD5 哈希值
         """
-        return hashlib.md5(url.encode("utf-8")).hexdigest()
+        return hashlib.md5(
+            normalize_url(url).encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
 
     async def create(self, article: PendingArticleCreate) -> int | None:
         """
@@ -54,6 +64,7 @@ class PendingArticleRepository(BaseRepository):
         """
         url_hash = self._generate_url_hash(article.url)
 
+        now = datetime.now()
         data = {
             "source_id": article.source_id,
             "sitemap_id": article.sitemap_id,
@@ -62,8 +73,8 @@ class PendingArticleRepository(BaseRepository):
             "title": article.title,
             "publish_time": article.publish_time,
             "status": PendingArticleStatus.PENDING.value,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": now,
+            "updated_at": now,
         }
 
         return await self.insert(self.TABLE_NAME, data, returning="id")
@@ -125,7 +136,8 @@ class PendingArticleRepository(BaseRepository):
         """
         获取指定源的待爬文章（自动过滤低质量文章）
 
-        按发布时间倒序排列（最新的优先），没有发布时间的排在最后
+        按发布时间倒序排列（最新的优先），没有发布时间的排在最后，同一时间按 ID 倒序
+        （与 get_page_after 的游标顺序一致）
 
         Args:
             source_id: 源 ID
@@ -146,12 +158,112 @@ class PendingArticleRepository(BaseRepository):
         sql = f"""
             SELECT * FROM {self.TABLE_NAME}
             WHERE {where_clause}
-            ORDER BY publish_time DESC NULLS LAST, created_at DESC
+            ORDER BY publish_time DESC NULLS LAST, id DESC
             LIMIT :limit OFFSET :offset
         """
 
         return await self.fetch_all(sql, params)
 
+    async def get_page_after(
+        self,
+        source_id: int | None = None,
+        status: PendingArticleStatus | None = None,
+        after_publish_time: datetime | None = None,
+        after_id: int | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """
+        游标分页获取待爬文章（自动过滤低质量文章）
+
+        按发布时间倒序排列，没有发布时间的排在最后，同一时间按 ID 倒序。
+        传入上一页最后一条的 publish_time 和 id 取下一页，避免 OFFSET 扫描丢弃前面的行
+
+        Args:
+            source_id: 源 ID（可选）
+            status: 文章状态（可选）
+            after_publish_time: 上一页最后一条的发布时间（为空表示已进入无发布时间的尾段）
+            after_id: 上一页最后一条的 ID，为空时返回第一页
+            limit: 返回数量限制
+
+        Returns:
+            文章列表
+        """
+        params: dict[str, Any] = {"limit": limit}
+        where_clauses = ["status != 'low_quality'"]
+
+        if source_id is not None:
+            where_clauses.append("source_id = :source_id")
+            params["source_id"] = source_id
+
+        if status is not None:
+            where_clauses.append("status = :status")
+            params["status"] = status.value
+
+        if after_id is not None:
+            params["after_id"] = after_id
+            if after_publish_time is None:
+                where_clauses.append("publish_time IS NULL AND id < :after_id")
+            else:
+                params["after_publish_time"] = after_publish_time
+                where_clauses.append(
+                    "(publish_time < :after_publish_time"
+                    " OR (publish_time = :after_publish_time AND id < :after_id)"
+                    " OR publish_time IS NULL)"
+                )
+
+        sql = f"""
+            SELECT * FROM {self.TABLE_NAME}
+            WHERE {" AND ".join(where_clauses)}
+            ORDER BY publish_time DESC NULLS LAST, id DESC
+            LIMIT :limit
+        """
+
+        return await self.fetch_all(sql, params)
+
+    async def get_pending_by_priority(
+        self,
+        limit_per_source: int = 10,
+        status: PendingArticleStatus = PendingArticleStatus.PENDING,
+        source_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        跨源按优先级获取待爬文章
+
+        每个源最多取 limit_per_source 篇（排序同 get_by_source），
+        结果不再按源分组，而是整体按发布时间倒序交错排列，最新的文章最先爬取
+
+        Args:
+            limit_per_source: 每个源的数量限制
+            status: 文章状态（默认 pending，重试时为 failed）
+            source_id: 源 ID（可选）
+
+        Returns:
+            文章列表（附带所属源的 site_name 和 parser_config）
+        """
+        params: dict[str, Any] = {"limit_per_source": limit_per_source, "status": status.value}
+        where_clause = "p.status = :status"
+
+        if source_id is not None:
+            where_clause += " AND p.source_id = :source_id"
+            params["source_id"] = source_id
+
+        sql = f"""
+            SELECT ranked.*, s.site_name, s.parser_config
+            FROM (
+                SELECT p.*, ROW_NUMBER() OVER (
+                    PARTITION BY p.source_id
+                    ORDER BY p.publish_time DESC NULLS LAST, p.created_at DESC
+                ) AS source_rank
+                FROM {self.TABLE_NAME} p
+                WHERE {where_clause}
+            ) ranked
+            INNER JOIN crawl_sources s ON s.id = ranked.source_id
+            WHERE ranked.source_rank <= :limit_per_source
+            ORDER BY ranked.publish_time DESC NULLS LAST, ranked.created_at DESC
+        """
+
+        return await self.fetch_all(sql, params)
+
     async def get_by_sitemap(
         self,
         sitemap_id: int,
@@ -199,6 +311,32 @@ class PendingArticleRepository(BaseRepository):
             self.TABLE_NAME, "url_hash = :url_hash", {"url_hash": url_hash}
         )
 
+    async def get_existing_url_hashes(self, url_hashes: list[str]) -> set[str]:
+        """
+        批量查询已存在的 URL 哈希
+
+        Args:
+            url_hashes: URL 哈希列表
+
+        Returns:
+            其中已存在于待爬表的哈希集合
+        """
+        existing: set[str] = set()
+
+        # 分块查询，避免超出 SQLite 的绑定参数上限
+        for start in range(0, len(url_hashes), self.IN_CLAUSE_CHUNK_SIZE):
+            chunk = url_hashes[start:start + self.IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ", ".join(f":h_{i}" for i in range(len(chunk)))
+            params = {f"h_{i}": url_hash for i, url_hash in enumerate(chunk)}
+
+            rows = await self.fetch_all(
+                f"SELECT url_hash FROM {self.TABLE_NAME} WHERE url_hash IN ({placeholders})",
+                params,
+            )
+            existing.update(row["url_hash"] for row in rows)
+
+        return existing
+
     async def update_status(
         self, article_id: int, status: PendingArticleStatus
     ) -> int:
@@ -221,6 +359,35 @@ class PendingArticleRepository(BaseRepository):
             self.TABLE_NAME, data, "id = :id", {"id": article_id}
         )
 
+    async def bulk_update_status(
+        self, article_ids: list[int], status: PendingArticleStatus
+    ) -> int:
+        """
+        批量更新文章状态（按 IN_CLAUSE_CHUNK_SIZE 分块 UPDATE）
+
+        Args:
+            article_ids: 文章 ID 列表
+            status: 新状态
+
+        Returns:
+            影响的行数
+        """
+        data = {
+            "status": status.value,
+            "updated_at": datetime.now(),
+        }
+
+        affected = 0
+        for start in range(0, len(article_ids), self.IN_CLAUSE_CHUNK_SIZE):
+            chunk = article_ids[start:start + self.IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ", ".join(f":id_{i}" for i in range(len(chunk)))
+            params = {f"id_{i}": article_id for i, article_id in enumerate(chunk)}
+            affected += await self.update(
+                self.TABLE_NAME, data, f"id IN ({placeholders})", params
+            )
+
+        return affected
+
     async def delete_by_id(self, article_id: int) -> int:
         """
         删除待爬文章
@@ -274,3 +441,38 @@ class PendingArticleRepository(BaseRepository):
         where_clause = " AND ".join(where_clauses)
 
         return await self.count(self.TABLE_NAME, where_clause, params)
+
+    async def counts_by_status(self, source_id: int | None = None) -> dict[str, int]:
+        """
+        一次查询统计各状态的文章数量（自动过滤低质量文章）
+
+        Args:
+            source_id: 源 ID（可选）
+
+        Returns:
+            {"total": 总数, "pending": 数量, "crawling": 数量, ...}，缺失的状态补 0
+        """
+        where_clause = "status != 'low_quality'"
+        params: dict[str, Any] = {}
+
+        if source_id is not None:
+            where_clause += " AND source_id = :source_id"
+            params["source_id"] = source_id
+
+        sql = f"""
+            SELECT status, COUNT(*) as count FROM {self.TABLE_NAME}
+            WHERE {where_clause}
+            GROUP BY status
+        """
+
+        rows = await self.fetch_all(sql, params)
+
+        counts = {
+            status.value: 0
+            for status in PendingArticleStatus
+            if status != PendingArticleStatus.LOW_QUALITY
+        }
+        for row in rows:
+            counts[row["status"]] = int(row["count"])
+
+        return {"total": sum(counts.values()), **counts}
@@ -34,6 +34,7 @@ class ReportRepository(BaseRepository):
 
     async def create(self, report: ReportCreate) -> dict[str, Any]:
         """创建报告"""
+        now = datetime.now()
         data = {
             "title": report.title,
             "time_range_start": report.time_range_start,
@@ -46,8 +47,8 @@ class ReportRepository(BaseRepository):
             "total_articles": 0,
             "clustered_articles": 0,
             "event_count": 0,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": now,
+            "updated_at": now,
         }
 
         id = await self.insert(self.TABLE_NAME, data, returning="id")
@@ -125,7 +126,8 @@ class ReportRepository(BaseRepository):
         data: dict[str, Any],
     ) -> dict[str, Any]:
         """更新报告"""
-        update_data: dict[str, Any] = {"updated_at": datetime.now()}
+        now = datetime.now()
+        update_data: dict[str, Any] = {"updated_at": now}
 
         # 处理各种字段
         if "title" in data and data["title"] is not None:
@@ -159,7 +161,7 @@ class ReportRepository(BaseRepository):
 
         # 如果状态变为完成，记录完成时间
         if update_data.get("status") == ReportStatus.COMPLETED.value:
-            update_data["completed_at"] = datetime.now()
+            update_data["completed_at"] = now
 
         # 执行更新
         set_clauses = [f"{k} = :_{k}" for k in update_data.keys()]
@@ -203,14 +205,15 @@ class ReportTemplateRepository(BaseRepository):
 
     async def create(self, template: ReportTemplateCreate) -> dict[str, Any]:
         """创建模板"""
+        now = datetime.now()
         data = {
             "name": template.name,
             "description": template.description,
             "system_prompt": template.system_prompt,
             "section_template": json.dumps(template.section_template),
             "is_default": 0,  # 默认不是默认模板
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": now,
+            "updated_at": now,
         }
 
         id = await self.insert(self.TABLE_NAME, data, returning="id")
@@ -35,13 +35,14 @@ class SitemapRepository(BaseRepository):
         Returns:
             新插入的 Sitemap ID
         """
+        now = datetime.now()
         data = {
             "source_id": sitemap.source_id,
             "url": sitemap.url,
             "fetch_status": SitemapFetchStatus.PENDING.value,
             "article_count": 0,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": now,
+            "updated_at": now,
         }
 
         return await self.insert(self.TABLE_NAME, data, returning="id")
@@ -151,9 +152,10 @@ class SitemapRepository(BaseRepository):
         Returns:
             影响的行数
         """
+        now = datetime.now()
         data = {
-            "last_fetched": datetime.now(),
-            "updated_at": datetime.now(),
+            "last_fetched": now,
+            "updated_at": now,
         }
 
         return await self.update(
@@ -7,7 +7,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.core.models import CrawlSource, ParserConfig, SourceCreate, SourceUpdate
 from src.repository.base import BaseRepository
@@ -21,7 +21,21 @@ class SourceRepository(BaseRepository):
 
     TABLE_NAME = "crawl_sources"
 
-    def __init__(self, session: AsyncSession) -> None:
+    # 列表页需要的列（不含 parser_config 等大字段）
+    SUMMARY_COLUMNS = (
+        "id, site_name, base_url, enabled, crawl_interval, robots_status, "
+        "crawl_delay, robots_fetched_at, last_crawled_at, success_count, "
+        "failure_count, last_error, discovery_method, created_at, updated_at"
+    )
+
+    # 列表排序白名单：(排序字段, 方向) -> 预先构造的 ORDER BY 子句，不拼接请求参数
+    ORDER_BY_CLAUSES = {
+        (column, direction): f"{column} {direction.upper()}"
+        for column in ("site_name", "created_at")
+        for direction in ("asc", "desc")
+    }
+
+    def __init__(self, session: AsyncSession | AsyncConnection) -> None:
         """初始化 SourceRepository"""
         super().__init__(session)
 
@@ -49,7 +63,7 @@ class SourceRepository(BaseRepository):
         Returns:
             ParserConfig 对象
         """
-        return ParserConfig.model_validate_json(config_str)
+        return ParserConfig.from_json(config_str)
 
     # ========================================================================
     # BaseRepository 方法适配
@@ -83,6 +97,39 @@ class SourceRepository(BaseRepository):
 
         return await self.insert(self.TABLE_NAME, data, returning="*")
 
+    async def bulk_create(self, sources: list[SourceCreate]) -> int:
+        """
+        批量创建爬虫源（单次 executemany）
+
+        Args:
+            sources: 爬虫源创建数据列表
+
+        Returns:
+            插入的记录数量
+        """
+        if not sources:
+            return 0
+
+        now = datetime.now()
+        data_list = [
+            {
+                "site_name": source.site_name,
+                "base_url": source.base_url,
+                "parser_config": self._serialize_parser_config(source.parser_config),
+                "enabled": 1 if source.enabled else 0,
+                "crawl_interval": source.crawl_interval,
+                "robots_status": source.robots_status.value if hasattr(source.robots_status, 'value') else str(source.robots_status),
+                "discovery_method": source.discovery_method,
+                "success_count": 0,
+                "failure_count": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for source in sources
+        ]
+
+        return await self.insert_many(self.TABLE_NAME, data_list)
+
     async def fetch_by_id(self, source_id: int) -> dict[str, Any] | None:
         """
         根据 ID 获取爬虫源
@@ -119,33 +166,79 @@ class SourceRepository(BaseRepository):
         if result:
             return dict(result)
 
-        # 尝试带/或不带/的匹配（SQLite 兼容语法）
+        # 尝试带/或不带/的匹配（直接比较列值，可以使用 base_url 索引）
         base_url_normalized = base_url.rstrip("/")
-        sql = f"SELECT * FROM {self.TABLE_NAME} WHERE TRIM(base_url, '/') = :base_url"
-        result = await self.fetch_one(sql, {"base_url": base_url_normalized})
+        sql = f"SELECT * FROM {self.TABLE_NAME} WHERE base_url IN (:bare, :slashed)"
+        result = await self.fetch_one(
+            sql, {"bare": base_url_normalized, "slashed": base_url_normalized + "/"}
+        )
 
         return dict(result) if result else None
 
-    async def fetch_many(
-        self,
-        filters: dict[str, Any] | None = None,
-        limit: int = 100,
-        offset: int = 0,
-        order_by: str = "created_at DESC",
-    ) -> list[dict[str, Any]]:
+    async def fetch_ids_by_base_urls(self, base_urls: list[str]) -> dict[str, int]:
         """
-        获取爬虫源列表
+        批量查询已存在的 base_url（一次查询，匹配规则同 fetch_by_base_url）
+
+        Args:
+            base_urls: 基础 URL 列表
+
+        Returns:
+            {去掉末尾 / 的 base_url: 源 ID}
+        """
+        if not base_urls:
+            return {}
+
+        # 每个 URL 同时查带 / 和不带 / 两种写法，直接比较列值以使用 base_url 索引
+        normalized = list(dict.fromkeys(url.rstrip("/") for url in base_urls))
+        candidates = [variant for url in normalized for variant in (url, url + "/")]
+        placeholders = ", ".join(f":url_{i}" for i in range(len(candidates)))
+        params = {f"url_{i}": url for i, url in enumerate(candidates)}
+
+        sql = f"""
+            SELECT id, base_url FROM {self.TABLE_NAME}
+            WHERE base_url IN ({placeholders})
+        """
+        rows = await self.fetch_all(sql, params)
+
+        return {row["base_url"].rstrip("/"): row["id"] for row in rows}
+
+    async def fetch_ids_by_site_names(self, site_names: list[str]) -> dict[str, int]:
+        """
+        批量查询已存在的站点名称（site_name 在 MySQL 中有唯一约束 uk_site_name）
+
+        Args:
+            site_names: 站点名称列表
+
+        Returns:
+            {site_name: 源 ID}
+        """
+        if not site_names:
+            return {}
+
+        names = list(dict.fromkeys(site_names))
+        placeholders = ", ".join(f":name_{i}" for i in range(len(names)))
+        params = {f"name_{i}": name for i, name in enumerate(names)}
+
+        sql = f"""
+            SELECT id, site_name FROM {self.TABLE_NAME}
+            WHERE site_name IN ({placeholders})
+        """
+        rows = await self.fetch_all(sql, params)
+
+        return {row["site_name"]: row["id"] for row in rows}
+
+    @staticmethod
+    def _build_filters(filters: dict[str, Any] | None) -> tuple[str, dict[str, Any]]:
+        """
+        构建列表查询的 WHERE 子句
 
         Args:
             filters: 筛选条件
-            limit: 返回数量限制
-            offset: 偏移量
-            order_by: 排序
 
         Returns:
-            爬虫源列表
+            (WHERE 子句（含 WHERE 关键字，无条件时为空串）, 参数)
         """
-        params: dict[str, Any] = {"limit": limit, "offset": offset}
+        params: dict[str, Any] = {}
         where_clause = []
 
         if filters:
@@ -159,12 +252,33 @@ class SourceRepository(BaseRepository):
                 where_clause.append("robots_status = :robots_status")
                 params["robots_status"] = filters["robots_status"]
 
-        sql = f"SELECT * FROM {self.TABLE_NAME}"
+        if not where_clause:
+            return "", params
+        return " WHERE " + " AND ".join(where_clause), params
+
+    async def fetch_many(
+        self,
+        filters: dict[str, Any] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order_by: str = "created_at DESC",
+    ) -> list[dict[str, Any]]:
+        """
+        获取爬虫源列表
+
+        Args:
+            filters: 筛选条件
+            limit: 返回数量限制
+            offset: 偏移量
+            order_by: 排序
 
-        if where_clause:
-            sql += " WHERE " + " AND ".join(where_clause)
+        Returns:
+            爬虫源列表
+        """
+        where_sql, params = self._build_filters(filters)
+        params.update({"limit": limit, "offset": offset})
 
-        sql += f" ORDER BY {order_by} LIMIT :limit OFFSET :offset"
+        sql = f"SELECT * FROM {self.TABLE_NAME}{where_sql} ORDER BY {order_by} LIMIT :limit OFFSET :offset"
 
         results = await self.fetch_all(sql, params)
 
@@ -179,7 +293,37 @@ class SourceRepository(BaseRepository):
 
         return output
 
-    async def update(self, source_id: int, data: dict[str, Any] | SourceUpdate) -> dict[str, Any]:
+    async def fetch_many_summary(
+        self,
+        filters: dict[str, Any] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order_by: str = "created_at DESC",
+    ) -> list[dict[str, Any]]:
+        """
+        获取爬虫源列表（只查询列表页需要的列，不反序列化 parser_config）
+
+        Args:
+            filters: 筛选条件
+            limit: 返回数量限制
+            offset: 偏移量
+            order_by: 排序
+
+        Returns:
+            爬虫源摘要列表
+        """
+        where_sql, params = self._build_filters(filters)
+        params.update({"limit": limit, "offset": offset})
+
+        sql = (
+            f"SELECT {self.SUMMARY_COLUMNS} FROM {self.TABLE_NAME}{where_sql} "
+            f"ORDER BY {order_by} LIMIT :limit OFFSET :offset"
+        )
+
+        results = await self.fetch_all(sql, params)
+        return [{**row, "enabled": bool(row["enabled"])} for row in results]
+
+    async def update(self, source_id: int, data: dict[str, Any] | SourceUpdate) -> dict[str, Any] | None:
         """
         更新爬虫源配置
 
@@ -188,7 +332,7 @@ class SourceRepository(BaseRepository):
             data: 更新数据
 
         Returns:
-            更新后的爬虫源
+            更新后的爬虫源，不存在时返回 None
         """
         update_data: dict[str, Any] = {"updated_at": datetime.now()}
 
@@ -214,8 +358,8 @@ class SourceRepository(BaseRepository):
 
         return await self.update_by_id(source_id, update_data)
 
-    async def update_by_id(self, source_id: int, data: dict[str, Any]) -> dict[str, Any]:
-        """执行更新"""
+    async def update_by_id(self, source_id: int, data: dict[str, Any]) -> dict[str, Any] | None:
+        """执行更新（UPDATE ... RETURNING，单次往返，不存在时返回 None）"""
         set_clauses = [f"{k} = :_{k}" for k in data.keys()]
         placeholders = {f"_{k}": v for k, v in data.items()}
         placeholders["_id"] = source_id
@@ -227,13 +371,18 @@ class SourceRepository(BaseRepository):
             RETURNING *
         """
 
-        result = await self.fetch_one(sql, placeholders)
+        row = await self.fetch_one(sql, placeholders)
+        await self.session.commit()
 
-        if result and "parser_config" in result and result["parser_config"]:
+        if row is None:
+            return None
+
+        result = dict(row)
+        if result.get("parser_config"):
             result["parser_config"] = self._deserialize_parser_config(result["parser_config"])
-            result["enabled"] = bool(result["enabled"])
+        result["enabled"] = bool(result["enabled"])
 
-        return dict(result) if result else await self.fetch_by_id(source_id)  # type: ignore
+        return result
 
     async def delete(self, source_id: int) -> bool:
         """
@@ -243,14 +392,42 @@ class SourceRepository(BaseRepository):
             source_id: 爬虫源 ID
 
         Returns:
-            是否成功
+            是否删除了记录（不存在时为 False）
         """
-        await self.delete_by_id(source_id)
-        return True
+        return await self.delete_by_id(source_id) > 0
 
     async def delete_by_id(self, source_id: int) -> int:
         """删除爬虫源（实现）"""
-        return await self.delete(self.TABLE_NAME, "id = :id", {"id": source_id})
+        return await super().delete(self.TABLE_NAME, "id = :id", {"id": source_id})
+
+    async def exists_by_id(self, source_id: int) -> bool:
+        """
+        检查爬虫源是否存在
+
+        Args:
+            source_id: 爬虫源 ID
+
+        Returns:
+            是否存在
+        """
+        return await self.exists(self.TABLE_NAME, "id = :id", {"id": source_id})
+
+    async def fetch_robots_info(self, source_id: int) -> dict[str, Any] | None:
+        """
+        获取爬虫源的 Robots.txt 状态（只查询相关列）
+
+        Args:
+            source_id: 爬虫源 ID
+
+        Returns:
+            {"enabled", "robots_status", "crawl_delay", "robots_fetched_at"}，不存在时返回 None
+        """
+        sql = f"""
+            SELECT enabled, robots_status, crawl_delay, robots_fetched_at
+            FROM {self.TABLE_NAME} WHERE id = :id
+        """
+        row = await self.fetch_one(sql, {"id": source_id})
+        return dict(row) if row else None
 
     async def count(self, filters: dict[str, Any] | None = None) -> int:
         """
@@ -262,18 +439,9 @@ class SourceRepository(BaseRepository):
         Returns:
             爬虫源数量
         """
-        params: dict[str, Any] = {}
-        where_clause = []
-
-        if filters:
-            if "enabled" in filters:
-                where_clause.append("enabled = :enabled")
-                params["enabled"] = 1 if filters["enabled"] else 0
-
-        sql = f"SELECT COUNT(*) as count FROM {self.TABLE_NAME}"
+        where_sql, params = self._build_filters(filters)
 
-        if where_clause:
-            sql += " WHERE " + " AND ".join(where_clause)
+        sql = f"SELECT COUNT(*) as count FROM {self.TABLE_NAME}{where_sql}"
 
         result = await self.fetch_one(sql, params)
         return result["count"] if result else 0
@@ -3,13 +3,15 @@ Task Repository 模块
 负责任务数据的持久化操作
 """
 
-import json
+import asyncio
 from datetime import datetime
 from typing import Any
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.models import (
+    TERMINAL_TASK_STATUSES,
     Task,
     TaskCreate,
     TaskEventType,
@@ -19,6 +21,65 @@ from src.core.models import (
 from src.repository.base import BaseRepository
 
 
+class TaskEventNotifier:
+    """
+    进程内任务事件通知
+    任务状态或事件写入后唤醒订阅该任务的 SSE 流，替代逐秒轮询
+    """
+
+    def __init__(self) -> None:
+        """初始化通知器"""
+        self._subscribers: dict[int, set[asyncio.Event]] = {}
+
+    def subscribe(self, task_id: int) -> asyncio.Event:
+        """
+        订阅任务事件
+
+        Args:
+            task_id: 任务 ID
+
+        Returns:
+            有新事件时被 set 的 asyncio.Event
+        """
+        wakeup = asyncio.Event()
+        self._subscribers.setdefault(task_id, set()).add(wakeup)
+        return wakeup
+
+    def unsubscribe(self, task_id: int, wakeup: asyncio.Event) -> None:
+        """
+        取消订阅
+
+        Args:
+            task_id: 任务 ID
+            wakeup: subscribe 返回的 Event
+        """
+        subscribers = self._subscribers.get(task_id)
+        if subscribers is None:
+            return
+        subscribers.discard(wakeup)
+        if not subscribers:
+            del self._subscribers[task_id]
+
+    def notify(self, task_id: int) -> None:
+        """
+        通知任务有新的状态或事件
+
+        Args:
+            task_id: 任务 ID
+        """
+        for wakeup in self._subscribers.get(task_id, ()):
+            wakeup.set()
+
+
+# 全局通知器实例
+task_event_notifier = TaskEventNotifier()
+
+
+def _dumps(value: Any) -> str:
+    """用 orjson 序列化 JSON 列（UTF-8 原样保存非 ASCII 字符）"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class TaskRepository(BaseRepository):
     """
     Task 数据访问层
@@ -42,15 +103,16 @@ class TaskRepository(BaseRepository):
         Returns:
             新插入的任务 ID
         """
+        now = datetime.now()
         data = {
             "task_type": task.task_type.value,
             "status": TaskStatus.PENDING.value,
             "title": task.title,
-            "params": json.dumps(task.params) if task.params else None,
+            "params": _dumps(task.params) if task.params else None,
             "progress_current": 0,
             "progress_total": 0,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": now,
+            "updated_at": now,
         }
 
         return await self.insert(self.TABLE_NAME, data, returning="id")
@@ -157,23 +219,26 @@ class TaskRepository(BaseRepository):
         Returns:
             影响的行数
         """
+        now = datetime.now()
         data: dict[str, Any] = {
             "status": status.value,
-            "updated_at": datetime.now(),
+            "updated_at": now,
         }
 
         if status == TaskStatus.RUNNING and "started_at" not in data:
-            data["started_at"] = datetime.now()
+            data["started_at"] = now
 
-        if status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-            data["completed_at"] = datetime.now()
+        if status in TERMINAL_TASK_STATUSES:
+            data["completed_at"] = now
 
         if error_message:
             data["error_message"] = error_message
 
-        return await self.update(
+        affected = await self.update(
             self.TABLE_NAME, data, "id = :id", {"id": task_id}
         )
+        task_event_notifier.notify(task_id)
+        return affected
 
     async def update_progress(
         self,
@@ -208,7 +273,7 @@ class TaskRepository(BaseRepository):
 
         if intermediate_result:
             # 存储中间结果到 result 字段（实时更新）
-            data["result"] = json.dumps(intermediate_result, ensure_ascii=False)
+            data["result"] = _dumps(intermediate_result)
 
         return await self.update(
             self.TABLE_NAME, data, "id = :id", {"id": task_id}
@@ -230,7 +295,7 @@ class TaskRepository(BaseRepository):
             影响的行数
         """
         data: dict[str, Any] = {
-            "result": json.dumps(result),
+            "result": _dumps(result),
             "updated_at": datetime.now(),
         }
 
@@ -258,16 +323,44 @@ class TaskRepository(BaseRepository):
         data = {
             "task_id": task_id,
             "event_type": event_type.value,
-            "event_data": json.dumps(event_data) if event_data else None,
+            "event_data": _dumps(event_data) if event_data else None,
             "created_at": datetime.now(),
         }
 
-        return await self.insert(self.EVENTS_TABLE_NAME, data, returning="id")
+        event_id = await self.insert(self.EVENTS_TABLE_NAME, data, returning="id")
+        task_event_notifier.notify(task_id)
+        return event_id
+
+    async def add_events(self, events: list[dict[str, Any]]) -> int:
+        """
+        批量添加任务事件（一次 executemany 提交）
+
+        Args:
+            events: 事件列表，每项包含 task_id / event_type / event_data / created_at
+
+        Returns:
+            插入的事件数
+        """
+        rows = [
+            {
+                "task_id": event["task_id"],
+                "event_type": event["event_type"].value,
+                "event_data": _dumps(event["event_data"]) if event["event_data"] else None,
+                "created_at": event["created_at"],
+            }
+            for event in events
+        ]
+
+        count = await self.insert_many(self.EVENTS_TABLE_NAME, rows)
+        for task_id in {event["task_id"] for event in events}:
+            task_event_notifier.notify(task_id)
+        return count
 
     async def get_events(
         self,
         task_id: int,
         limit: int = 100,
+        after_id: int = 0,
     ) -> list[dict[str, Any]]:
         """
         获取任务事件列表
@@ -275,25 +368,33 @@ class TaskRepository(BaseRepository):
         Args:
             task_id: 任务 ID
             limit: 返回数量限制
+            after_id: 只返回 ID 大于该值的事件（增量获取）
 
         Returns:
             事件列表
         """
+        where_clause = "task_id = :task_id"
+        params: dict[str, Any] = {"task_id": task_id, "limit": limit}
+
+        if after_id:
+            where_clause += " AND id > :after_id"
+            params["after_id"] = after_id
+
         sql = f"""
             SELECT * FROM {self.EVENTS_TABLE_NAME}
-            WHERE task_id = :task_id
-            ORDER BY created_at ASC
+            WHERE {where_clause}
+            ORDER BY id ASC
             LIMIT :limit
         """
 
-        rows = await self.fetch_all(sql, {"task_id": task_id, "limit": limit})
+        rows = await self.fetch_all(sql, params)
 
         return [
             {
                 "id": row["id"],
                 "task_id": row["task_id"],
                 "event_type": row["event_type"],
-                "event_data": json.loads(row["event_data"]) if row["event_data"] else None,
+                "event_data": orjson.loads(row["event_data"]) if row["event_data"] else None,
                 "created_at": row["created_at"],
             }
             for row in rows
@@ -313,6 +414,56 @@ class TaskRepository(BaseRepository):
             self.TABLE_NAME, "status = :status", {"status": status.value}
         )
 
+    async def count_tasks(
+        self,
+        status: TaskStatus | None = None,
+        task_type: str | None = None,
+    ) -> int:
+        """
+        统计任务数量（筛选条件同 list_tasks）
+
+        Args:
+            status: 任务状态过滤
+            task_type: 任务类型过滤
+
+        Returns:
+            任务数量
+        """
+        conditions = []
+        params: dict[str, Any] = {}
+
+        if status:
+            conditions.append("status = :status")
+            params["status"] = status.value
+
+        if task_type:
+            conditions.append("task_type = :task_type")
+            params["task_type"] = task_type
+
+        where_clause = " AND ".join(conditions) if conditions else None
+
+        return await self.count(self.TABLE_NAME, where_clause, params)
+
+    async def count_all_statuses(self) -> dict[str, int]:
+        """
+        一次查询统计各状态的任务数量
+
+        Returns:
+            {"pending": 数量, "running": 数量, ...}，缺失的状态补 0
+        """
+        sql = f"""
+            SELECT status, COUNT(*) as count FROM {self.TABLE_NAME}
+            GROUP BY status
+        """
+
+        rows = await self.fetch_all(sql)
+
+        counts = {status.value: 0 for status in TaskStatus}
+        for row in rows:
+            counts[row["status"]] = int(row["count"])
+
+        return counts
+
     async def count_by_type(self, task_type: str) -> int:
         """
         统计指定类型的任务数量
@@ -341,8 +492,8 @@ class TaskRepository(BaseRepository):
         result = None
         if row.get("result"):
             try:
-                result = json.loads(row["result"])
-            except (json.JSONDecodeError, TypeError):
+                result = orjson.loads(row["result"])
+            except (orjson.JSONDecodeError, TypeError):
                 # 如果解析失败，保持原样或设为 None
                 result = row.get("result")
 
@@ -351,7 +502,7 @@ class TaskRepository(BaseRepository):
             "task_type": row["task_type"],
             "status": row["status"],
             "title": row["title"],
-            "params": json.loads(row["params"]) if row.get("params") else {},
+            "params": orjson.loads(row["params"]) if row.get("params") else {},
             "result": result,
             "progress_current": row.get("progress_current", 0),
             "progress_total": row.get("progress_total", 0),
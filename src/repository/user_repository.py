@@ -3,6 +3,7 @@
 处理用户数据的持久化操作
 """
 
+import hmac
 from typing import Any, Dict, List, Optional
 
 from src.core.orm_models import UserRole
@@ -14,9 +15,6 @@ class UserRepository(BaseRepository):
 
     TABLE_NAME = "users"
 
-    def __init__(self, session):
-        super().__init__(session)
-
     async def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """根据用户名获取用户"""
         sql = f"SELECT * FROM {self.TABLE_NAME} WHERE username = :username"
@@ -68,27 +66,68 @@ class UserRepository(BaseRepository):
         }
         return await self.insert(self.TABLE_NAME, data, returning="id")
 
-    async def update(self, user_id: int, data: Dict[str, Any]) -> bool:
-        """更新用户"""
+    async def create_returning(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """创建用户并返回完整行（用户名重复时抛出 IntegrityError）"""
+        data = {
+            "username": user["username"],
+            "password": user["password"],
+            "role": user.get("role", "user"),
+            "is_active": user.get("is_active", True),
+            "office": user.get("office"),
+        }
+        return await self.insert(self.TABLE_NAME, data, returning="*")
+
+    @staticmethod
+    def _prepare_update(data: Dict[str, Any]) -> Dict[str, Any]:
+        """过滤空值并把 role 枚举转为字符串"""
         update_data = {k: v for k, v in data.items() if v is not None}
-        if not update_data:
-            return False
 
         # 处理 role 枚举
         if "role" in update_data:
             if isinstance(update_data["role"], UserRole):
                 update_data["role"] = update_data["role"].value
 
+        return update_data
+
+    async def update(self, user_id: int, data: Dict[str, Any]) -> bool:
+        """更新用户"""
+        update_data = self._prepare_update(data)
+        if not update_data:
+            return False
+
         set_clause = ", ".join(f"{k} = :{k}" for k in update_data.keys())
         update_data["id"] = user_id
         sql = f"UPDATE {self.TABLE_NAME} SET {set_clause} WHERE id = :id"
 
         return await self.execute_write(sql, update_data) > 0
 
+    async def update_returning(self, user_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """更新用户并返回更新后的行（一次往返），用户不存在时返回 None"""
+        update_data = self._prepare_update(data)
+        if not update_data:
+            return await self.get_by_id(user_id)
+
+        set_clause = ", ".join(f"{k} = :{k}" for k in update_data.keys())
+        update_data["id"] = user_id
+        sql = f"UPDATE {self.TABLE_NAME} SET {set_clause} WHERE id = :id RETURNING *"
+
+        result = await self.execute(sql, update_data)
+        row = result.mappings().first()
+        await self.session.commit()
+        return dict(row) if row else None
+
     async def delete(self, user_id: int) -> bool:
         """删除用户"""
         return await super().delete(self.TABLE_NAME, "id = :id", {"id": user_id})
 
+    async def delete_returning(self, user_id: int) -> Optional[str]:
+        """删除用户并返回其用户名（一次往返），用户不存在时返回 None"""
+        sql = f"DELETE FROM {self.TABLE_NAME} WHERE id = :id RETURNING username"
+        result = await self.execute(sql, {"id": user_id})
+        username = result.scalar_one_or_none()
+        await self.session.commit()
+        return username
+
     async def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """验证用户登录"""
         user = await self.get_by_username(username)
@@ -96,6 +135,7 @@ class UserRepository(BaseRepository):
             return None
         if not user.get("is_active"):
             return None
-        if user.get("password") != password:  # 明文密码比较
+        # 明文密码比较（常量时间，避免按前缀泄露匹配长度）
+        if not hmac.compare_digest(user["password"].encode(), password.encode()):
             return None
         return user
@@ -293,7 +293,9 @@ class AIAgentService:
                     on_state_update(state)
 
                 # 获取最近的文章
-                recent = await self.article_repo.get_latest_articles(limit=10)
+                recent = await self.article_repo.get_latest_articles(
+                    limit=10, include_content=True
+                )
                 results = recent
 
             # 格式化结果
@@ -398,10 +400,8 @@ class AIAgentService:
                             results.append(article_data)
 
                             # 同时存储到数据库（使用一个通用源ID，假设1为web搜索源）
-                            # 先检查URL是否已存在
-                            exists = await self.article_repo.exists_by_url(url)
-                            if not exists:
-                                await self.article_repo.create_from_scraped(scraped, source_id=1)
+                            # URL 已存在时保持原记录不变
+                            await self.article_repo.upsert_from_scraped(scraped, source_id=1)
 
                             state.message = f"联网搜索进度: {i+1}/{len(ddg_results)}"
                             if on_state_update:
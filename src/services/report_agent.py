@@ -444,6 +444,10 @@ class ReportGenerationAgent:
 
         async with get_async_session() as new_db:
             new_article_repo = ArticleRepository(new_db)
+            # 一次查询取回所有事件要展示的文章（每个事件最多 10 篇）
+            articles_by_id = await new_article_repo.get_by_ids(
+                [aid for event in events for aid in event.get("article_ids", [])[:10]]
+            )
 
             for i, event in enumerate(events, 1):
                 # 获取事件的文章
@@ -456,7 +460,7 @@ class ReportGenerationAgent:
                     articles_list = "\n   相关文章："
                     # 从数据库获取文章详情（使用新会话）
                     for article_id in article_ids[:10]:  # 最多显示10篇
-                        article = await new_article_repo.get_by_id(article_id)
+                        article = articles_by_id.get(article_id)
                         if article:
                             pub_time_str = article.get('publish_time', '')
                             if pub_time_str:
@@ -498,6 +502,10 @@ class ReportGenerationAgent:
 
         async with get_async_session() as new_db:
             new_article_repo = ArticleRepository(new_db)
+            # 一次查询取回所有事件要展示的文章（每个事件最多 10 篇）
+            articles_by_id = await new_article_repo.get_by_ids(
+                [aid for event in events for aid in event.get("article_ids", [])[:10]]
+            )
 
             for i, event in enumerate(events, 1):
                 # 获取事件的文章
@@ -514,7 +522,7 @@ class ReportGenerationAgent:
 
                     # 从数据库获取文章详情（使用新会话）
                     for article_id in article_ids[:10]:  # 最多显示10篇
-                        article = await new_article_repo.get_by_id(article_id)
+                        article = articles_by_id.get(article_id)
                         if article:
                             pub_time_str = article.get('publish_time', '')
                             if pub_time_str:
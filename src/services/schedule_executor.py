@@ -172,7 +172,7 @@ class ScheduleExecutor:
                 # 解析 parser_config
                 parser_config = source.get("parser_config")
                 if isinstance(parser_config, str):
-                    parser_config = ParserConfig.model_validate_json(parser_config)
+                    parser_config = ParserConfig.from_json(parser_config)
 
                 # 获取该源的待爬文章
                 articles = await pending_repo.get_by_source(
@@ -335,7 +335,7 @@ class ScheduleExecutor:
                             if isinstance(parser_config, str):
                                 from src.core.models import ParserConfig
 
-                                parser_config = ParserConfig.model_validate_json(parser_config)
+                                parser_config = ParserConfig.from_json(parser_config)
                         else:
                             site_name = parsed.netloc
                             new_source = await source_repo.create(
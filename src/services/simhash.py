@@ -6,10 +6,29 @@ SimHash 文本相似度计算
 import hashlib
 import math
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
 from typing import Any
 
 
+@lru_cache(maxsize=65536)
+def _token_hash(token: str, prefix_bits: int) -> int:
+    """
+    计算 token 的 SHA256 前 prefix_bits 位（结果按 token 缓存）
+
+    直接从摘要字节取整数，与截取十六进制串再 int(..., 16) 的结果相同
+
+    Args:
+        token: 词汇
+        prefix_bits: 取摘要的前多少位（4 的倍数）
+
+    Returns:
+        哈希整数
+    """
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    return int.from_bytes(digest, 'big') >> (256 - prefix_bits)
+
+
 class SimHash:
     """
     SimHash 算法实现
@@ -85,19 +104,18 @@ class SimHash:
         # 初始化权重向量
         weights = [0] * self.hash_bits
 
-        # 计算每个 token 的哈希并累加权重
-        for token in tokens:
-            # 使用 SHA256 哈希
-            token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()
-            # 取前 hash_bits 位
-            hash_int = int(token_hash[: self.hash_bits // 4], 16)
+        # 计算每个 token 的哈希并累加权重（相同 token 合并后按出现次数累加）
+        prefix_bits = self.hash_bits // 4 * 4
+        for token, freq in Counter(tokens).items():
+            # 使用 SHA256 哈希，取前 hash_bits 位
+            hash_int = _token_hash(token, prefix_bits)
 
             # 根据哈希值的每一位更新权重
             for i in range(self.hash_bits):
                 if (hash_int >> i) & 1:
-                    weights[i] += 1
+                    weights[i] += freq
                 else:
-                    weights[i] -= 1
+                    weights[i] -= freq
 
         # 生成最终哈希值
         simhash = 0
@@ -137,10 +155,10 @@ class SimHash:
             token_freq[token] += 1
 
         # 计算加权哈希
+        prefix_bits = self.hash_bits // 4 * 4
         for token, freq in token_freq.items():
             # 使用 SHA256 哈希
-            token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()
-            hash_int = int(token_hash[: self.hash_bits // 4], 16)
+            hash_int = _token_hash(token, prefix_bits)
 
             # 获取权重（频率 × 额外权重）
             weight = freq
@@ -346,16 +346,24 @@ class SitemapService:
         Returns:
             导入统计：{"created": 数量, "existing": 数量}
         """
-        created = 0
-        existing = 0
-
+        # 批次内去重（同一 URL 可能出现在多个 Sitemap 中）
+        unique_articles: dict[str, PendingArticleCreate] = {}
         for article in articles:
-            # 检查 URL 是否已存在
-            if await self.pending_repo.exists_by_url(article.url):
-                existing += 1
-            else:
-                await self.pending_repo.create(article)
-                created += 1
+            url_hash = self.pending_repo._generate_url_hash(article.url)
+            unique_articles.setdefault(url_hash, article)
+
+        # 一次性查出已存在的 URL，新文章批量插入
+        existing_hashes = await self.pending_repo.get_existing_url_hashes(
+            list(unique_articles.keys())
+        )
+        new_articles = [
+            article
+            for url_hash, article in unique_articles.items()
+            if url_hash not in existing_hashes
+        ]
+
+        created = await self.pending_repo.batch_create(new_articles)
+        existing = len(articles) - created
 
         logger.info(f"Imported articles: {created} new, {existing} existing")
         return {"created": created, "existing": existing}
@@ -43,7 +43,7 @@ class CrawlPendingExecutor(TaskExecutor):
 
         Args:
             task_id: 任务 ID
-            params: 任务参数 (limit_per_source: int)
+            params: 任务参数 (limit_per_source: int, source_id: int | None)
             on_progress: 进度回调
             on_event: 事件回调
             check_cancelled: 取消检查回调
@@ -53,24 +53,29 @@ class CrawlPendingExecutor(TaskExecutor):
         """
         print(f"[CrawlPendingExecutor] 开始执行任务 {task_id}")
         limit_per_source = params.get("limit_per_source", 10)
+        only_source_id = params.get("source_id")
         print(f"[CrawlPendingExecutor] limit_per_source={limit_per_source}")
 
-        # 创建新的数据库会话
-        from src.core.database import get_async_session
+        # 只用到原始 SQL 仓储，直接使用数据库连接
+        from src.core.database import get_async_connection
 
         print(f"[CrawlPendingExecutor] 准备创建数据库会话...")
-        async with get_async_session() as db:
+        async with get_async_connection() as db:
             print(f"[CrawlPendingExecutor] 数据库会话已创建")
             pending_repo = PendingArticleRepository(db)
             source_repo = SourceRepository(db)
             article_repo = ArticleRepository(db)
 
             print(f"[CrawlPendingExecutor] 获取启用的源列表...")
-            # 获取所有启用的源
-            sources = await source_repo.fetch_many(
-                filters={"enabled": True},
-                limit=100,
-            )
+            # 获取启用的源（指定 source_id 时只处理该源）
+            if only_source_id is not None:
+                source = await source_repo.fetch_by_id(only_source_id)
+                sources = [source] if source and source["enabled"] else []
+            else:
+                sources = await source_repo.fetch_many(
+                    filters={"enabled": True},
+                    limit=100,
+                )
 
             print(f"[CrawlPendingExecutor] 获取到 {len(sources) if sources else 0} 个启用的源")
 
@@ -110,17 +115,18 @@ class CrawlPendingExecutor(TaskExecutor):
                     )
 
                 # 获取该源的待爬文章 - 使用 fetch_all 和原始 SQL
-                # 注意：SQLite 的 LIMIT 不支持参数绑定，需要直接嵌入值
+                # LIMIT 使用绑定参数，SQL 文本固定，语句缓存可以复用
                 print(f"[CrawlPendingExecutor] 查询源 {source_name} (ID={source_id}) 的待爬文章")
 
                 pending_articles = await pending_repo.fetch_all(
-                    f"""SELECT * FROM pending_articles
+                    """SELECT * FROM pending_articles
                     WHERE source_id = :source_id AND status = :status
                     ORDER BY publish_time DESC NULLS LAST, created_at DESC
-                    LIMIT {limit_per_source}""",
+                    LIMIT :limit""",
                     {
                         "source_id": source_id,
                         "status": PendingArticleStatus.PENDING.value,
+                        "limit": limit_per_source,
                     },
                 )
 
@@ -231,23 +237,24 @@ class RetryFailedExecutor(TaskExecutor):
         """
         limit = params.get("limit", 50)
 
-        from src.core.database import get_async_session
+        from src.core.database import get_async_connection
 
-        async with get_async_session() as db:
+        async with get_async_connection() as db:
             article_repo = ArticleRepository(db)
             pending_repo = PendingArticleRepository(db)
             source_repo = SourceRepository(db)
 
             # 获取失败的待爬文章 - 使用 fetch_all 和原始 SQL
-            # 注意：SQLite 的 LIMIT 不支持参数绑定，需要直接嵌入值
+            # LIMIT 使用绑定参数，SQL 文本固定，语句缓存可以复用
             print(f"[RetryFailedExecutor] 查询失败文章，status={PendingArticleStatus.FAILED.value}")
             failed_articles = await pending_repo.fetch_all(
-                f"""SELECT * FROM pending_articles
+                """SELECT * FROM pending_articles
                 WHERE status = :status
                 ORDER BY created_at DESC
-                LIMIT {limit}""",
+                LIMIT :limit""",
                 {
                     "status": PendingArticleStatus.FAILED.value,
+                    "limit": limit,
                 },
             )
             print(f"[RetryFailedExecutor] 查询到 {len(failed_articles) if failed_articles else 0} 条失败文章")
@@ -422,10 +429,10 @@ class CleanupLowQualityExecutor(TaskExecutor):
 
         print(f"[CleanupLowQualityExecutor] 开始执行任务 {task_id}")
 
-        # 创建新的数据库会话
-        from src.core.database import get_async_session
+        # 只用到原始 SQL 仓储，直接使用数据库连接
+        from src.core.database import get_async_connection
 
-        async with get_async_session() as db:
+        async with get_async_connection() as db:
             article_repo = ArticleRepository(db)
             pending_repo = PendingArticleRepository(db)
 
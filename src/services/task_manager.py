@@ -4,13 +4,16 @@ Task Manager 服务
 """
 
 import asyncio
+import logging
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.models import (
+    TERMINAL_TASK_STATUSES,
     Task,
     TaskCreate,
     TaskEventType,
@@ -20,6 +23,20 @@ from src.core.models import (
 from src.repository.task_repository import TaskRepository
 
 
+logger = logging.getLogger(__name__)
+
+# 执行器回调（进度 / 事件）同时写库的上限，避免高频回调占满连接池
+CALLBACK_WRITE_CONCURRENCY = 4
+
+# 执行器回调产生的事件先缓冲，满 EVENT_FLUSH_SIZE 条或 EVENT_FLUSH_INTERVAL 秒后批量写入
+EVENT_FLUSH_SIZE = 100
+EVENT_FLUSH_INTERVAL = 0.25
+
+# 模块加载时构建一次的校验器，任务列表整批交给 pydantic-core 校验
+_TASK_ADAPTER = TypeAdapter(Task)
+_TASK_LIST_ADAPTER = TypeAdapter(list[Task])
+
+
 # ============================================================================
 # 执行器注册表（在文件顶部定义，避免循环导入）
 # ============================================================================
@@ -32,6 +49,8 @@ class TaskExecutorRegistry:
 
     _instance: "TaskExecutorRegistry | None" = None
     _executors: dict[str, type["TaskExecutor"]] = {}
+    # 已注册类型的只读快照，仅在注册时更新
+    _registered_types: tuple[str, ...] = ()
 
     def __new__(cls) -> "TaskExecutorRegistry":
         if cls._instance is None:
@@ -48,6 +67,7 @@ class TaskExecutorRegistry:
             executor_class: 执行器类
         """
         cls._executors[task_type] = executor_class
+        cls._registered_types = tuple(cls._executors)
 
     @classmethod
     def create(cls, task_type: str) -> "TaskExecutor | None":
@@ -66,9 +86,22 @@ class TaskExecutorRegistry:
         return None
 
     @classmethod
-    def get_registered_types(cls) -> list[str]:
-        """获取所有已注册的任务类型"""
-        return list(cls._executors.keys())
+    def is_registered(cls, task_type: str) -> bool:
+        """
+        检查任务类型是否已注册（不创建执行器实例）
+
+        Args:
+            task_type: 任务类型
+
+        Returns:
+            是否已注册
+        """
+        return task_type in cls._executors
+
+    @classmethod
+    def get_registered_types(cls) -> tuple[str, ...]:
+        """获取所有已注册的任务类型（缓存的元组，无需每次构建列表）"""
+        return cls._registered_types
 
 
 # 进度回调类型别名 (支持可选的中间结果参数)
@@ -125,6 +158,12 @@ class TaskManager:
         self._executors: dict[str, TaskExecutor] = {}
         self._running_tasks: dict[int, asyncio.Task] = {}
         self._cancel_flags: dict[int, bool] = {}
+        # 回调产生的后台写入：持有强引用防止执行中被回收，任务结束前统一等待
+        self._pending_writes: set[asyncio.Task] = set()
+        self._write_semaphore = asyncio.Semaphore(CALLBACK_WRITE_CONCURRENCY)
+        # 待批量写入的回调事件及定时刷新句柄
+        self._event_buffer: list[dict[str, Any]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
 
     def register_executor(self, task_type: str, executor: TaskExecutor) -> None:
         """
@@ -174,10 +213,10 @@ class TaskManager:
         await self.repo.add_event(task_id, TaskEventType.CREATED, {"title": title})
 
         if auto_start:
-            # 在后台启动任务
-            asyncio.create_task(self._execute_task(task_id))
+            # 交给任务队列在后台执行
+            await task_queue.enqueue(task_id)
 
-        return Task(**task_dict)
+        return _TASK_ADAPTER.validate_python(task_dict)
 
     async def get_task(self, task_id: int) -> Task | None:
         """
@@ -191,7 +230,7 @@ class TaskManager:
         """
         task_dict = await self.repo.get_by_id(task_id)
         if task_dict:
-            return Task(**task_dict)
+            return _TASK_ADAPTER.validate_python(task_dict)
         return None
 
     async def list_tasks(
@@ -214,7 +253,7 @@ class TaskManager:
             任务列表
         """
         task_dicts = await self.repo.list_tasks(status, task_type, limit, offset)
-        return [Task(**t) for t in task_dicts]
+        return _TASK_LIST_ADAPTER.validate_python(task_dicts)
 
     async def cancel_task(self, task_id: int) -> bool:
         """
@@ -231,7 +270,7 @@ class TaskManager:
             return False
 
         # 只有 pending 或 running 状态的任务可以取消
-        if task.status not in (TaskStatus.PENDING, TaskStatus.RUNNING):
+        if task.status in TERMINAL_TASK_STATUSES:
             return False
 
         # 设置取消标志
@@ -316,6 +355,7 @@ class TaskManager:
                 on_event=self._on_event(task_id),
                 check_cancelled=lambda: self._cancel_flags.get(task_id, False),
             )
+            await self._drain_writes()
 
             # 检查是否被取消
             if self._cancel_flags.get(task_id, False):
@@ -333,6 +373,7 @@ class TaskManager:
 
         except Exception as e:
             # 标记失败
+            await self._drain_writes()
             error_msg = str(e)
             await self.repo.update_status(task_id, TaskStatus.FAILED, error_msg)
             await self.repo.add_event(
@@ -349,6 +390,79 @@ class TaskManager:
 
         return result
 
+    def _spawn_write(self, coro) -> None:
+        """
+        在后台执行回调产生的写库协程
+
+        限制并发数，持有任务引用，异常写日志而不是静默丢失
+        """
+        async def run():
+            async with self._write_semaphore:
+                await coro
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._pending_writes.add(task)
+        task.add_done_callback(self._on_write_done)
+
+    def _on_write_done(self, task: asyncio.Task) -> None:
+        """后台写入完成回调"""
+        self._pending_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Task callback write failed: {task.exception()}")
+
+    async def _drain_writes(self) -> None:
+        """等待所有回调写入完成，保证进度事件先于最终状态落库"""
+        # 写入中的进度更新可能还会追加事件，先等它们完成再刷新缓冲区
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+        self._flush_events()
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    def _buffer_event(
+        self,
+        task_id: int,
+        event_type: TaskEventType,
+        data: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        缓冲一条回调事件，攒批后一次写入
+
+        需要在事件循环中调用
+        """
+        self._event_buffer.append({
+            "task_id": task_id,
+            "event_type": event_type,
+            "event_data": data,
+            "created_at": datetime.now(),
+        })
+
+        if len(self._event_buffer) >= EVENT_FLUSH_SIZE:
+            self._flush_events()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                EVENT_FLUSH_INTERVAL, self._flush_events
+            )
+
+    def _flush_events(self) -> None:
+        """把缓冲的事件交给后台写入"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._event_buffer:
+            return
+
+        events, self._event_buffer = self._event_buffer, []
+        self._spawn_write(self._write_events(events))
+
+    async def _write_events(self, events: list[dict[str, Any]]) -> None:
+        """批量写入事件（使用独立的 session）"""
+        from src.core.database import get_async_session
+
+        async with get_async_session() as db:
+            await TaskRepository(db).add_events(events)
+
     def _on_progress(self, task_id: int) -> ProgressCallback:
         """
         创建进度回调
@@ -359,30 +473,38 @@ class TaskManager:
         Returns:
             进度回调函数
         """
-        async def update(current: int, total: int, message: str | None = None, intermediate_result: dict[str, Any] | None = None):
+        async def update(
+            current: int,
+            total: int,
+            message: str | None = None,
+            intermediate_result: dict[str, Any] | None = None,
+            buffered: bool = True,
+        ):
             # 创建新的 session 避免并发冲突
             from src.core.database import get_async_session
 
+            event_data: dict[str, Any] = {"current": current, "total": total, "message": message}
+            if intermediate_result:
+                event_data["result"] = intermediate_result
+
             async with get_async_session() as db:
                 repo = TaskRepository(db)
                 await repo.update_progress(task_id, current, total, message, intermediate_result)
-                event_data: dict[str, Any] = {"current": current, "total": total, "message": message}
-                if intermediate_result:
-                    event_data["result"] = intermediate_result
-                await repo.add_event(
-                    task_id,
-                    TaskEventType.PROGRESS,
-                    event_data,
-                )
+                if not buffered:
+                    await repo.add_event(task_id, TaskEventType.PROGRESS, event_data)
+
+            if buffered:
+                self._buffer_event(task_id, TaskEventType.PROGRESS, event_data)
 
         def sync_wrapper(current: int, total: int, message: str | None = None, intermediate_result: dict[str, Any] | None = None):
-            # 在新的事件循环中运行异步函数
+            # 先判断有无运行中的事件循环，再创建唯一的协程，避免产生未被等待的协程
             try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(update(current, total, message, intermediate_result))
+                asyncio.get_running_loop()
             except RuntimeError:
-                # 没有运行中的事件循环，创建新的
-                asyncio.run(update(current, total, message, intermediate_result))
+                # 没有运行中的事件循环，创建新的（临时循环结束后缓冲区无法刷新，直接写入）
+                asyncio.run(update(current, total, message, intermediate_result, buffered=False))
+                return
+            self._spawn_write(update(current, total, message, intermediate_result))
 
         return sync_wrapper
 
@@ -407,10 +529,91 @@ class TaskManager:
         def sync_wrapper(
             event_type: TaskEventType, data: dict[str, Any] | None = None
         ):
+            # 先确认有运行中的事件循环再缓冲，避免同一事件既被直接写入又在下次刷新时重复写入
             try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(add(event_type, data))
+                asyncio.get_running_loop()
             except RuntimeError:
+                # 没有运行中的事件循环，在临时循环中直接写入
                 asyncio.run(add(event_type, data))
+                return
+            self._buffer_event(task_id, event_type, data)
 
         return sync_wrapper
+
+
+# ============================================================================
+# 任务队列
+# ============================================================================
+
+class TaskQueue:
+    """
+    后台任务队列
+
+    请求处理中只负责入队，由固定数量的 worker 取出任务执行，
+    每个 worker 使用独立的数据库会话，避免在请求里随手创建后台协程
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        """worker 是否已启动"""
+        return bool(self._workers)
+
+    async def enqueue(self, task_id: int) -> None:
+        """
+        提交任务到队列
+
+        Args:
+            task_id: 任务 ID
+        """
+        await self._queue.put(task_id)
+        logger.debug(f"Task {task_id} queued ({self._queue.qsize()} waiting)")
+
+    async def start(self, workers: int) -> None:
+        """
+        启动 worker
+
+        Args:
+            workers: worker 数量
+        """
+        if self._workers:
+            logger.warning("任务队列已在运行")
+            return
+
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"task-worker-{i}")
+            for i in range(workers)
+        ]
+        logger.info(f"任务队列启动，worker 数量: {workers}")
+
+    async def stop(self) -> None:
+        """停止所有 worker（未执行的任务保留为 pending 状态）"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("任务队列已停止")
+
+    async def _worker(self, index: int) -> None:
+        """worker 循环：逐个取出任务并执行"""
+        from src.core.database import get_async_session
+
+        while True:
+            task_id = await self._queue.get()
+            try:
+                async with get_async_session() as db:
+                    await TaskManager(db).execute_task(task_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 失败状态已由 TaskManager 记录，这里只保证 worker 不退出
+                logger.error(f"Task {task_id} failed in worker {index}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# 全局任务队列实例
+task_queue = TaskQueue()
@@ -95,9 +95,16 @@ class TimeExtractor:
 
     def _setup_dateparser_settings(self) -> None:
         """配置 dateparser 设置"""
-        self.dateparser_settings = {
+        self._base_dateparser_settings = {
             'TIMEZONE': self.default_timezone or 'UTC',
             'RETURN_AS_TIMEZONE_AWARE': True,
+        }
+
+    @property
+    def dateparser_settings(self) -> dict[str, Any]:
+        """dateparser 设置（相对时间以调用时刻为基准，实例可以长期复用）"""
+        return {
+            **self._base_dateparser_settings,
             'RELATIVE_BASE': datetime.now(timezone.utc),
         }
 
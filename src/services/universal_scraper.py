@@ -6,11 +6,15 @@
 import asyncio
 import logging
 import random
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
+from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, Tag
 import html2text
 
 from src.core.models import ParserConfig
@@ -47,6 +51,67 @@ USER_AGENTS = [
 ]
 
 
+@lru_cache(maxsize=256)
+def compile_selectors(selector: str) -> tuple[soupsieve.SoupSieve, ...]:
+    """
+    预编译复合选择器 (如 "article, main")
+
+    按逗号拆分后逐个编译，保持原有的优先级顺序；
+    同一源的选择器只编译一次，后续文章直接复用
+
+    Args:
+        selector: CSS 选择器字符串
+
+    Returns:
+        编译后的选择器元组
+    """
+    return tuple(
+        soupsieve.compile(sel)
+        for sel in (s.strip() for s in selector.split(","))
+        if sel
+    )
+
+
+class HostRateLimiter:
+    """
+    按主机限速
+    同一主机的请求至少间隔 min_interval 秒，不同主机互不影响
+    """
+
+    def __init__(self, min_interval: float = 1.0) -> None:
+        """
+        初始化限速器
+
+        Args:
+            min_interval: 同一主机两次请求的最小间隔（秒）
+        """
+        self.min_interval = min_interval
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_request: dict[str, float] = {}
+
+    async def acquire(self, url: str) -> None:
+        """
+        等待直到允许向该 URL 的主机发起请求
+
+        Args:
+            url: 即将请求的 URL
+        """
+        host = (urlparse(url).hostname or "").lower()
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        async with lock:
+            last = self._last_request.get(host)
+            if last is not None:
+                wait = self.min_interval - (time.monotonic() - last)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            self._last_request[host] = time.monotonic()
+
+
+# 进程内共享，跨多个 UniversalScraper 实例生效
+host_rate_limiter = HostRateLimiter()
+
+
 class UniversalScraper:
     """
     统一爬虫服务
@@ -97,6 +162,10 @@ class UniversalScraper:
             await self._client.aclose()
             self._client = None
 
+    async def aclose(self) -> None:
+        """关闭爬虫（长期复用的实例在应用关闭时调用）"""
+        await self._close_client()
+
     def _get_headers(self) -> dict[str, str]:
         """获取请求头（使用随机 User-Agent 和更真实的浏览器头）"""
         ua = random.choice(USER_AGENTS)
@@ -164,7 +233,7 @@ class UniversalScraper:
         else:
             config = parser_config
 
-        logger.info(f"Scraping URL: {url} with config: title_selector={config.title_selector}, content_selector={config.content_selector}")
+        logger.debug(f"Scraping URL: {url} with config: title_selector={config.title_selector}, content_selector={config.content_selector}")
 
         # 创建文章对象（确保总是返回）
         class Article:
@@ -188,6 +257,8 @@ class UniversalScraper:
 
             for attempt in range(max_retries):
                 try:
+                    # 仅对实际发出的请求按主机限速
+                    await host_rate_limiter.acquire(url)
                     response = await self._client.get(url, headers=headers, timeout=30.0)
                     response.raise_for_status()
                     break
@@ -214,18 +285,18 @@ class UniversalScraper:
             response.encoding = response.encoding or "utf-8"
             html = response.text
 
-            logger.info(f"Fetched HTML length: {len(html)}")
+            logger.debug(f"Fetched HTML length: {len(html)}")
 
             # 解析 HTML
             soup = BeautifulSoup(html, "lxml")
 
             # 提取标题
             title = self._extract_text(soup, config.title_selector)
-            logger.info(f"Extracted title: {title}")
+            logger.debug(f"Extracted title: {title}")
 
             # 提取内容
             content = self._extract_content(soup, config.content_selector)
-            logger.info(f"Extracted content length: {len(content) if content else 0}")
+            logger.debug(f"Extracted content length: {len(content) if content else 0}")
 
             # 提取时间 - 优先使用选择器，失败则从完整HTML提取
             publish_time = None
@@ -248,7 +319,7 @@ class UniversalScraper:
                     languages=['zh', 'en', 'ru', 'kk']
                 )
                 if publish_time:
-                    logger.info(f"Extracted publish_time from HTML: {publish_time}")
+                    logger.debug(f"Extracted publish_time from HTML: {publish_time}")
 
             # 提取作者
             author = None
@@ -265,15 +336,15 @@ class UniversalScraper:
                     # 使用智能提取的结果覆盖（如果更好）
                     if smart_result['title'] and (not title or len(smart_result['title']) > len(title)):
                         title = smart_result['title']
-                        logger.info(f"SmartExtractor improved title: {title[:50]}...")
+                        logger.debug(f"SmartExtractor improved title: {title[:50]}...")
 
                     if smart_result['content'] and len(smart_result['content']) > 100:
                         content = smart_result['content']
-                        logger.info(f"SmartExtractor extracted content: {len(content)} chars")
+                        logger.debug(f"SmartExtractor extracted content: {len(content)} chars")
 
                     if smart_result['publish_time'] and not publish_time:
                         publish_time = smart_result['publish_time']
-                        logger.info(f"SmartExtractor extracted time: {publish_time}")
+                        logger.debug(f"SmartExtractor extracted time: {publish_time}")
 
                 except Exception as e:
                     logger.warning(f"SmartExtractor fallback failed: {e}")
@@ -294,20 +365,20 @@ class UniversalScraper:
             article.error = str(e)
             return article
 
+    def _select_first(self, soup: BeautifulSoup, selector: str) -> Tag | None:
+        """按优先级返回复合选择器匹配到的第一个元素"""
+        for compiled in compile_selectors(selector):
+            element = compiled.select_one(soup)
+            if element:
+                return element
+        return None
+
     def _extract_text(self, soup: BeautifulSoup, selector: str) -> str | None:
         """提取文本内容"""
         if not selector:
             return None
 
-        # 处理复合选择器 (如 "article, main")
-        selectors = [s.strip() for s in selector.split(",")]
-
-        element = None
-        for sel in selectors:
-            element = soup.select_one(sel)
-            if element:
-                break
-
+        element = self._select_first(soup, selector)
         if not element:
             return None
 
@@ -319,15 +390,7 @@ class UniversalScraper:
         if not selector:
             return None
 
-        # 处理复合选择器 (如 "article, main")
-        selectors = [s.strip() for s in selector.split(",")]
-
-        element = None
-        for sel in selectors:
-            element = soup.select_one(sel)
-            if element:
-                break
-
+        element = self._select_first(soup, selector)
         if not element:
             return None
 